@@ -1,6 +1,17 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import FrozenSet, List, Optional
+import asyncio
+import json
+import time
 import httpx
-from app.core.hyperevm_client import get_price, get_orderbook, get_symbols, is_valid_symbol, get_asset_ctx
+from app.core.hyperevm_client import get_price, get_prices, get_orderbook, get_orderbook_summary, get_slippage_estimate, get_symbols, is_valid_symbol, get_asset_ctx, get_asset_ctxs, query_asset_ctxs, screen_asset_ctxs
+from app.core.screener import SCREENER_COLUMNS
+from app.core.asset_table import COLUMNS, parse_conditions
+from app.core.ctx_history import HISTORY_AGGREGATES, ctx_history
+from app.core.candles import candles
+from app.config import settings
+from app.core.price_stream import broadcaster
 
 router = APIRouter()
 
@@ -10,14 +21,13 @@ async def read_symbols():
     return {"symbols": symbols}
 
 @router.get("/orderbook/{symbol}")
-async def read_orderbook(symbol: str):
-    print(symbol)
+async def read_orderbook(symbol: str, depth: Optional[int] = Query(None, ge=1, description="상위 N개 레벨만 반환")):
     if not symbol or not symbol.isalnum():
         raise HTTPException(status_code=400, detail="Invalid symbol")
     if not await is_valid_symbol(symbol):
         raise HTTPException(status_code=404, detail=f"Symbol not found: {symbol}")
     try:
-        result = await get_orderbook(symbol)
+        result = await get_orderbook(symbol, depth)
         if not result["bids"] and not result["asks"]:
             raise HTTPException(status_code=404, detail=f"Orderbook not found for symbol: {symbol}")
     except httpx.HTTPError:
@@ -26,6 +36,103 @@ async def read_orderbook(symbol: str):
         raise HTTPException(status_code=400, detail=str(e))
     return result
 
+@router.get("/orderbook/{symbol}/summary")
+async def read_orderbook_summary(symbol: str, depth: int = Query(10, ge=1, description="누적 수량을 계산할 레벨 수")):
+    """
+    심볼별 오더북 요약 (최우선 호가, 스프레드, 중간가, 누적 호가 수량)
+    - 404: 존재하지 않는 심볼 또는 빈 오더북
+    - 502: Upstream API 오류
+    """
+    if not symbol or not symbol.isalnum():
+        raise HTTPException(status_code=400, detail="Invalid symbol")
+    if not await is_valid_symbol(symbol):
+        raise HTTPException(status_code=404, detail=f"Symbol not found: {symbol}")
+    try:
+        result = await get_orderbook_summary(symbol, depth)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="Upstream RPC error")
+    if result["best_bid"] is None and result["best_ask"] is None:
+        raise HTTPException(status_code=404, detail=f"Orderbook not found for symbol: {symbol}")
+    return result
+
+@router.get("/slippage/{symbol}")
+async def read_slippage(
+    symbol: str,
+    side: str = Query(..., description="buy 또는 sell"),
+    size: float = Query(..., gt=0, description="주문 수량 (코인 단위)"),
+):
+    """
+    시장가 주문의 예상 체결 (오더북 누적 호가 기준 VWAP, 최악 체결가, 중간가 대비 슬리피지 bps, 보호 지정가)
+    - 404: 존재하지 않는 심볼 또는 빈 오더북
+    - 502: Upstream API 오류
+    """
+    if not symbol or not symbol.isalnum():
+        raise HTTPException(status_code=400, detail="Invalid symbol")
+    if side not in ("buy", "sell"):
+        raise HTTPException(status_code=400, detail="side must be buy or sell")
+    if not await is_valid_symbol(symbol):
+        raise HTTPException(status_code=404, detail=f"Symbol not found: {symbol}")
+    try:
+        result = await get_slippage_estimate(symbol, side, size)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="Upstream RPC error")
+    if result["best_price"] is None:
+        raise HTTPException(status_code=404, detail=f"Orderbook not found for symbol: {symbol}")
+    return result
+
+def _split_csv(value: str) -> List[str]:
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    if not items:
+        raise HTTPException(status_code=400, detail="At least one item is required")
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {settings.BATCH_MAX_ITEMS})")
+    return items
+
+@router.get("/batch")
+async def read_prices(ids: str = Query(..., description="쉼표로 구분한 market_id 목록 (예: 0,1,2)")):
+    """
+    여러 마켓의 가격을 한 번에 조회하는 엔드포인트
+    - 하나의 allMids 스냅샷으로 모든 항목을 처리
+    - 항목별 실패는 해당 항목의 error 필드로 반환
+    - 400: 잘못된 market_id 목록
+    - 502: Upstream API 오류
+    """
+    try:
+        market_ids = [int(item) for item in _split_csv(ids)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if any(market_id < 0 for market_id in market_ids):
+        raise HTTPException(status_code=400, detail="market_id must be non-negative")
+    try:
+        prices = await get_prices(market_ids)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="Upstream RPC error")
+    return {
+        "prices": prices,
+        "count": len(prices),
+        "errors": sum(1 for item in prices if "error" in item),
+    }
+
+@router.get("/asset_ctx")
+async def read_asset_ctxs(symbols: str = Query(..., description="쉼표로 구분한 심볼 목록 또는 * (전체)")):
+    """
+    여러 심볼의 트레이딩 주요 지표(컨텍스트)를 한 번에 조회하는 엔드포인트
+    - symbols=BTC,ETH 또는 symbols=* (전체 유니버스)
+    - 하나의 metaAndAssetCtxs 스냅샷으로 모든 항목을 처리
+    - 항목별 실패는 해당 항목의 error 필드로 반환
+    - 502: Upstream API 오류
+    """
+    symbol_list = None if symbols.strip() == "*" else _split_csv(symbols)
+    try:
+        asset_ctxs = await get_asset_ctxs(symbol_list)
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="Upstream RPC error")
+    return {
+        "asset_ctxs": asset_ctxs,
+        "count": len(asset_ctxs),
+        "errors": sum(1 for item in asset_ctxs if "error" in item),
+    }
+
 @router.get("/asset_ctx/{symbol}")
 async def read_asset_ctx(symbol: str):
     """
@@ -50,6 +157,208 @@ async def read_asset_ctx(symbol: str):
         raise HTTPException(status_code=400, detail=str(e))
     return result
 
+@router.get("/query")
+async def query_asset_ctx_table(
+    where: Optional[str] = Query(None, description="쉼표로 구분한 조건 (예: dayNtlVlm>1000000,funding>0)"),
+    sort: Optional[str] = Query(None, description="정렬 컬럼 (예: funding)"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(20, ge=1, description="반환할 최대 항목 수"),
+    fields: Optional[str] = Query(None, description="쉼표로 구분한 반환 컬럼 (생략시 전체)"),
+):
+    """
+    전체 유니버스 자산 컨텍스트 필터/정렬/상위 N 조회 (예: dayNtlVlm > X 중 funding 상위 20개)
+    - 컬럼: funding, openInterest, markPx, midPx, oraclePx, premium, prevDayPx, dayNtlVlm, dayBaseVlm,
+      change24h(markPx/prevDayPx-1), openInterestNtl(openInterest*markPx)
+    - 값이 없는(null) 항목은 조건/정렬 대상에서 제외
+    - 400: 잘못된 조건/컬럼
+    - 502: Upstream API 오류
+    """
+    if limit > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {settings.BATCH_MAX_ITEMS})")
+    if sort is not None and sort not in COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown column: {sort}")
+    try:
+        conditions = parse_conditions(where)
+        field_list = _split_csv(fields) if fields else None
+        return await query_asset_ctxs(conditions, sort, order == "desc", limit, field_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="Upstream RPC error")
+
+@router.get("/screener")
+async def read_screener(
+    where: Optional[str] = Query(None, description="쉼표로 구분한 조건 (예: dayNtlVlm>1000000,fundingAnnualized>0.2)"),
+    sort: Optional[str] = Query(None, description="정렬 컬럼 (예: fundingZ)"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    absolute: bool = Query(False, alias="abs", description="정렬 컬럼의 절댓값 기준 정렬 (양/음 극단값 모두)"),
+    limit: int = Query(20, ge=1, description="반환할 최대 항목 수"),
+    fields: Optional[str] = Query(None, description="쉼표로 구분한 반환 컬럼 (생략시 전체)"),
+    window: Optional[float] = Query(None, gt=0, description="z-score 롤링 윈도우 (초, 생략시 SCREENER_WINDOW_SECONDS)"),
+):
+    """
+    전체 유니버스 펀딩/프리미엄 이상치 스크리너
+    - 컬럼: funding, fundingAnnualized, premium, basis(markPx/oraclePx-1), markPx, oraclePx,
+      openInterestNtl, oiWeight, oiWeightedFunding, dayNtlVlm, change24h, fundingZ, premiumZ, basisZ
+    - *Z 컬럼은 자산 컨텍스트 시계열 기록(CTX_HISTORY_ENABLED)의 롤링 윈도우 대비 z-score (기록이 없으면 null)
+    - 400: 잘못된 조건/컬럼
+    - 502: Upstream API 오류
+    """
+    if limit > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {settings.BATCH_MAX_ITEMS})")
+    if sort is not None and sort not in SCREENER_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Unknown column: {sort}")
+    try:
+        conditions = parse_conditions(where, SCREENER_COLUMNS)
+        field_list = _split_csv(fields) if fields else None
+        return await screen_asset_ctxs(conditions, sort, order == "desc", absolute, limit, field_list, window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="Upstream RPC error")
+
+@router.get("/history/{symbol}")
+async def read_asset_ctx_history(
+    symbol: str,
+    fields: Optional[str] = Query(None, description="쉼표로 구분한 필드 (생략시 전체)"),
+    start: Optional[int] = Query(None, ge=0, description="시작 시각 (ms, 생략시 end - 1시간)"),
+    end: Optional[int] = Query(None, ge=0, description="종료 시각 (ms, 생략시 현재)"),
+    step: Optional[int] = Query(None, ge=1, description="다운샘플링 구간 (초)"),
+    agg: str = Query("last", description="다운샘플링 집계 방식 (last, mean)"),
+):
+    """
+    심볼별 자산 컨텍스트 시계열 조회 (로컬 기록에서만 조회, 업스트림 호출 없음)
+    - 필드: funding, openInterest, markPx, midPx, oraclePx, premium, prevDayPx, dayNtlVlm, dayBaseVlm
+    - 반환: {"symbol", "time": [ms, ...], "series": {field: [값, ...]}} (값이 없으면 null)
+    - 404: 기록된 적 없는 심볼
+    - 503: 시계열 기록이 비활성화됨 (CTX_HISTORY_ENABLED)
+    """
+    if not ctx_history.is_open:
+        raise HTTPException(status_code=503, detail="Asset context history is disabled")
+    if agg not in HISTORY_AGGREGATES:
+        raise HTTPException(status_code=400, detail=f"agg must be one of {', '.join(HISTORY_AGGREGATES)}")
+    end_s = time.time() if end is None else end / 1000
+    start_s = end_s - 3600 if start is None else start / 1000
+    if start_s > end_s:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    try:
+        result = ctx_history.query(symbol, _split_csv(fields) if fields else None, start_s, end_s, step, agg)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No history for symbol: {symbol}")
+    return {
+        "symbol": symbol,
+        "count": len(result["time"]),
+        "time": [int(ts * 1000) for ts in result["time"]],
+        "series": result["series"],
+    }
+
+@router.get("/candles/{symbol}")
+async def read_candles(
+    symbol: str,
+    interval: str = Query("1m", description="봉 간격 (CANDLE_INTERVALS 중 하나)"),
+    start: int = Query(0, ge=0, description="시작 시각 (ms)"),
+    end: Optional[int] = Query(None, ge=0, description="종료 시각 (ms, 생략시 현재)"),
+    limit: int = Query(500, ge=1, le=5000, description="반환할 최대 봉 수 (마지막 limit개)"),
+):
+    """
+    심볼별 OHLCV 캔들 조회 (WebSocket 체결로 집계한 로컬 봉, 업스트림 candleSnapshot 호출 없음)
+    - 반환 형식은 Hyperliquid candleSnapshot과 동일: [{"t", "T", "s", "i", "o", "c", "h", "l", "v", "n"}, ...]
+    - 진행 중인 봉 포함, 메모리보다 오래된 구간은 로컬 저장소에서 조회
+    - 처음 조회한 코인은 이때부터 집계를 시작하므로 이전 봉이 없을 수 있음
+    - 400: 지원하지 않는 간격
+    - 404: 존재하지 않는 심볼
+    """
+    if not symbol or not symbol.isalnum():
+        raise HTTPException(status_code=400, detail="Invalid symbol")
+    if interval not in candles.intervals:
+        raise HTTPException(status_code=400, detail=f"interval must be one of {', '.join(candles.intervals)}")
+    if not candles.is_tracked(symbol):
+        try:
+            if not await is_valid_symbol(symbol):
+                raise HTTPException(status_code=404, detail=f"Symbol not found: {symbol}")
+        except httpx.HTTPError:
+            raise HTTPException(status_code=502, detail="Upstream RPC error")
+        await candles.track(symbol)
+    bars = await candles.candles(symbol, interval, start, end, limit)
+    return {"symbol": symbol, "interval": interval, "count": len(bars), "candles": bars}
+
+async def _parse_stream_symbols(symbols: Optional[str]) -> Optional[FrozenSet[str]]:
+    if not symbols:
+        return None
+    symbol_list = _split_csv(symbols)
+    for symbol in symbol_list:
+        if not await is_valid_symbol(symbol):
+            raise HTTPException(status_code=404, detail=f"Symbol not found: {symbol}")
+    return frozenset(symbol_list)
+
+@router.get("/stream")
+async def stream_prices(request: Request, symbols: Optional[str] = Query(None, description="쉼표로 구분한 심볼 목록 (생략시 전체)")):
+    """
+    실시간 가격 Server-Sent Events 스트림
+    - 하나의 WebSocket allMids 구독을 모든 클라이언트에 fan-out
+    - 이벤트 data: {"BTC": 69123.5, ...} (변경된 심볼만, 느린 클라이언트는 심볼별 최신 값으로 합쳐서 전달)
+    - STREAM_HEARTBEAT_SECONDS 동안 변경이 없으면 keep-alive 주석 전송
+    - 503: 동시 스트리밍 클라이언트 수 초과
+    """
+    symbol_set = await _parse_stream_symbols(symbols)
+    try:
+        queue = broadcaster.subscribe(symbol_set)
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    batch = await asyncio.wait_for(queue.get(), timeout=settings.STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps(batch, separators=(',', ':'))}\n\n"
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/ws")
+async def websocket_prices(websocket: WebSocket, symbols: Optional[str] = None):
+    """
+    실시간 가격 WebSocket 스트림 (SSE와 동일한 fan-out/conflation)
+    - 메시지: {"type": "prices", "data": {"BTC": 69123.5, ...}}
+    """
+    try:
+        symbol_set = await _parse_stream_symbols(symbols)
+        queue = broadcaster.subscribe(symbol_set)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=str(e.detail))
+        return
+    except OverflowError as e:
+        await websocket.close(code=1013, reason=str(e))
+        return
+    await websocket.accept()
+
+    async def sender():
+        while True:
+            batch = await queue.get()
+            await websocket.send_json({"type": "prices", "data": batch})
+
+    send_task = asyncio.create_task(sender())
+    try:
+        # 클라이언트 메시지는 사용하지 않으며, 연결 종료 감지용으로만 수신
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        send_task.cancel()
+        broadcaster.unsubscribe(queue)
+
 @router.get("/{market_id}")
 async def read_price(market_id: int):
     if market_id < 0:
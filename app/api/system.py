@@ -0,0 +1,53 @@
+from fastapi import APIRouter
+from app.core.account_snapshot import accounts
+from app.core.cache import cache
+from app.core.candles import candles
+from app.core.ctx_history import ctx_history
+from app.core.deposit_store import deposit_store
+from app.core.fill_store import fill_sync
+from app.core.info_client import get_info_stats, meta_and_asset_ctxs
+from app.core.market_data import mirror
+from app.core.order_pipeline import pipeline
+from app.core.orderbook import orderbooks
+from app.core.price_stream import broadcaster
+from app.core.signer import signers
+from app.core.wallet_factory import wallet_pool
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def read_stats():
+    """
+    업스트림 호출 최적화 계층의 런타임 통계
+    - info: /info 요청 coalescing 카운터 (calls, executions, coalesced, errors, inflight)
+    - market_feed: WebSocket 피드 연결 상태 및 미러 staleness
+    - orderbook: 로컬 오더북 수, 로컬/REST 조회 수, idle 제거 수
+    - cache: 2단계 캐시 L1/L2 적중, miss, L2 오류 수
+    - asset_ctxs: metaAndAssetCtxs stale-while-revalidate 적중/stale/miss/갱신 수
+    - price_stream: 스트리밍 클라이언트 수, 브로드캐스트 수, conflation 수
+    - accounts: 감시 주소 수, 푸시 스냅샷 수/적중, 무효화 수
+    - signer: 서명 풀 방식, 캐시된 키 수, 서명/배치 수
+    - order_pipeline: 주문 제출/응답/실패/in-flight 수, nonce 발급 수, 제출→응답 지연 시간(ms)
+    - wallet_pool: 사전 생성 지갑 풀 크기, 남은 수, 생성/제공/miss/오류 수
+    - deposit_store: 입금 주소 저장소 적중/miss/쓰기 수
+    - fills: 체결 동기화 주소 수, 동기화/userFillsByTime 요청 수, 저장된 체결 수
+    - ctx_history: 자산 컨텍스트 시계열 보관 시점 수, 기록 범위, 심볼 수
+    - candles: 봉 집계 코인 수, 반영/중복/지연 체결 수, 닫힌/저장된 봉 수, idle 구독 해제 수
+    """
+    return {
+        "info": get_info_stats(),
+        "market_feed": mirror.stats(),
+        "orderbook": orderbooks.stats(),
+        "cache": cache.stats(),
+        "asset_ctxs": meta_and_asset_ctxs.stats(),
+        "price_stream": broadcaster.stats(),
+        "accounts": accounts.stats(),
+        "signer": signers.stats(),
+        "order_pipeline": pipeline.stats(),
+        "wallet_pool": wallet_pool.stats(),
+        "deposit_store": deposit_store.stats(),
+        "fills": fill_sync.stats(),
+        "ctx_history": ctx_history.stats(),
+        "candles": candles.stats(),
+    }
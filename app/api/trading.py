@@ -1,13 +1,15 @@
-
-from fastapi import APIRouter, Query, HTTPException
+import asyncio
+import hmac
+from fastapi import APIRouter, Depends, Header, Query, HTTPException
 import httpx
-from web3 import Web3, Account
 from app.config import settings
-from app.core.hyperunit_client import verify_signatures, verify_deposit_address_signatures, Proposal
+from app.core.account_snapshot import AccountStateError, accounts
+from app.core.deposit_store import deposit_store
+from app.core.hyperliquid_sdk_client import WalletMismatchError
+from app.core.wallet_factory import DepositAddressError, DepositVerificationError, create_wallet, wallet_pool
+from app.core.wallet_factory import get_deposit_addresses as get_deposit_addresses_real
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
-import json
-import time
+from typing import Optional
 
 router = APIRouter()
 
@@ -23,90 +25,76 @@ async def wallet_balance(address: str = Query(..., description="Hyperliquid 지
     Returns:
         지갑 잔고 정보 (계정 가치, 포지션, 출금 가능 금액 등)
     """
-    # Hyperliquid API는 POST 요청을 사용하며, clearinghouseState 타입으로 사용자 잔고 조회
-    async with httpx.AsyncClient() as client:
+    # Hyperliquid clearinghouseState 스냅샷 조회 (계정/포지션 조회와 같은 주소별 스냅샷 공유)
+    try:
         try:
-            # POST 요청으로 사용자 잔고 조회
-            payload = {
-                "type": "clearinghouseState",
-                "user": address.lower()  # 주소를 소문자로 변환
-            }
-            
-            resp = await client.post(
-                "https://api.hyperliquid.xyz/info",
-                json=payload,
-                timeout=30.0
+            data = await accounts.get(address)
+        except AccountStateError as e:
+            print(f"Hyperliquid API 에러 코드: {e.status_code}")
+            print(f"응답 본문: {e.text}")
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=f"Hyperliquid API 응답이 비정상: {e.text[:300]}"
             )
-            
-            if resp.status_code != 200:
-                print(f"Hyperliquid API 에러 코드: {resp.status_code}")
-                print(f"응답 본문: {resp.text}")
-                raise HTTPException(
-                    status_code=resp.status_code,
-                    detail=f"Hyperliquid API 응답이 비정상: {resp.text[:300]}"
-                )
-            
-            try:
-                data = resp.json()
-            except Exception as e:
-                print(f"JSON 파싱 실패! 에러: {e}, 본문: {resp.text[:300]}")
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Hyperliquid API JSON 파싱 실패: {resp.text[:300]}"
-                )
-            
-            # 응답 데이터 구조 분석 및 반환
-            margin_summary = data.get("marginSummary", {})
-            cross_margin_summary = data.get("crossMarginSummary", {})
-            asset_positions = data.get("assetPositions", [])
-            withdrawable = data.get("withdrawable", "0.0")
-            
-            # 계정 가치가 0이면 잔고가 없는 것으로 판단
-            account_value = float(margin_summary.get("accountValue", "0.0"))
-            
-            if account_value == 0.0:
-                return {
-                    "address": address,
-                    "balance": {
-                        "account_value": "0.0",
-                        "withdrawable": "0.0",
-                        "total_margin_used": "0.0",
-                        "asset_positions": [],
-                        "message": "잔고 없음 또는 신규 지갑"
-                    }
-                }
-            
+        except ValueError as e:
+            print(f"JSON 파싱 실패! 에러: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Hyperliquid API JSON 파싱 실패: {str(e)[:300]}"
+            )
+        
+        # 응답 데이터 구조 분석 및 반환
+        margin_summary = data.get("marginSummary", {})
+        cross_margin_summary = data.get("crossMarginSummary", {})
+        asset_positions = data.get("assetPositions", [])
+        withdrawable = data.get("withdrawable", "0.0")
+        
+        # 계정 가치가 0이면 잔고가 없는 것으로 판단
+        account_value = float(margin_summary.get("accountValue", "0.0"))
+        
+        if account_value == 0.0:
             return {
                 "address": address,
                 "balance": {
-                    "account_value": margin_summary.get("accountValue", "0.0"),
-                    "withdrawable": withdrawable,
-                    "total_margin_used": margin_summary.get("totalMarginUsed", "0.0"),
-                    "total_notional_position": margin_summary.get("totalNtlPos", "0.0"),
-                    "total_raw_usd": margin_summary.get("totalRawUsd", "0.0"),
-                    "asset_positions": asset_positions,
-                    "cross_margin_summary": cross_margin_summary,
-                    "timestamp": data.get("time")
+                    "account_value": "0.0",
+                    "withdrawable": "0.0",
+                    "total_margin_used": "0.0",
+                    "asset_positions": [],
+                    "message": "잔고 없음 또는 신규 지갑"
                 }
             }
-            
-        except httpx.TimeoutException:
-            raise HTTPException(
-                status_code=504,
-                detail="Hyperliquid API 요청 시간 초과"
-            )
-        except httpx.RequestError as e:
-            print(f"Hyperliquid API 요청 실패: {e}")
-            raise HTTPException(
-                status_code=502,
-                detail=f"Hyperliquid API 연결 실패: {str(e)}"
-            )
-        except Exception as e:
-            print(f"예상치 못한 오류: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"서버 내부 오류: {str(e)}"
-            )
+        
+        return {
+            "address": address,
+            "balance": {
+                "account_value": margin_summary.get("accountValue", "0.0"),
+                "withdrawable": withdrawable,
+                "total_margin_used": margin_summary.get("totalMarginUsed", "0.0"),
+                "total_notional_position": margin_summary.get("totalNtlPos", "0.0"),
+                "total_raw_usd": margin_summary.get("totalRawUsd", "0.0"),
+                "asset_positions": asset_positions,
+                "cross_margin_summary": cross_margin_summary,
+                "timestamp": data.get("time")
+            }
+        }
+        
+    except httpx.TimeoutException:
+        raise HTTPException(
+            status_code=504,
+            detail="Hyperliquid API 요청 시간 초과"
+        )
+    except httpx.RequestError as e:
+        print(f"Hyperliquid API 요청 실패: {e}")
+        raise HTTPException(
+            status_code=502,
+            detail=f"Hyperliquid API 연결 실패: {str(e)}"
+        )
+    except Exception as e:
+        print(f"예상치 못한 오류: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"서버 내부 오류: {str(e)}"
+        )
 
 
 
@@ -115,7 +103,7 @@ class OrderRequest(BaseModel):
     """주문 요청 모델"""
     symbol: str
     side: str  # "buy" (Long) 또는 "sell" (Short)
-    size: float  # 포지션 크기 (USD 기준)
+    size: float  # 주문 수량 (코인 단위, szDecimals 자리로 반올림)
     price: Optional[float] = None  # 지정가 주문시에만 사용
     order_type: str = "market"  # "market" 또는 "limit"
     reduce_only: bool = False  # 포지션 감소만 허용
@@ -141,6 +129,33 @@ class AccountInfo(BaseModel):
     margin_ratio: float
     positions: list[PositionInfo]
 
+class CloseAllRequest(BaseModel):
+    """전체 포지션 종료 요청 모델"""
+    address: str
+    ratio: float = 1.0  # 종료할 비율 (0.0 ~ 1.0, 기본값: 1.0 = 전체 종료)
+
+class BulkOrderRequest(BaseModel):
+    """일괄 주문 요청 모델"""
+    orders: list[OrderRequest]
+
+class CancelRequest(BaseModel):
+    """주문 취소 항목 모델"""
+    symbol: str
+    order_id: int
+
+class BulkCancelRequest(BaseModel):
+    """일괄 취소 요청 모델"""
+    cancels: list[CancelRequest]
+
+class CancelAllRequest(BaseModel):
+    """전체 취소 요청 모델"""
+    symbol: Optional[str] = None  # 생략시 모든 심볼의 미체결 주문 취소
+
+class PortfolioRequest(BaseModel):
+    """멀티 주소 포트폴리오 조회 요청 모델"""
+    addresses: list[str]
+    include_spot: bool = False  # spotClearinghouseState 잔고 포함 여부
+
 class ClosePositionRequest(BaseModel):
     """포지션 종료 요청 모델"""
     symbol: str
@@ -154,26 +169,15 @@ class ClosePositionRequest(BaseModel):
 async def gen_wallet():
     '''
     1. 지갑 생성
-    2. 반환 구조 생성
-    3. 입금주소 생성
+    2. 입금주소 생성 (등록된 자산 ETH, SOL, ...을 동시에 요청)
+    3. 반환 구조 생성
+    - WALLET_POOL_SIZE > 0이면 미리 생성해 둔 지갑을 즉시 반환
     '''
-
-    # 1. 지갑 생성
-    account = Account.create()
-    # 2. 반환 구조 생성
-
-    # 3. 입금주소 생성
     '''
 	•	src_chain = 자산이 존재하는 체인 ("ethereum", "solana" 등)
 	•	dst_chain = 받을 쪽 체인 ("hyperliquid")
 	•	asset = 코인 ("eth", "sol")
 	•	dst_addr = Hyperliquid(이더리움) 지갑 주소(즉, 위에서 생성한 address)
-    '''
-    # ETH 입금주소 생성 GET https://api.hyperunit.xyz/gen/ethereum/hyperliquid/eth/0xYourHLAddress
-    url = f"{settings.HYPERUNIT_API_URL}/gen/ethereum/hyperliquid/eth/{account.address}"
-    response = httpx.get(url)
-    response.raise_for_status()
-    '''
     ETH: {
         address: "0x3F344...",
         signatures: {
@@ -184,113 +188,164 @@ async def gen_wallet():
         status: "OK"
     }
     '''
-    eth_data = response.json()
-    print(f"ETH deposit address generated: {eth_data['address']}")
-
-    # ETH 서명 검증 (새로운 상세 검증 로직 사용)
-    eth_proposal = Proposal(
-        destination_address=account.address,
-        destination_chain="hyperliquid",
-        asset="eth",
-        address=eth_data["address"],
-        source_chain="ethereum"
-    )
+    wallet = wallet_pool.take()
+    if wallet is not None:
+        return wallet
+    try:
+        return await create_wallet()
+    except DepositVerificationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DepositAddressError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"HyperUnit API 요청 실패: {str(e)}")
+
+@router.get("/deposit_addresses/{address}")
+async def get_deposit_addresses(address: str):
+    """
+    Hyperliquid 주소의 입금 주소(ETH, SOL, ...) 조회
     
-    # eth_verification_result = verify_deposit_address_signatures(
-    #     signatures=eth_data["signatures"],
-    #     proposal=eth_proposal
-    # )
-
-    # if not eth_verification_result.success:
-    #     error_detail = f"ETH 입금 주소 생성 실패: {eth_verification_result.verified_count}/2 서명 검증됨"
-    #     if eth_verification_result.errors:
-    #         error_detail += f", 에러: {', '.join(eth_verification_result.errors)}"
-    #     if eth_verification_result.verification_details:
-    #         error_detail += f", 검증 상세: {eth_verification_result.verification_details}"
-    #     raise HTTPException(status_code=400, detail=error_detail)
-
-    # print(f"ETH signatures verified successfully: {eth_verification_result.verified_count}/2 nodes")
-
-    # SOL 입금 주소 생성 GET https://api.hyperunit.xyz/gen/solana/hyperliquid/sol/0xYourHLAddress
-    url = f"{settings.HYPERUNIT_API_URL}/gen/solana/hyperliquid/sol/{account.address}"
-    response = httpx.get(url)
-    response.raise_for_status()
-    sol_data = response.json()
-    print(f"SOL deposit address generated: {sol_data['address']}")
-
-    # SOL 서명 검증 (새로운 상세 검증 로직 사용)
-    sol_proposal = Proposal(
-        destination_address=account.address,
-        destination_chain="hyperliquid",
-        asset="sol",
-        address=sol_data["address"],
-        source_chain="solana"
-    )
+    - address: 입금 받을 Hyperliquid 지갑 주소
+    - 이미 생성된 입금 주소는 로컬 저장소에서 반환하고, 없는 자산만 HyperUnit에 생성 요청
+    """
+    try:
+        return {
+            "address": address,
+            "deposit_address": await get_deposit_addresses_real(address),
+        }
+    except DepositVerificationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DepositAddressError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"HyperUnit API 요청 실패: {str(e)}")
+
+@router.get("/deposit_owner/{deposit_address}")
+async def get_deposit_owner(deposit_address: str):
+    """
+    입금 주소 → 사용자 역조회 (로컬 저장소 조회, 업스트림 호출 없음)
     
-    # sol_verification_result = verify_deposit_address_signatures(
-    #     signatures=sol_data["signatures"],
-    #     proposal=sol_proposal
-    # )
+    - deposit_address: ETH/SOL 등 입금 주소
+    - 404: 이 서버에서 생성한 입금 주소가 아님
+    """
+    entry = await asyncio.to_thread(deposit_store.lookup_deposit, deposit_address)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Deposit address not found: {deposit_address}")
+    return {
+        "deposit_address": entry["deposit_address"],
+        "destination_address": entry["destination_address"],
+        "destination_chain": entry["destination_chain"],
+        "source_chain": entry["source_chain"],
+        "asset": entry["asset"],
+        "verified": entry["verified"],
+    }
 
-    # if not sol_verification_result.success:
-    #     error_detail = f"SOL 입금 주소 생성 실패: {sol_verification_result.verified_count}/2 서명 검증됨"
-    #     if sol_verification_result.errors:
-    #         error_detail += f", 에러: {', '.join(sol_verification_result.errors)}"
-    #     if sol_verification_result.verification_details:
-    #         error_detail += f", 검증 상세: {sol_verification_result.verification_details}"
-    #     raise HTTPException(status_code=400, detail=error_detail)
+def require_trading_access(x_api_key: Optional[str] = Header(None)) -> None:
+    """
+    서버 지갑(HYPERLIQUID_API_PRIVATE)으로 실제 주문/취소/청산하는 API의 접근 확인
+    - TRADING_API_KEY가 비어 있으면 비활성화 (503), X-API-Key가 다르면 401
+    """
+    if not settings.TRADING_API_KEY:
+        raise HTTPException(status_code=503, detail="Server wallet trading is disabled (TRADING_API_KEY is not set)")
+    if x_api_key is None or not hmac.compare_digest(x_api_key.encode(), settings.TRADING_API_KEY.encode()):
+        raise HTTPException(status_code=401, detail="Invalid API key")
 
-    # print(f"SOL signatures verified successfully: {sol_verification_result.verified_count}/2 nodes")
+def _trading_private_key() -> str:
+    if not settings.HYPERLIQUID_API_PRIVATE:
+        raise HTTPException(status_code=503, detail="Trading key is not configured")
+    return settings.HYPERLIQUID_API_PRIVATE
 
-    return {
-       "wallet": {"address": account.address,
-        "private_key": account.key.hex()},
-        "deposit_address": {
-            "ETH": eth_data,
-            "SOL": sol_data
-        }
-    }
+def _validate_order(order: OrderRequest) -> None:
+    if order.side not in ["buy", "sell"]:
+        raise HTTPException(status_code=400, detail="side must be 'buy' or 'sell'")
+    if order.order_type not in ["market", "limit"]:
+        raise HTTPException(status_code=400, detail="order_type must be 'market' or 'limit'")
+    if order.order_type == "limit" and not order.price:
+        raise HTTPException(status_code=400, detail="price is required for limit orders")
 
-@router.post("/place_order")
+@router.post("/place_order", dependencies=[Depends(require_trading_access)])
 async def place_order(order: OrderRequest):
     """
-    HyperUnit을 통한 주문 실행 (Long/Short 포지션)
+    서버 지갑으로 주문 1건 실행 (Long/Short 포지션, /orders/bulk와 같은 제출 파이프라인)
     
     - symbol: 거래할 심볼 (예: "BTC", "ETH")
     - side: "buy" (Long 포지션), "sell" (Short 포지션)
-    - size: 포지션 크기 (USD)
-    - price: 지정가 주문시 가격 (시장가 주문시 생략)
+    - size: 주문 수량 (코인 단위)
+    - price: 지정가 주문시 가격 (시장가 주문시 생략하면 오더북 기준 보호 지정가)
     - order_type: "market" (시장가) 또는 "limit" (지정가)
+    - X-API-Key 헤더 필요 (TRADING_API_KEY)
     """
+    _validate_order(order)
+    private_key = _trading_private_key()
     try:
-        # 1. 주문 유효성 검증
-        if order.side not in ["buy", "sell"]:
-            raise HTTPException(status_code=400, detail="side must be 'buy' or 'sell'")
-        
-        if order.order_type not in ["market", "limit"]:
-            raise HTTPException(status_code=400, detail="order_type must be 'market' or 'limit'")
+        from app.core.hyperliquid_client import place_order as place_order_real
         
-        if order.order_type == "limit" and not order.price:
-            raise HTTPException(status_code=400, detail="price is required for limit orders")
+        return await place_order_real(
+            private_key,
+            order.symbol,
+            order.side,
+            order.size,
+            price=order.price,
+            order_type=order.order_type,
+            reduce_only=order.reduce_only,
+            time_in_force=order.time_in_force,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _check_batch_size(count: int) -> None:
+    if count == 0:
+        raise HTTPException(status_code=400, detail="At least one item is required")
+    if count > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {settings.BATCH_MAX_ITEMS})")
+
+@router.post("/orders/bulk", dependencies=[Depends(require_trading_access)])
+async def place_orders_bulk(request: BulkOrderRequest):
+    """
+    여러 주문을 서명 1회, 요청 1회로 일괄 실행
+    
+    - orders: place_order와 같은 형식의 주문 목록 (최대 BATCH_MAX_ITEMS개)
+    - 결과의 orders는 요청 순서대로 항목별 성공 여부/주문 ID/오류를 담음
+    """
+    _check_batch_size(len(request.orders))
+    for order in request.orders:
+        _validate_order(order)
+    private_key = _trading_private_key()
+    try:
+        from app.core.hyperliquid_client import place_orders
         
-        # 2. 실제 Hyperliquid API를 통한 주문 실행
-        # TODO: 실제 private_key는 보안상 별도로 관리해야 함
-        # 현재는 목업 응답 반환
+        return await place_orders(private_key, [order.model_dump() for order in request.orders])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/orders/cancel", dependencies=[Depends(require_trading_access)])
+async def cancel_orders_bulk(request: BulkCancelRequest):
+    """
+    여러 주문을 서명 1회, 요청 1회로 일괄 취소
+    
+    - cancels: [{"symbol": "BTC", "order_id": 123}, ...] (최대 BATCH_MAX_ITEMS개)
+    """
+    _check_batch_size(len(request.cancels))
+    private_key = _trading_private_key()
+    try:
+        from app.core.hyperliquid_client import cancel_orders
         
-        return {
-            "success": True,
-            "order_id": f"order_{int(time.time())}",
-            "symbol": order.symbol,
-            "side": order.side,
-            "size": order.size,
-            "price": order.price,
-            "order_type": order.order_type,
-            "status": "submitted",
-            "timestamp": int(time.time())
-        }
+        return await cancel_orders(private_key, [cancel.model_dump() for cancel in request.cancels])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/orders/cancel_all", dependencies=[Depends(require_trading_access)])
+async def cancel_all_orders(request: CancelAllRequest):
+    """
+    미체결 주문 전체(또는 symbol의 주문만)를 한 번에 취소
+    """
+    private_key = _trading_private_key()
+    try:
+        from app.core.hyperliquid_client import cancel_all_orders as cancel_all_orders_real
         
+        return await cancel_all_orders_real(private_key, request.symbol)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Order placement failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/positions/{address}")
 async def get_positions(address: str):
@@ -326,6 +381,27 @@ async def get_account_info(address: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch account info: {str(e)}")
 
+@router.post("/portfolio")
+async def get_portfolio(request: PortfolioRequest):
+    """
+    여러 주소의 포트폴리오를 한 번에 조회
+    
+    - addresses: 조회할 지갑 주소 목록 (최대 BATCH_MAX_ITEMS개)
+    - include_spot: 스팟 잔고 포함 여부
+    - 주소별 업스트림 조회는 PORTFOLIO_CONCURRENCY개까지 동시에, 주소당 PORTFOLIO_TIMEOUT초 제한
+    - 주소별 실패는 해당 항목의 error 필드로 반환
+    """
+    if not request.addresses:
+        raise HTTPException(status_code=400, detail="At least one address is required")
+    if len(request.addresses) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many addresses (max {settings.BATCH_MAX_ITEMS})")
+    try:
+        from app.core.hyperliquid_client import get_portfolio as get_portfolio_real
+        
+        return await get_portfolio_real(request.addresses, request.include_spot)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch portfolio: {str(e)}")
+
 @router.get("/open_orders/{address}")
 async def get_open_orders(address: str):
     """
@@ -342,13 +418,13 @@ async def get_open_orders(address: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch open orders: {str(e)}")
 
-@router.post("/close_position")
+@router.post("/close_position", dependencies=[Depends(require_trading_access)])
 async def close_position(request: ClosePositionRequest):
     """
     포지션 종료 (비율 기반)
     
     - symbol: 종료할 포지션의 심볼
-    - address: 지갑 주소
+    - address: 지갑 주소 (서버 SDK 지갑 HYPERLIQUID_API_ADDRESS만 허용, 다르면 403)
     - side: "long" 또는 "short" (생략시 모든 포지션 종료)
     - ratio: 종료할 비율 (0.0 ~ 1.0, 기본값: 1.0 = 전체 종료)
     - price: 지정가 종료시 가격 (시장가 종료시 생략)
@@ -382,38 +458,55 @@ async def close_position(request: ClosePositionRequest):
         
         return result
         
+    except HTTPException:
+        raise
+    except WalletMismatchError as e:
+        raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to close position: {str(e)}")
 
+@router.post("/close_all", dependencies=[Depends(require_trading_access)])
+async def close_all(request: CloseAllRequest):
+    """
+    주소의 모든 포지션을 시장가로 한 번에 종료
+    
+    - address: 지갑 주소
+    - ratio: 종료할 비율 (0.0 ~ 1.0, 기본값: 1.0 = 전체 종료)
+    - address는 서버 SDK 지갑(HYPERLIQUID_API_ADDRESS)이어야 함 (다르면 403)
+    - 마켓별 마크 가격은 1회만 조회하고 청산 주문은 action 1개로 전송
+    """
+    if request.ratio < 0.0 or request.ratio > 1.0:
+        raise HTTPException(status_code=400, detail="ratio must be between 0.0 and 1.0")
+    try:
+        from app.core.hyperliquid_client import close_all_positions
+        
+        return await close_all_positions(request.address, request.ratio)
+    except WalletMismatchError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to close positions: {str(e)}")
+
 @router.get("/order_history/{address}")
-async def get_order_history(address: str, limit: int = 50):
+async def get_order_history(
+    address: str,
+    limit: int = Query(50, ge=1, le=2000, description="페이지당 항목 수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (생략시 가장 최근부터)"),
+    coin: Optional[str] = Query(None, description="코인 필터 (예: BTC)"),
+    start_time: Optional[int] = Query(None, description="시작 시각 (ms)"),
+    end_time: Optional[int] = Query(None, description="종료 시각 (ms)"),
+):
     """
-    주문 내역 조회
+    주문(체결) 내역 조회 (최신순, 커서 페이지네이션)
     
     - address: 지갑 주소
     - limit: 조회할 주문 수 (기본값: 50)
+    - 첫 페이지 조회 시 userFillsByTime으로 새 체결만 로컬 저장소에 동기화하고, 페이지는 저장소 인덱스로 조회
+    - 다음 페이지는 응답의 next_cursor를 cursor로 전달 (마지막 페이지면 null)
     """
     try:
-        # TODO: 실제 주문 내역 조회 구현
-        
-        mock_orders = [
-            {
-                "order_id": "order_123",
-                "symbol": "BTC",
-                "side": "buy",
-                "size": 1000.0,
-                "price": 108000.0,
-                "order_type": "market",
-                "status": "filled",
-                "timestamp": "2024-01-15T10:30:00Z"
-            }
-        ]
-        
-        return {
-            "address": address,
-            "orders": mock_orders,
-            "total_count": len(mock_orders)
-        }
-        
+        from app.core.hyperliquid_client import get_order_history as get_order_history_real
+        return await get_order_history_real(address, limit, cursor, coin, start_time, end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch order history: {str(e)}")
\ No newline at end of file
@@ -7,10 +7,47 @@ class Settings(BaseSettings):
     HYPERLIQUID_API_URL: str = "https://api.hyperliquid.xyz"
     HYPERLIQUID_WS_URL: str = "wss://api.hyperliquid.xyz/ws"
     HYPERUNIT_API_URL: str = "https://api.hyperunit.xyz"
+    HYPERUNIT_VERIFY_SIGNATURES: bool = True  # gen_wallet에서 입금 주소 가디언 서명 검증 여부 (끄면 검증되지 않은 입금 주소를 반환)
+    WALLET_POOL_SIZE: int = 0  # 입금 주소까지 미리 생성해 둘 지갑 수 (0이면 사용 안 함)
+    WALLET_POOL_RETRY_SECONDS: float = 5.0  # 지갑 풀 생성 실패 후 재시도 대기
+    DEPOSIT_STORE_PATH: str = "data/deposit_addresses.sqlite3"  # 입금 주소 영구 저장소 (SQLite)
+    
+    # 업스트림 HTTP 커넥션 풀 설정 (HYPERLIQUID/HYPERUNIT/HYPEREVM 공용 클라이언트)
+    HTTP_HTTP2: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # 초
+    HTTP_TIMEOUT: float = 10.0  # 초
+    HTTP_CONNECT_TIMEOUT: float = 5.0  # 초
+    
+    # WebSocket 시장 데이터 피드 설정 (HYPERLIQUID_WS_URL)
+    MARKET_FEED_ENABLED: bool = True
+    MARKET_FEED_STALE_SECONDS: float = 5.0  # 마지막 푸시 후 이 시간이 지나면 REST 폴백
+    MARKET_FEED_ASSET_CTX_COINS: str = ""  # activeAssetCtx 구독 코인 (쉼표 구분, 예: "BTC,ETH")
+    WS_RECONNECT_BASE_DELAY: float = 1.0  # 초
+    WS_RECONNECT_MAX_DELAY: float = 30.0  # 초
+    WS_PING_INTERVAL: float = 50.0  # 초
+    
+    # 로컬 L2 오더북 설정
+    ORDERBOOK_STALE_SECONDS: float = 2.0  # 마지막 푸시 후 이 시간이 지나면 REST로 갱신
+    ORDERBOOK_IDLE_SECONDS: float = 60.0  # 이 시간 동안 읽히지 않으면 구독 해제
+    ORDERBOOK_EVICT_INTERVAL: float = 10.0  # idle 오더북 정리 주기
+    MARKET_ORDER_SLIPPAGE_BUFFER_BPS: float = 10.0  # 시장가 보호 지정가: 예상 최악 체결가 바깥 여유
+    MARKET_ORDER_MAX_SLIPPAGE_BPS: float = 500.0  # 시장가 보호 지정가: 중간가 대비 최대 허용 (SDK 기본 5%)
     
     # API 인증 (필요시)
     HYPERLIQUID_API_ADDRESS: str = ""   
     HYPERLIQUID_API_PRIVATE: str = ""
+    TRADING_API_KEY: str = ""  # 서버 지갑 주문/취소/청산 API 키 (X-API-Key 헤더, 비어 있으면 해당 API 비활성화)
+    
+    # 주문 서명 워커 풀
+    SIGNER_POOL: str = "thread"  # "thread", "process" 또는 "inline" (이벤트 루프에서 직접 서명)
+    SIGNER_WORKERS: int = 4
+    
+    # 주문 제출 파이프라인
+    ORDER_MAX_INFLIGHT_PER_WALLET: int = 8  # 지갑별 동시 전송 action 수
+    ORDER_LATENCY_WINDOW: int = 1000  # 지연 시간 통계에 사용할 최근 제출 건수
+    NONCE_BACKEND: str = "memory"  # "memory" (단일 워커 전용) 또는 "redis" (여러 uvicorn 워커가 nonce 공유)
     
     # 테스트용 private key (실제 운영시에는 환경변수로 관리)
     TEST_PRIVATE_KEY: str = ""
@@ -19,10 +56,55 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379"
     REDIS_DB: int = 0
     
+    # 업스트림 응답 캐시 (L1: 프로세스 메모리, L2: Redis)
+    CACHE_BACKEND: str = "memory"  # "memory" (L1만) 또는 "redis" (L1 + Redis L2, 워커 간 공유)
+    CACHE_L2_RETRY_SECONDS: float = 30.0  # L2 오류 후 L1만 사용하는 시간
+    CACHE_L1_MAX_ENTRIES: int = 10000  # 프로세스 내 L1 최대 항목 수 (초과 시 LRU 제거)
+    CACHE_L1_SWEEP_SECONDS: float = 30.0  # 만료된 L1 항목 일괄 제거 주기
+    CACHE_TTL_META: float = 300.0  # meta (마켓 목록)
+    CACHE_TTL_ALL_MIDS: float = 1.0  # allMids
+    CACHE_TTL_ASSET_CTXS: float = 2.0  # metaAndAssetCtxs
+    CACHE_TTL_USER_STATE: float = 2.0  # 주소별 clearinghouseState
+    ASSET_CTXS_FRESH_TTL: float = 2.0  # metaAndAssetCtxs 인메모리 스냅샷 fresh 구간
+    ASSET_CTXS_STALE_TTL: float = 30.0  # 이 시간까지는 stale 값을 즉시 반환하고 백그라운드 갱신
+    
+    # 계정 스냅샷 (감시 주소는 webData2/userEvents 푸시로 갱신/무효화)
+    ACCOUNT_WATCH_ADDRESSES: str = ""  # 쉼표로 구분한 감시 주소 목록
+    ACCOUNT_PUSH_STALE_SECONDS: float = 30.0  # 마지막 webData2 푸시 후 이 시간이 지나면 REST로 조회
+    PORTFOLIO_CONCURRENCY: int = 16  # /trading/portfolio 업스트림 동시 조회 수
+    PORTFOLIO_TIMEOUT: float = 5.0  # 주소당 조회 제한 시간
+    FILL_STORE_PATH: str = "data/fills.sqlite3"  # 주소별 체결 내역 로컬 저장소 (SQLite)
+    FILL_SYNC_MIN_INTERVAL: float = 2.0  # 같은 주소의 userFillsByTime 증분 동기화 최소 간격
+    
     # 기타 서비스 토큰들
     DISCORD_TOKEN: str = ""
     TWITTER_BEARER_TOKEN: str = ""
     
+    # 배치 조회 설정
+    BATCH_MAX_ITEMS: int = 500  # /price/batch, /price/asset_ctx 한 요청당 최대 항목 수
+    
+    # 가격 스트리밍 설정 (/price/stream, /price/ws)
+    STREAM_MAX_CLIENTS: int = 5000
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+    
+    # 자산 컨텍스트 시계열 기록 (/price/history, 메모리 맵 링 버퍼)
+    CTX_HISTORY_ENABLED: bool = False  # 백그라운드 기록 여부
+    CTX_HISTORY_DIR: str = "data/ctx_history"  # 필드별 링 버퍼 파일 저장 디렉터리
+    CTX_HISTORY_INTERVAL_SECONDS: float = 10.0  # 기록 주기 (스냅샷이 갱신된 경우에만 기록)
+    CTX_HISTORY_CAPACITY: int = 8640  # 보관할 시점 수 (10초 주기면 24시간)
+    CTX_HISTORY_MAX_ASSETS: int = 512  # 기록할 최대 심볼 수 (파일 열 수)
+    SCREENER_WINDOW_SECONDS: float = 3600.0  # /price/screener z-score 기본 롤링 윈도우
+    SCREENER_MIN_SAMPLES: int = 10  # z-score 계산에 필요한 최소 기록 수
+    
+    # 캔들(OHLCV) 집계 (/price/candles, WebSocket trades 기반)
+    CANDLE_COINS: str = ""  # 시작 시 봉 집계를 시작할 코인 (쉼표 구분, 그 외 코인은 첫 조회 시 시작)
+    CANDLE_INTERVALS: str = "1s,1m,5m,1h"  # 집계할 봉 간격 (1s, 1m, 5m, 15m, 1h, 4h, 1d)
+    CANDLE_CAPACITY: int = 1440  # 코인/간격별 메모리에 보관할 봉 수
+    CANDLE_STORE_PATH: str = "data/candles.sqlite3"  # 닫힌 봉 영구 저장소 (SQLite)
+    CANDLE_FLUSH_SECONDS: float = 1.0  # 닫힌 봉 일괄 저장 주기
+    CANDLE_IDLE_SECONDS: float = 600.0  # CANDLE_COINS 외 코인은 이 시간 동안 조회가 없으면 trades 구독 해제
+    CANDLE_EVICT_INTERVAL: float = 30.0  # idle 코인 정리 주기
+    
     # 애플리케이션 설정
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
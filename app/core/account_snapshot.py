@@ -0,0 +1,231 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.config import settings
+from app.core.cache import cache
+from app.core.decoding import decode_response
+from app.core.http_pool import hyperliquid_http
+from app.core.info_client import coalesce_info
+from app.core.ws_feed import HyperliquidWsFeed, feed
+
+
+class AccountStateError(Exception):
+    """clearinghouseState 조회 시 업스트림이 200이 아닌 응답을 준 경우"""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"API Error: {status_code} - {text[:300]}")
+        self.status_code = status_code
+        self.text = text
+
+
+def normalize_account_address(address: str) -> str:
+    """
+    스냅샷 key / 업스트림 요청용 주소 정규화 (0x 접두사 + 소문자)
+    """
+    return "0x" + address.lower().replace("0x", "")
+
+
+def _account_subscriptions(address: str) -> List[Dict]:
+    return [
+        {"type": "webData2", "user": address},
+        {"type": "userEvents", "user": address},
+    ]
+
+
+class AccountSnapshots:
+    """
+    주소별 clearinghouseState 스냅샷 계층
+    - 계정/포지션/지갑 잔고 조회가 모두 같은 스냅샷을 공유 (주소당 업스트림 호출 1회)
+    - 일반 주소: 2단계 캐시에 CACHE_TTL_USER_STATE초 동안 보관 (동시 miss는 1회로 합침)
+    - 감시 주소(watch): webData2 푸시의 clearinghouseState로 스냅샷을 직접 갱신하고,
+      userEvents(체결/청산/펀딩) 푸시가 오면 스냅샷을 무효화해 다음 조회에서 새로 가져옴
+    - 반환 dict는 공유되므로 수정하지 말 것
+    """
+
+    def __init__(self, ws_feed: HyperliquidWsFeed):
+        self.feed = ws_feed
+        self._watched: Set[str] = set()
+        self._pushed: Dict[str, Tuple[float, Dict]] = {}
+        # 진행 중인 캐시 무효화 task (완료되면 스스로 제거, stop에서 완료 대기)
+        self._tasks: Set[asyncio.Task] = set()
+        self.push_hits = 0
+        self.pushes = 0
+        self.invalidations = 0
+        ws_feed.on("webData2", self._on_web_data)
+        # userEvents 구독의 푸시 channel 이름은 "user"
+        ws_feed.on("user", self._on_user_events)
+        ws_feed.on_resync(self._on_resync)
+
+    @staticmethod
+    def _cache_key(address: str) -> str:
+        return "account:" + address
+
+    def _on_web_data(self, data: Dict) -> None:
+        if not isinstance(data, dict):
+            return
+        address = normalize_account_address(data.get("user", ""))
+        state = data.get("clearinghouseState")
+        if address not in self._watched or not isinstance(state, dict):
+            return
+        self._pushed[address] = (time.time(), state)
+        self.pushes += 1
+
+    def _on_user_events(self, data: Any) -> None:
+        # 푸시의 user 필드가 있으면 그 주소만, 없으면(구독별로 구분할 수 없으면) 감시 중인 주소 전체를 무효화
+        user = data.get("user") if isinstance(data, dict) else None
+        if user:
+            address = normalize_account_address(user)
+            if address in self._watched:
+                self.invalidate(address)
+            return
+        for address in list(self._watched):
+            self.invalidate(address)
+
+    async def _on_resync(self) -> None:
+        # 끊겨 있던 동안의 푸시는 유실됐으므로 푸시 스냅샷을 버리고 REST로 다시 채움
+        self._pushed.clear()
+
+    def invalidate(self, address: str) -> None:
+        """
+        주소 스냅샷 무효화 (푸시 스냅샷 + 캐시, 동기 핸들러에서도 호출 가능)
+        """
+        address = normalize_account_address(address)
+        self._pushed.pop(address, None)
+        self.invalidations += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(cache.invalidate(self._cache_key(address)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _get_pushed(self, address: str) -> Optional[Dict]:
+        entry = self._pushed.get(address)
+        if entry is None or not self.feed.connected:
+            return None
+        pushed_at, state = entry
+        if time.time() - pushed_at > settings.ACCOUNT_PUSH_STALE_SECONDS:
+            return None
+        return state
+
+    async def _fetch(self, address: str) -> Dict:
+        payload = {"type": "clearinghouseState", "user": address}
+
+        async def post():
+            resp = await hyperliquid_http().post(f"{settings.HYPERLIQUID_API_URL}/info", json=payload)
+            if resp.status_code != 200:
+                raise AccountStateError(resp.status_code, resp.text)
+            return decode_response(resp)
+
+        return await coalesce_info(payload, post)
+
+    async def get(self, address: str) -> Dict:
+        """
+        주소의 clearinghouseState 스냅샷 반환 (푸시 스냅샷 → 캐시 → 업스트림)
+        - 업스트림 비정상 응답은 AccountStateError
+        """
+        address = normalize_account_address(address)
+        state = self._get_pushed(address)
+        if state is not None:
+            self.push_hits += 1
+            return state
+        return await cache.get_or_fetch(
+            self._cache_key(address),
+            settings.CACHE_TTL_USER_STATE,
+            lambda: self._fetch(address),
+        )
+
+    async def get_many(self, addresses: List[str]) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """
+        여러 주소의 스냅샷을 한 번에 조회
+        - 푸시 스냅샷 → 캐시(L2 파이프라인 1회) → 나머지만 업스트림 동시 조회
+        - 업스트림 동시 조회 수는 PORTFOLIO_CONCURRENCY, 주소당 제한 시간은 PORTFOLIO_TIMEOUT
+        - 반환: (정규화 주소 → 스냅샷, 정규화 주소 → 오류 메시지)
+        """
+        states: Dict[str, Dict] = {}
+        errors: Dict[str, str] = {}
+        pending: List[str] = []
+        for address in dict.fromkeys(normalize_account_address(address) for address in addresses):
+            state = self._get_pushed(address)
+            if state is not None:
+                self.push_hits += 1
+                states[address] = state
+            else:
+                pending.append(address)
+        if pending:
+            cached = await cache.get_many([self._cache_key(address) for address in pending], settings.CACHE_TTL_USER_STATE)
+            for address in pending:
+                state = cached.get(self._cache_key(address))
+                if state is not None:
+                    states[address] = state
+        semaphore = asyncio.Semaphore(settings.PORTFOLIO_CONCURRENCY)
+
+        async def fetch_one(address: str) -> None:
+            async with semaphore:
+                try:
+                    states[address] = await asyncio.wait_for(self.get(address), settings.PORTFOLIO_TIMEOUT)
+                except asyncio.TimeoutError:
+                    errors[address] = f"Timed out after {settings.PORTFOLIO_TIMEOUT}s"
+                except Exception as e:
+                    errors[address] = str(e)
+
+        await asyncio.gather(*(fetch_one(address) for address in pending if address not in states))
+        return states, errors
+
+    async def watch(self, address: str) -> None:
+        """
+        주소를 감시 목록에 추가 (webData2/userEvents 구독)
+        """
+        address = normalize_account_address(address)
+        if address in self._watched:
+            return
+        self._watched.add(address)
+        for subscription in _account_subscriptions(address):
+            await self.feed.subscribe(subscription)
+
+    async def unwatch(self, address: str) -> None:
+        address = normalize_account_address(address)
+        if address not in self._watched:
+            return
+        self._watched.discard(address)
+        self._pushed.pop(address, None)
+        for subscription in _account_subscriptions(address):
+            await self.feed.unsubscribe(subscription)
+
+    def is_watched(self, address: str) -> bool:
+        return normalize_account_address(address) in self._watched
+
+    async def start(self) -> None:
+        """
+        ACCOUNT_WATCH_ADDRESSES의 주소 감시 시작 (앱 lifespan에서 호출)
+        """
+        for address in settings.ACCOUNT_WATCH_ADDRESSES.split(","):
+            if address.strip():
+                await self.watch(address.strip())
+
+    async def stop(self) -> None:
+        """
+        감시 주소 구독 해제 + 진행 중인 캐시 무효화 완료 대기 (앱 lifespan 종료 시 호출)
+        """
+        for address in list(self._watched):
+            await self.unwatch(address)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def clear(self) -> None:
+        """푸시 스냅샷 비우기 (감시 목록은 유지)"""
+        self._pushed.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "watched": len(self._watched),
+            "pushed": len(self._pushed),
+            "pushes": self.pushes,
+            "push_hits": self.push_hits,
+            "invalidations": self.invalidations,
+        }
+
+
+# 앱 전체에서 공유하는 계정 스냅샷 계층
+accounts = AccountSnapshots(feed)
@@ -0,0 +1,200 @@
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.core.memo import LastValue
+
+# 자산 컨텍스트에서 float64 컬럼으로 보관할 필드 (metaAndAssetCtxs 원본 key)
+ASSET_CTX_COLUMNS: Tuple[str, ...] = (
+    "funding",
+    "openInterest",
+    "markPx",
+    "midPx",
+    "oraclePx",
+    "premium",
+    "prevDayPx",
+    "dayNtlVlm",
+    "dayBaseVlm",
+)
+
+# 원본 컬럼에서 계산하는 파생 컬럼
+DERIVED_COLUMNS: Tuple[str, ...] = (
+    "change24h",  # markPx / prevDayPx - 1
+    "openInterestNtl",  # openInterest * markPx (USD)
+)
+
+COLUMNS: Tuple[str, ...] = ASSET_CTX_COLUMNS + DERIVED_COLUMNS
+
+_OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "=": np.equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+_CONDITION_RE = re.compile(r"^\s*(\w+)\s*(>=|<=|==|!=|>|<|=)\s*(\S+)\s*$")
+
+Condition = Tuple[str, str, float]
+
+
+def parse_conditions(where: Optional[str], columns: Sequence[str] = COLUMNS) -> List[Condition]:
+    """
+    "dayNtlVlm>1000000,funding>0" 형식의 필터 조건 파싱 (columns에 없는 컬럼/잘못된 조건은 ValueError)
+    """
+    if not where:
+        return []
+    conditions = []
+    for item in where.split(","):
+        if not item.strip():
+            continue
+        match = _CONDITION_RE.match(item)
+        if match is None:
+            raise ValueError(f"Invalid condition: {item.strip()}")
+        column, op, raw_value = match.groups()
+        if column not in columns:
+            raise ValueError(f"Unknown column: {column}")
+        try:
+            value = float(raw_value)
+        except ValueError:
+            raise ValueError(f"Invalid number in condition: {item.strip()}")
+        conditions.append((column, op, value))
+    return conditions
+
+
+def _to_cell(value: Any) -> str:
+    # 누락 필드(None)는 NaN으로 두고, 나머지는 numpy가 문자열을 한 번에 float64로 변환
+    return "nan" if value is None else value
+
+
+class AssetTable:
+    """
+    metaAndAssetCtxs 스냅샷의 컬럼형 테이블 (필드마다 float64 배열 1개)
+    - 스냅샷 갱신마다 한 번, 전체 자산을 하나의 2차원 배열로 벡터 변환해 생성
+    - 필터/정렬/상위 N은 배열 연산으로 처리 (요청마다 자산별 float 변환 없음)
+    - 누락/변환 불가 값은 NaN이며, NaN은 모든 비교 조건에서 제외
+    - 생성 후 변경하지 않으므로 읽는 쪽은 lock 없이 공유
+    """
+
+    __slots__ = ("snapshot", "names", "index", "columns", "built_at")
+
+    def __init__(self, snapshot: List):
+        self.snapshot = snapshot
+        assets = snapshot[0]["universe"]
+        asset_ctxs = snapshot[1]
+        count = min(len(assets), len(asset_ctxs))
+        self.names: Tuple[str, ...] = tuple(asset["name"] for asset in assets[:count])
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        rows = [[_to_cell(ctx.get(field)) for field in ASSET_CTX_COLUMNS] for ctx in asset_ctxs[:count]]
+        try:
+            matrix = np.array(rows, dtype=np.float64).reshape(count, len(ASSET_CTX_COLUMNS))
+        except ValueError:
+            # 숫자가 아닌 값이 섞인 경우에만 셀 단위로 변환
+            matrix = np.array([[_parse_float(cell) for cell in row] for row in rows], dtype=np.float64).reshape(count, len(ASSET_CTX_COLUMNS))
+        # 컬럼별로 연속된 배열이 되도록 전치 후 복사
+        matrix = np.ascontiguousarray(matrix.T)
+        self.columns: Dict[str, np.ndarray] = {field: matrix[i] for i, field in enumerate(ASSET_CTX_COLUMNS)}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.columns["change24h"] = self.columns["markPx"] / self.columns["prevDayPx"] - 1.0
+        self.columns["openInterestNtl"] = self.columns["openInterest"] * self.columns["markPx"]
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self.columns:
+            raise ValueError(f"Unknown column: {name}")
+        return self.columns[name]
+
+    def query(
+        self,
+        conditions: Sequence[Condition] = (),
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        absolute: bool = False,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        필터 → 정렬 → 상위 limit개 (matched 수, 결과 행 목록) 반환
+        - fields를 생략하면 원본 컬럼 + 파생 컬럼 전체 반환
+        """
+        return query_columns(self.names, self.columns, conditions, sort_by, descending, limit, fields or COLUMNS, absolute)
+
+
+def query_columns(
+    names: Sequence[str],
+    columns: Dict[str, np.ndarray],
+    conditions: Sequence[Condition] = (),
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    limit: Optional[int] = None,
+    fields: Sequence[str] = COLUMNS,
+    absolute: bool = False,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    names와 같은 길이의 컬럼 배열들에 대해 필터 → 정렬 → 상위 limit개 (matched 수, 결과 행 목록)
+    - 조건은 모두 만족해야 하며 NaN은 어떤 조건도 만족하지 않음
+    - sort_by 컬럼이 NaN인 행은 정렬 대상에서 제외, absolute이면 절댓값 기준 정렬
+    - limit이 결과보다 작으면 argpartition으로 상위 limit개만 정렬
+    - 없는 컬럼은 ValueError
+    """
+    def column(name: str) -> np.ndarray:
+        if name not in columns:
+            raise ValueError(f"Unknown column: {name}")
+        return columns[name]
+
+    fields = list(fields)
+    for field in fields:
+        column(field)
+    mask = np.ones(len(names), dtype=bool)
+    for name, op, value in conditions:
+        with np.errstate(invalid="ignore"):
+            mask &= _OPERATORS[op](column(name), value)
+    if sort_by is not None:
+        keys = column(sort_by)
+        mask &= ~np.isnan(keys)
+    rows = np.flatnonzero(mask)
+    matched = len(rows)
+    if sort_by is not None and matched:
+        keys = keys[rows]
+        if absolute:
+            keys = np.abs(keys)
+        if descending:
+            keys = -keys
+        if limit is not None and limit < matched:
+            top = np.argpartition(keys, limit - 1)[:limit]
+            rows = rows[top[np.argsort(keys[top], kind="stable")]]
+        else:
+            rows = rows[np.argsort(keys, kind="stable")]
+    elif limit is not None:
+        rows = rows[:limit]
+    selected = {field: columns[field][rows].tolist() for field in fields}
+    results = []
+    for i, row in enumerate(rows.tolist()):
+        item: Dict[str, Any] = {"symbol": names[row]}
+        for field in fields:
+            value = selected[field][i]
+            item[field] = None if value != value else value  # NaN → null
+        results.append(item)
+    return matched, results
+
+
+def _parse_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+# 마지막 스냅샷의 테이블 (스냅샷 객체가 바뀔 때만 다시 생성)
+_tables: LastValue[AssetTable] = LastValue(by_identity=True)
+
+
+def asset_table(snapshot: List) -> AssetTable:
+    """
+    스냅샷의 컬럼형 테이블 반환 (같은 스냅샷 객체면 이미 만든 테이블 재사용)
+    """
+    return _tables.get(snapshot, lambda: AssetTable(snapshot))
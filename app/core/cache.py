@@ -0,0 +1,315 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import redis.asyncio as redis
+from app.config import settings
+from app.core.decoding import dumps, loads
+from app.core.singleflight import SingleFlight
+
+
+class CacheBackend(ABC):
+    """
+    공유 캐시(L2) 백엔드 인터페이스
+    - 값은 직렬화된 bytes, 만료는 백엔드가 관리
+    """
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> List[Tuple[Optional[bytes], Optional[float]]]:
+        """
+        keys 순서대로 (값, 남은 TTL 초) 반환 (없으면 (None, None))
+        """
+
+    @abstractmethod
+    async def set_many(self, items: Dict[str, bytes], ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis L2 백엔드 (여러 uvicorn 워커가 업스트림 조회 결과를 공유)
+    - 조회는 GET+PTTL을 한 번의 파이프라인으로 처리해 L1 만료 시각도 함께 맞춤
+    """
+
+    def __init__(self, url: str, db: int, prefix: str = "hub:"):
+        self._redis = redis.from_url(url, db=db)
+        self.prefix = prefix
+
+    async def get_many(self, keys: List[str]) -> List[Tuple[Optional[bytes], Optional[float]]]:
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(self.prefix + key)
+            pipe.pttl(self.prefix + key)
+        raw = await pipe.execute()
+        result = []
+        for i in range(0, len(raw), 2):
+            value, pttl = raw[i], raw[i + 1]
+            if value is None:
+                result.append((None, None))
+            else:
+                result.append((value, pttl / 1000 if pttl and pttl > 0 else None))
+        return result
+
+    async def set_many(self, items: Dict[str, bytes], ttl: float) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+        await pipe.execute()
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.prefix + key)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class TwoLevelCache:
+    """
+    프로세스 내 L1(dict) + 공유 L2(Redis 등) 2단계 캐시
+    - 조회 순서: L1 → L2 → fetch (동일 key 동시 miss는 SingleFlight로 1회만 fetch)
+    - L2 오류 시 CACHE_L2_RETRY_SECONDS 동안 L2를 건너뛰고 L1만 사용
+    - L1은 최대 max_entries개 LRU이며, 만료 항목은 CACHE_L1_SWEEP_SECONDS마다 쓰기 시점에 일괄 제거
+      (주소별 key처럼 다시 읽히지 않는 항목이 쌓이지 않도록)
+    - 값은 JSON 직렬화 가능한 업스트림 응답을 가정하며, 반환 객체는 공유되므로 수정하지 말 것
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, max_entries: Optional[int] = None):
+        self.backend = backend
+        self.max_entries = max_entries if max_entries is not None else settings.CACHE_L1_MAX_ENTRIES
+        self._l1: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._next_sweep = 0.0
+        self._flight = SingleFlight("cache")
+        self._l2_disabled_until = 0.0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.l2_errors = 0
+        self.l1_evictions = 0
+        self.l1_expired = 0
+
+    def _l2_available(self) -> bool:
+        return self.backend is not None and time.time() >= self._l2_disabled_until
+
+    def _on_l2_error(self, e: Exception) -> None:
+        self.l2_errors += 1
+        self._l2_disabled_until = time.time() + settings.CACHE_L2_RETRY_SECONDS
+        print(f"[cache] L2 오류, {settings.CACHE_L2_RETRY_SECONDS}초간 L1만 사용: {e}")
+
+    def _get_l1(self, key: str) -> Tuple[bool, Any]:
+        entry = self._l1.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._l1[key]
+            self.l1_expired += 1
+            return False, None
+        self._l1.move_to_end(key)
+        return True, value
+
+    def _set_l1(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        l1 = self._l1
+        l1[key] = (now + ttl, value)
+        l1.move_to_end(key)
+        if now >= self._next_sweep:
+            self._sweep_l1(now)
+        while len(l1) > self.max_entries:
+            l1.popitem(last=False)
+            self.l1_evictions += 1
+
+    def _sweep_l1(self, now: float) -> None:
+        """만료된 L1 항목 일괄 제거"""
+        expired = [key for key, (expires_at, _) in self._l1.items() if expires_at < now]
+        for key in expired:
+            del self._l1[key]
+        self.l1_expired += len(expired)
+        self._next_sweep = now + settings.CACHE_L1_SWEEP_SECONDS
+
+    async def get_many(self, keys: List[str], ttl: Optional[float] = None) -> Dict[str, Any]:
+        """
+        여러 key를 한 번에 조회 (L1 miss만 L2 파이프라인 1회로 조회)
+        - 반환: 찾은 key만 담은 dict
+        - ttl: L2가 남은 TTL을 알려주지 않을 때 L1에 적용할 TTL
+        """
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            hit, value = self._get_l1(key)
+            if hit:
+                self.l1_hits += 1
+                found[key] = value
+            else:
+                missing.append(key)
+        if missing and self._l2_available():
+            try:
+                rows = await self.backend.get_many(missing)
+            except Exception as e:
+                self._on_l2_error(e)
+                rows = [(None, None)] * len(missing)
+            for key, (raw, remaining) in zip(missing, rows):
+                if raw is None:
+                    continue
+                value = loads(raw)
+                l1_ttl = remaining if remaining is not None else ttl
+                if l1_ttl:
+                    self._set_l1(key, value, l1_ttl)
+                self.l2_hits += 1
+                found[key] = value
+        return found
+
+    async def get(self, key: str) -> Optional[Any]:
+        return (await self.get_many([key])).get(key)
+
+    async def set_many(self, items: Dict[str, Any], ttl: float) -> None:
+        for key, value in items.items():
+            self._set_l1(key, value, ttl)
+        if items and self._l2_available():
+            try:
+                await self.backend.set_many(
+                    {key: dumps(value) for key, value in items.items()},
+                    ttl,
+                )
+            except Exception as e:
+                self._on_l2_error(e)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def invalidate(self, key: str) -> None:
+        self._l1.pop(key, None)
+        if self._l2_available():
+            try:
+                await self.backend.delete(key)
+            except Exception as e:
+                self._on_l2_error(e)
+
+    async def get_or_fetch(self, key: str, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        캐시에 있으면 반환, 없으면 fetch 결과를 L1/L2에 ttl초 동안 저장 후 반환
+        """
+        found = await self.get_many([key], ttl)
+        if key in found:
+            return found[key]
+        self.misses += 1
+
+        async def fetch_and_store():
+            value = await fetch()
+            await self.set(key, value, ttl)
+            return value
+
+        return await self._flight.do(key, fetch_and_store)
+
+    def clear(self) -> None:
+        """L1 전체 비우기 (L2는 TTL로 만료)"""
+        self._l1.clear()
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "l1_size": len(self._l1),
+            "l1_evictions": self.l1_evictions,
+            "l1_expired": self.l1_expired,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l2_errors": self.l2_errors,
+        }
+
+
+class StaleWhileRevalidate:
+    """
+    단일 값(대용량 스냅샷 등)용 stale-while-revalidate 캐시
+    - fresh_ttl 이내: 캐시 값 즉시 반환
+    - stale_ttl 이내: 캐시 값 즉시 반환 + 백그라운드 갱신 1회 예약
+    - stale_ttl 초과/값 없음: 첫 호출자만 갱신을 기다리고, 갱신 중 들어온 호출자는
+      (만료된 값이라도 있으면) 기존 값을 즉시 반환, 값이 없으면 같은 갱신 결과를 공유
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], Awaitable[Any]], fresh_ttl: float, stale_ttl: float):
+        self.name = name
+        self._fetch = fetch
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self._value: Any = None
+        self._fetched_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Future] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def _age(self) -> Optional[float]:
+        return None if self._fetched_at is None else time.monotonic() - self._fetched_at
+
+    async def _refresh(self) -> Any:
+        value = await self._fetch()
+        self._value = value
+        self._fetched_at = time.monotonic()
+        self.refreshes += 1
+        return value
+
+    def _start_refresh(self) -> asyncio.Future:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    def _on_refresh_done(self, task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_errors += 1
+            print(f"[cache] {self.name} 갱신 실패: {task.exception()}")
+
+    async def get(self) -> Any:
+        age = self._age()
+        if age is not None and age <= self.fresh_ttl:
+            self.hits += 1
+            return self._value
+        if age is not None and age <= self.stale_ttl:
+            self.stale_hits += 1
+            self._start_refresh()
+            return self._value
+        refreshing = self._refresh_task is not None and not self._refresh_task.done()
+        if refreshing and age is not None:
+            # 만료된 값이지만 이미 다른 호출자가 갱신 중이면 기다리지 않고 기존 값 반환
+            self.stale_hits += 1
+            return self._value
+        self.misses += 1
+        return await asyncio.shield(self._start_refresh())
+
+    def invalidate(self) -> None:
+        self._value = None
+        self._fetched_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "age": self._age(),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+def _create_backend() -> Optional[CacheBackend]:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.REDIS_URL, settings.REDIS_DB)
+    return None
+
+
+# 앱 전체에서 공유하는 업스트림 응답 캐시 (CACHE_BACKEND=redis이면 워커 간 공유)
+cache = TwoLevelCache(_create_backend())
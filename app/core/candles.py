@@ -0,0 +1,533 @@
+import asyncio
+import time
+from array import array
+from collections import deque
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+from app.config import settings
+from app.core.sqlite_store import SqliteStore
+from app.core.ws_feed import HyperliquidWsFeed, feed
+
+# 지원하는 봉 간격 → 초
+INTERVAL_SECONDS: Dict[str, int] = {
+    "1s": 1,
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400,
+}
+
+# 닫힌 봉 1개: (open_time_ms, open, high, low, close, volume, trades)
+Bar = Tuple[int, float, float, float, float, float, int]
+
+# 이어서 집계할 위치: (마지막 체결 시각 ms, 그 시각에 이미 집계한 체결 ID들)
+ResumePoint = Tuple[int, FrozenSet[int]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    coin TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    open_time INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL NOT NULL,
+    trades INTEGER NOT NULL,
+    PRIMARY KEY (coin, interval, open_time)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS candle_cursors (
+    coin TEXT PRIMARY KEY,
+    last_time INTEGER NOT NULL,
+    last_tids TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# 같은 봉이 다시 기록되면(재시작/구독 해제 전 저장한 진행 중 봉 + 이후 체결로 닫힌 봉) 두 봉을 합침
+# - 시가는 먼저 저장된 값, 고가/저가는 최대/최소, 종가는 나중 값, 거래량/체결 수는 합
+# - 두 봉의 체결이 겹치지 않도록 엔진이 코인별 마지막 (체결 시각, 체결 ID)(candle_cursors) 이후 체결만 집계하고,
+#   저장된 봉에서 이어 집계한 봉은 저장된 몫을 뺀 거래량/체결 수로 기록 (CandleSeries.unsaved)
+_UPSERT = """
+INSERT INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (coin, interval, open_time) DO UPDATE SET
+    high = MAX(high, excluded.high),
+    low = MIN(low, excluded.low),
+    close = excluded.close,
+    volume = volume + excluded.volume,
+    trades = trades + excluded.trades
+"""
+
+# 더 늦은 시각이면 교체, 같은 시각이면 체결 ID 목록을 합침 (SET 식은 모두 갱신 전 값을 참조)
+_UPSERT_CURSOR = """
+INSERT INTO candle_cursors VALUES (?, ?, ?)
+ON CONFLICT (coin) DO UPDATE SET
+    last_tids = CASE
+        WHEN excluded.last_time > last_time THEN excluded.last_tids
+        WHEN excluded.last_time = last_time THEN last_tids || ',' || excluded.last_tids
+        ELSE last_tids
+    END,
+    last_time = MAX(last_time, excluded.last_time)
+"""
+
+
+def merge_resume(a: Optional[ResumePoint], b: Optional[ResumePoint]) -> Optional[ResumePoint]:
+    """두 이어서 집계할 위치 중 늦은 쪽 (같은 시각이면 체결 ID 합집합)"""
+    if a is None:
+        return b
+    if b is None or a[0] > b[0]:
+        return a
+    if b[0] > a[0]:
+        return b
+    return (a[0], a[1] | b[1])
+
+
+def parse_intervals(value: str) -> Tuple[str, ...]:
+    """
+    "1s,1m,5m,1h" 형식의 봉 간격 목록 파싱 (지원하지 않는 간격은 ValueError)
+    """
+    intervals = tuple(item.strip() for item in value.split(",") if item.strip())
+    for interval in intervals:
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"Unsupported interval: {interval}")
+    return intervals
+
+
+def format_bar(coin: str, interval: str, bar: Bar) -> Dict[str, Any]:
+    """
+    Hyperliquid candleSnapshot과 같은 형식 ({"t", "T", "s", "i", "o", "c", "h", "l", "v", "n"})
+    """
+    open_time = bar[0]
+    return {
+        "t": open_time,
+        "T": open_time + INTERVAL_SECONDS[interval] * 1000 - 1,
+        "s": coin,
+        "i": interval,
+        "o": bar[1],
+        "c": bar[4],
+        "h": bar[2],
+        "l": bar[3],
+        "v": bar[5],
+        "n": bar[6],
+    }
+
+
+class CandleSeries:
+    """
+    코인 1개 / 간격 1개의 OHLCV 링 버퍼 (미리 할당한 compact 배열)
+    - 체결 1건 반영은 O(1): 현재 봉 갱신 또는 다음 칸에 새 봉 시작
+    - 체결이 없던 구간은 봉을 만들지 않음 (Hyperliquid 캔들과 동일)
+    - 현재 봉보다 이전 시각의 체결(늦게 도착한 체결)은 반영하지 않고 late로 집계
+    - 저장된 진행 중 봉으로 시작(seed)하면 저장소에 다시 기록할 때 저장된 몫을 뺌 (unsaved)
+    """
+
+    __slots__ = ("coin", "interval", "step_ms", "capacity", "t", "o", "h", "l", "c", "v", "n", "head", "count", "late", "base")
+
+    def __init__(self, coin: str, interval: str, capacity: int):
+        self.coin = coin
+        self.interval = interval
+        self.step_ms = INTERVAL_SECONDS[interval] * 1000
+        self.capacity = capacity
+        self.t = array("q", bytes(8 * capacity))
+        self.o = array("d", bytes(8 * capacity))
+        self.h = array("d", bytes(8 * capacity))
+        self.l = array("d", bytes(8 * capacity))
+        self.c = array("d", bytes(8 * capacity))
+        self.v = array("d", bytes(8 * capacity))
+        self.n = array("q", bytes(8 * capacity))
+        self.head = -1  # 현재(진행 중) 봉 위치
+        self.count = 0
+        self.late = 0
+        self.base: Optional[Bar] = None
+
+    def bar(self, i: int) -> Bar:
+        return (self.t[i], self.o[i], self.h[i], self.l[i], self.c[i], self.v[i], self.n[i])
+
+    def seed(self, bar: Bar) -> None:
+        """
+        저장소의 진행 중 봉을 현재 봉으로 시작 (재시작/재구독 직후 조회에도 이미 저장된 체결이 포함되도록)
+        """
+        head = self.head = (self.head + 1) % self.capacity
+        self.t[head], self.o[head], self.h[head], self.l[head], self.c[head], self.v[head], self.n[head] = bar
+        self.count = min(self.count + 1, self.capacity)
+        self.base = bar
+
+    def unsaved(self, bar: Bar) -> Bar:
+        """
+        저장할 봉 (seed 봉이면 저장소에 이미 있는 거래량/체결 수를 빼서 _UPSERT 합산 시 중복 집계하지 않음)
+        """
+        base = self.base
+        if base is None or bar[0] != base[0]:
+            return bar
+        return bar[:5] + (bar[5] - base[5], bar[6] - base[6])
+
+    def update(self, ts: int, px: float, sz: float) -> Optional[Bar]:
+        """
+        체결 1건 반영, 새 봉이 시작되어 직전 봉이 닫혔으면 그 봉을 반환
+        """
+        open_time = ts - ts % self.step_ms
+        head = self.head
+        if self.count:
+            current = self.t[head]
+            if open_time == current:
+                if px > self.h[head]:
+                    self.h[head] = px
+                elif px < self.l[head]:
+                    self.l[head] = px
+                self.c[head] = px
+                self.v[head] += sz
+                self.n[head] += 1
+                return None
+            if open_time < current:
+                self.late += 1
+                return None
+        closed = self.bar(head) if self.count else None
+        head = self.head = (head + 1) % self.capacity
+        self.t[head] = open_time
+        self.o[head] = self.h[head] = self.l[head] = self.c[head] = px
+        self.v[head] = sz
+        self.n[head] = 1
+        self.count = min(self.count + 1, self.capacity)
+        return closed
+
+    def oldest(self) -> Optional[int]:
+        if not self.count:
+            return None
+        return self.t[(self.head - self.count + 1) % self.capacity]
+
+    def bars(self, start: int = 0, end: Optional[int] = None, limit: Optional[int] = None) -> List[Bar]:
+        """
+        시작 시각이 [start, end]인 봉을 시간순으로 반환 (limit이면 마지막 limit개, 진행 중인 봉 포함)
+        """
+        result: List[Bar] = []
+        # 최신 봉부터 거꾸로 읽어 limit개가 차면 중단
+        for k in range(self.count):
+            i = (self.head - k) % self.capacity
+            open_time = self.t[i]
+            if open_time < start:
+                break
+            if end is not None and open_time > end:
+                continue
+            result.append(self.bar(i))
+            if limit is not None and len(result) >= limit:
+                break
+        result.reverse()
+        return result
+
+
+class CandleStore(SqliteStore):
+    """
+    닫힌 봉 영구 저장소 (SQLite, (coin, interval, open_time) 기본 키)
+    - 쓰기는 모아서 executemany 한 번으로 처리 (엔진이 이벤트 루프 밖 스레드에서 호출)
+    """
+
+    SCHEMA = _SCHEMA
+
+    def put_many(self, rows: Sequence[Tuple], cursors: Sequence[Tuple[str, int, Set[int]]] = ()) -> None:
+        """
+        (coin, interval, open_time, o, h, l, c, v, n) 행과 (coin, 마지막 체결 시각, 그 시각의 체결 ID들) 커서를 한 트랜잭션으로 저장
+        - 같은 봉이 이미 있으면 덮어쓰지 않고 합침 (_UPSERT)
+        """
+        if not rows and not cursors:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(_UPSERT, rows)
+            conn.executemany(_UPSERT_CURSOR, [(coin, last_time, ",".join(map(str, tids))) for coin, last_time, tids in cursors])
+            conn.commit()
+        self.writes += len(rows)
+
+    def resume_point(self, coin: str) -> Optional[ResumePoint]:
+        """코인의 저장된 마지막 체결 시각(ms)과 그 시각의 체결 ID들 (없으면 None)"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT last_time, last_tids FROM candle_cursors WHERE coin = ?", (coin,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], frozenset(int(tid) for tid in row[1].split(",") if tid)
+
+    def resume_state(self, coin: str, intervals: Sequence[str]) -> Tuple[Optional[ResumePoint], Dict[str, Bar]]:
+        """
+        재시작/재구독 시 이어서 집계할 상태 (스레드에서 1회로 조회)
+        - (이어서 집계할 위치, 간격별로 마지막 체결이 속한 저장된 봉)
+        """
+        resume = self.resume_point(coin)
+        open_bars: Dict[str, Bar] = {}
+        if resume is not None:
+            for interval in intervals:
+                step_ms = INTERVAL_SECONDS[interval] * 1000
+                open_time = resume[0] - resume[0] % step_ms
+                bars = self.bars(coin, interval, open_time, open_time, 1)
+                if bars:
+                    open_bars[interval] = bars[0]
+        return resume, open_bars
+
+    def bars(self, coin: str, interval: str, start: int, end: int, limit: int) -> List[Bar]:
+        """시작 시각이 [start, end]인 봉 중 마지막 limit개를 시간순으로 반환"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT open_time, open, high, low, close, volume, trades FROM candles "
+                "WHERE coin = ? AND interval = ? AND open_time BETWEEN ? AND ? "
+                "ORDER BY open_time DESC LIMIT ?",
+                (coin, interval, start, end, limit),
+            ).fetchall()
+        rows.reverse()
+        return [tuple(row) for row in rows]
+
+
+class CandleEngine:
+    """
+    WebSocket trades 채널로 코인별 여러 간격의 OHLCV 봉을 유지하는 캔들 엔진
+    - 추적 중인 코인만 trades를 구독하고, 체결마다 모든 간격의 봉을 O(1)로 갱신
+    - CANDLE_COINS 외 코인은 CANDLE_IDLE_SECONDS 동안 조회가 없으면 진행 중인 봉을 저장하고 구독 해제
+    - 닫힌 봉은 모아 두었다가 CANDLE_FLUSH_SECONDS마다 저장소에 일괄 기록 (코인별 마지막 체결 시각도 함께)
+    - 조회는 메모리 링 버퍼에서 처리하고, 메모리보다 오래된 구간만 로컬 저장소에서 읽음 (스레드에서 실행)
+    - 재연결 직후 받은 최근 체결 스냅샷의 중복은 체결 ID(tid)로 제거
+    - 재시작/재구독 직후에는 저장된 마지막 (체결 시각, 체결 ID) 이전 체결을 버려 저장된 봉과 합칠 때 중복 집계하지 않음
+      (같은 ms의 다른 체결은 집계)
+    - 재시작/재구독 시 마지막 체결이 속한 저장된 봉으로 진행 중인 봉을 시작하므로 조회 결과가 끊기지 않음
+    """
+
+    def __init__(self, ws_feed: HyperliquidWsFeed, store: CandleStore, intervals: Sequence[str], capacity: int):
+        self.feed = ws_feed
+        self.store = store
+        self.intervals = tuple(intervals)
+        self.capacity = capacity
+        self.series: Dict[str, Dict[str, CandleSeries]] = {}
+        self._recent_tids: Dict[str, Tuple[Deque[int], Set[int]]] = {}
+        self._pending: List[Tuple] = []
+        self._last_trade: Dict[str, Tuple[int, Set[int]]] = {}
+        self._resume_after: Dict[str, ResumePoint] = {}
+        self._last_read: Dict[str, float] = {}
+        self._pinned: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._evict_task: Optional[asyncio.Task] = None
+        self.trades = 0
+        self.duplicates = 0
+        self.closed_bars = 0
+        self.flush_errors = 0
+        self.evictions = 0
+        ws_feed.on("trades", self._on_trades)
+
+    def _is_duplicate(self, coin: str, tid: Any) -> bool:
+        if tid is None:
+            return False
+        recent = self._recent_tids.get(coin)
+        if recent is None:
+            recent = self._recent_tids[coin] = (deque(), set())
+        order, seen = recent
+        if tid in seen:
+            return True
+        order.append(tid)
+        seen.add(tid)
+        if len(order) > 1000:
+            seen.discard(order.popleft())
+        return False
+
+    def _on_trades(self, data: Any) -> None:
+        if not isinstance(data, list):
+            return
+        for trade in data:
+            coin = trade.get("coin")
+            series = self.series.get(coin)
+            if series is None:
+                continue
+            ts = int(trade["time"])
+            tid = trade.get("tid")
+            resume = self._resume_after.get(coin)
+            if (
+                resume is not None and (ts < resume[0] or (ts == resume[0] and (tid is None or tid in resume[1])))
+            ) or self._is_duplicate(coin, tid):
+                self.duplicates += 1
+                continue
+            px = float(trade["px"])
+            sz = float(trade["sz"])
+            self.trades += 1
+            last = self._last_trade.get(coin)
+            if last is None or ts > last[0]:
+                self._last_trade[coin] = (ts, set() if tid is None else {tid})
+            elif ts == last[0] and tid is not None:
+                last[1].add(tid)
+            for interval, candle_series in series.items():
+                closed = candle_series.update(ts, px, sz)
+                if closed is not None:
+                    self._pending.append((coin, interval) + candle_series.unsaved(closed))
+                    self.closed_bars += 1
+
+    def is_tracked(self, coin: str) -> bool:
+        return coin in self.series
+
+    async def track(self, coin: str, pinned: bool = False) -> None:
+        """
+        코인의 봉 집계 시작 (trades 구독)
+        - pinned이면 조회가 없어도 구독 유지 (CANDLE_COINS)
+        """
+        if pinned:
+            self._pinned.add(coin)
+        self._last_read[coin] = time.time()
+        if coin in self.series:
+            return
+        series = self.series[coin] = {interval: CandleSeries(coin, interval, self.capacity) for interval in self.intervals}
+        # 구독 해제 때 저장 대기열에 넣은 진행 중인 봉부터 기록해야 아래에서 이어서 집계할 봉으로 읽힘
+        await self.flush()
+        try:
+            stored, open_bars = await asyncio.to_thread(self.store.resume_state, coin, self.intervals)
+        except Exception as e:
+            print(f"[candles] {coin} 이어서 집계할 위치 조회 실패: {e}")
+            stored, open_bars = None, {}
+        resume = merge_resume(self._resume_after.get(coin), stored)
+        if resume is not None:
+            self._resume_after[coin] = resume
+        for interval, bar in open_bars.items():
+            if not series[interval].count:
+                series[interval].seed(bar)
+        await self.feed.subscribe({"type": "trades", "coin": coin})
+
+    def _save_open_bars(self, coin: str) -> None:
+        """진행 중인 봉을 저장 대기열에 추가 (이후 같은 봉이 다시 기록되면 저장소에서 합침)"""
+        for interval, series in self.series.get(coin, {}).items():
+            if series.count:
+                self._pending.append((coin, interval) + series.unsaved(series.bar(series.head)))
+
+    async def untrack(self, coin: str) -> None:
+        """코인의 봉 집계 중단 (진행 중인 봉 저장 후 trades 구독 해제)"""
+        if coin not in self.series:
+            return
+        self._save_open_bars(coin)
+        del self.series[coin]
+        self._recent_tids.pop(coin, None)
+        self._last_read.pop(coin, None)
+        self._pinned.discard(coin)
+        if coin in self._last_trade:
+            # 저장 전에 다시 구독해도 이미 집계한 체결은 다시 세지 않음
+            last_time, tids = self._last_trade[coin]
+            self._resume_after[coin] = merge_resume(self._resume_after.get(coin), (last_time, frozenset(tids)))
+        await self.feed.unsubscribe({"type": "trades", "coin": coin})
+
+    async def evict_idle(self) -> None:
+        """
+        CANDLE_IDLE_SECONDS 동안 조회되지 않은 코인(CANDLE_COINS 제외)의 봉 집계 중단
+        """
+        deadline = time.time() - settings.CANDLE_IDLE_SECONDS
+        for coin in list(self.series):
+            if coin not in self._pinned and self._last_read.get(coin, 0) < deadline:
+                await self.untrack(coin)
+                self.evictions += 1
+
+    async def candles(
+        self,
+        coin: str,
+        interval: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """
+        시작 시각이 [start, end]인 봉 중 마지막 limit개 (시간순, 진행 중인 봉 포함)
+        - 지원하지 않는 간격은 ValueError
+        """
+        if interval not in self.intervals:
+            raise ValueError(f"Unsupported interval: {interval}")
+        if coin in self.series:
+            self._last_read[coin] = time.time()
+        series = self.series.get(coin, {}).get(interval)
+        bars = series.bars(start, end, limit) if series is not None else []
+        oldest = series.oldest() if series is not None else None
+        if len(bars) < limit and (oldest is None or start < oldest):
+            # 메모리에 없는 앞 구간은 로컬 저장소에서 조회
+            stored_end = 2 ** 62 if oldest is None else oldest - 1
+            if end is not None:
+                stored_end = min(stored_end, end)
+            bars = await asyncio.to_thread(self.store.bars, coin, interval, start, stored_end, limit - len(bars)) + bars
+        return [format_bar(coin, interval, bar) for bar in bars]
+
+    async def flush(self) -> None:
+        """모아 둔 닫힌 봉과 코인별 마지막 체결 시각을 저장소에 기록 (이벤트 루프 밖 스레드에서 실행)"""
+        if not self._pending and not self._last_trade:
+            return
+        rows, self._pending = self._pending, []
+        cursors = [(coin, last_time, tids) for coin, (last_time, tids) in self._last_trade.items()]
+        self._last_trade = {}
+        try:
+            await asyncio.to_thread(self.store.put_many, rows, cursors)
+        except Exception as e:
+            self.flush_errors += 1
+            print(f"[candles] 봉 저장 실패: {e}")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.CANDLE_FLUSH_SECONDS)
+            await self.flush()
+
+    async def _evict_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.CANDLE_EVICT_INTERVAL)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                print(f"[candles] idle 코인 정리 실패: {e}")
+
+    async def start(self, coins: Sequence[str] = ()) -> None:
+        for coin in coins:
+            await self.track(coin, pinned=True)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        if self._evict_task is None or self._evict_task.done():
+            self._evict_task = asyncio.create_task(self._evict_loop())
+
+    async def stop(self) -> None:
+        for task in (self._flush_task, self._evict_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._flush_task = self._evict_task = None
+        # 진행 중인 봉도 저장 (재시작 후 같은 봉이 닫히면 저장소에서 합침)
+        for coin in self.series:
+            self._save_open_bars(coin)
+        await self.flush()
+
+    def clear(self) -> None:
+        self.series.clear()
+        self._recent_tids.clear()
+        self._pending = []
+        self._last_trade.clear()
+        self._resume_after.clear()
+        self._last_read.clear()
+        self._pinned.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "coins": len(self.series),
+            "intervals": list(self.intervals),
+            "trades": self.trades,
+            "duplicates": self.duplicates,
+            "late": sum(series.late for by_interval in self.series.values() for series in by_interval.values()),
+            "closed_bars": self.closed_bars,
+            "evictions": self.evictions,
+            "pending": len(self._pending),
+            "stored": self.store.writes,
+            "flush_errors": self.flush_errors,
+        }
+
+
+def _candle_coins() -> List[str]:
+    return [coin.strip() for coin in settings.CANDLE_COINS.split(",") if coin.strip()]
+
+
+# 앱 전체에서 공유하는 봉 저장소 / 캔들 엔진
+candle_store = CandleStore(settings.CANDLE_STORE_PATH)
+candles = CandleEngine(feed, candle_store, parse_intervals(settings.CANDLE_INTERVALS), settings.CANDLE_CAPACITY)
+
+
+async def start_candles() -> None:
+    """CANDLE_COINS 코인의 봉 집계 시작 (앱 lifespan에서 호출)"""
+    await candles.start(_candle_coins())
+
+
+async def stop_candles() -> None:
+    await candles.stop()
+    candle_store.close()
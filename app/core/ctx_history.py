@@ -0,0 +1,308 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.config import settings
+from app.core.asset_table import ASSET_CTX_COLUMNS, AssetTable, asset_table
+from app.core.info_client import meta_and_asset_ctxs
+
+HISTORY_AGGREGATES = ("last", "mean")
+
+
+class CtxHistory:
+    """
+    자산 컨텍스트 시계열 기록기 (메모리 맵 링 버퍼, 재시작 후에도 유지)
+    - 필드마다 파일 1개: float64 [capacity, max_assets] 배열 (행 = 시점, 열 = 심볼 슬롯)
+    - time 파일: 행별 기록 시각(초), 0이면 빈 행. 값을 먼저 쓰고 시각을 마지막에 써서 커밋 표시로 사용
+    - meta.json: 레이아웃(capacity/max_assets/fields)과 심볼 → 슬롯 매핑 (새 심볼이 생길 때만 기록)
+    - 다음 쓰기 위치(head)는 time 파일에서 복원하므로 append마다 메타데이터를 쓰지 않음
+    - 조회는 메모리 맵의 슬라이스(복사 없음)에서 범위를 잘라낸 뒤 필요한 구간만 JSON으로 변환
+    """
+
+    def __init__(self, directory: str, capacity: int, max_assets: int, fields: Sequence[str] = ASSET_CTX_COLUMNS):
+        self.directory = directory
+        self.capacity = capacity
+        self.max_assets = max_assets
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._times: Optional[np.memmap] = None
+        self._columns: Dict[str, np.memmap] = {}
+        self._symbols: Dict[str, Dict[str, Any]] = {}
+        self._slot_cache: Optional[Tuple[Tuple[str, ...], np.ndarray]] = None
+        self._last_snapshot: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self.head = 0
+        self.count = 0
+        self.appended = 0
+        self.dropped_symbols = 0
+        self.errors = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._times is not None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.f8")
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def _layout(self) -> Dict[str, Any]:
+        return {"capacity": self.capacity, "max_assets": self.max_assets, "fields": list(self.fields)}
+
+    def _write_meta(self) -> None:
+        tmp_path = self._meta_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({**self._layout(), "symbols": self._symbols}, f)
+        os.replace(tmp_path, self._meta_path())
+
+    def open(self, directory: Optional[str] = None) -> None:
+        """
+        저장 디렉터리의 링 버퍼를 열거나 새로 생성
+        - 레이아웃이 바뀌었거나 메타데이터가 없으면 기존 기록을 버리고 새로 생성
+        """
+        self.close()
+        if directory is not None:
+            self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        meta = None
+        if os.path.exists(self._meta_path()):
+            with open(self._meta_path()) as f:
+                meta = json.load(f)
+        layout = self._layout()
+        reset = meta is None or any(meta.get(key) != value for key, value in layout.items())
+        reset = reset or not all(os.path.exists(self._path(name)) for name in ("time",) + self.fields)
+        mode = "w+" if reset else "r+"
+        self._times = np.memmap(self._path("time"), dtype=np.float64, mode=mode, shape=(self.capacity,))
+        self._columns = {
+            field: np.memmap(self._path(field), dtype=np.float64, mode=mode, shape=(self.capacity, self.max_assets))
+            for field in self.fields
+        }
+        self._symbols = {} if reset else meta.get("symbols", {})
+        self._slot_cache = None
+        if reset:
+            self._write_meta()
+        written = np.flatnonzero(self._times > 0)
+        self.count = len(written)
+        self.head = (int(np.argmax(self._times)) + 1) % self.capacity if self.count else 0
+
+    def close(self) -> None:
+        times, self._times = self._times, None
+        columns, self._columns = self._columns, {}
+        if times is not None:
+            times.flush()
+        for column in columns.values():
+            column.flush()
+        self._slot_cache = None
+
+    def _slots(self, names: Tuple[str, ...], now: float) -> np.ndarray:
+        """유니버스 순서의 심볼 → 슬롯 배열 (슬롯이 부족하면 -1), 유니버스가 같으면 재사용"""
+        if self._slot_cache is not None and self._slot_cache[0] == names:
+            return self._slot_cache[1]
+        slots = np.full(len(names), -1, dtype=np.int64)
+        added = False
+        for i, name in enumerate(names):
+            entry = self._symbols.get(name)
+            if entry is None:
+                if len(self._symbols) >= self.max_assets:
+                    self.dropped_symbols += 1
+                    continue
+                entry = self._symbols[name] = {"slot": len(self._symbols), "since": now}
+                added = True
+            slots[i] = entry["slot"]
+        if added:
+            self._write_meta()
+        self._slot_cache = (names, slots)
+        return slots
+
+    def append(self, table: AssetTable, ts: Optional[float] = None) -> None:
+        """
+        유니버스 스냅샷 1개를 한 행으로 기록 (스냅샷에 없는 심볼은 NaN)
+        """
+        if not self.is_open:
+            raise RuntimeError("History store is not open")
+        now = time.time() if ts is None else ts
+        if self.count:
+            # 시각은 단조 증가해야 범위 조회(이진 탐색)가 가능
+            now = max(now, float(self._times[(self.head - 1) % self.capacity]) + 1e-6)
+        slots = self._slots(table.names, now)
+        valid = slots >= 0
+        row = np.full(self.max_assets, np.nan)
+        for field in self.fields:
+            row[:] = np.nan
+            row[slots[valid]] = table.columns[field][valid]
+            self._columns[field][self.head] = row
+        self._times[self.head] = now
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.appended += 1
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        """시간순 행 범위 (링이 한 바퀴 돌았으면 head 뒤쪽 → 앞쪽)"""
+        if self.count < self.capacity:
+            return [(0, self.head)]
+        return [(self.head, self.capacity), (0, self.head)]
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def slots_for(self, names: Sequence[str]) -> np.ndarray:
+        """심볼 목록 → 슬롯 배열 (기록된 적 없는 심볼은 -1, 새 슬롯은 만들지 않음)"""
+        return np.array([self._symbols[name]["slot"] if name in self._symbols else -1 for name in names], dtype=np.int64)
+
+    def window(self, fields: Sequence[str], start: float) -> Dict[str, np.ndarray]:
+        """
+        start(초) 이후 기록된 모든 행 (필드 → [행 수, max_assets] 배열, 시간순)
+        - 링이 한 바퀴 돌지 않았으면 메모리 맵 슬라이스를 그대로 반환 (복사 없음)
+        """
+        if not self.is_open:
+            raise RuntimeError("History store is not open")
+        ranges = []
+        for lo, hi in self._segments():
+            i = lo + int(np.searchsorted(self._times[lo:hi], start, side="left"))
+            if i < hi:
+                ranges.append((i, hi))
+        result = {}
+        for field in fields:
+            column = self._columns[field]
+            if not ranges:
+                result[field] = np.empty((0, self.max_assets))
+            elif len(ranges) == 1:
+                result[field] = column[ranges[0][0]:ranges[0][1]]
+            else:
+                result[field] = np.concatenate([column[i:j] for i, j in ranges])
+        return result
+
+    def query(
+        self,
+        symbol: str,
+        fields: Optional[Sequence[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        step: Optional[float] = None,
+        agg: str = "last",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        심볼의 [start, end] 구간 시계열 (시각은 초 단위, 기록된 적 없는 심볼이면 None)
+        - step(초)을 지정하면 step 구간별로 다운샘플링 (agg: last=구간 마지막 값, mean=NaN 제외 평균)
+        - 잘못된 필드/집계 방식은 ValueError
+        반환: {"time": [초, ...], "series": {field: [값, ...]}}
+        """
+        if not self.is_open:
+            raise RuntimeError("History store is not open")
+        fields = list(fields) if fields else list(self.fields)
+        for field in fields:
+            if field not in self._columns:
+                raise ValueError(f"Unknown field: {field}")
+        if agg not in HISTORY_AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {agg}")
+        entry = self._symbols.get(symbol)
+        if entry is None:
+            return None
+        slot = entry["slot"]
+        start = entry["since"] if start is None else max(start, entry["since"])
+        end = float("inf") if end is None else end
+        time_parts = []
+        value_parts: Dict[str, List[np.ndarray]] = {field: [] for field in fields}
+        for lo, hi in self._segments():
+            times = self._times[lo:hi]
+            i = lo + int(np.searchsorted(times, start, side="left"))
+            j = lo + int(np.searchsorted(times, end, side="right"))
+            if i >= j:
+                continue
+            time_parts.append(self._times[i:j])
+            for field in fields:
+                value_parts[field].append(self._columns[field][i:j, slot])
+        times = np.concatenate(time_parts) if time_parts else np.empty(0)
+        series = {
+            field: np.concatenate(parts) if parts else np.empty(0)
+            for field, parts in value_parts.items()
+        }
+        if step and len(times):
+            times, series = _downsample(times, series, step, agg)
+        return {
+            "time": times.tolist(),
+            "series": {field: _nan_to_none(values.tolist()) for field, values in series.items()},
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                snapshot = await meta_and_asset_ctxs.get()
+                # 스냅샷이 갱신된 경우에만 기록 (같은 캐시 값을 중복 기록하지 않음)
+                if snapshot is not self._last_snapshot:
+                    self.append(asset_table(snapshot))
+                    self._last_snapshot = snapshot
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"[ctx_history] 기록 실패: {e}")
+            await asyncio.sleep(settings.CTX_HISTORY_INTERVAL_SECONDS)
+
+    async def start(self) -> None:
+        if not settings.CTX_HISTORY_ENABLED or self.running:
+            return
+        if not self.is_open:
+            self.open()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        oldest = newest = None
+        if self.is_open and self.count:
+            segments = self._segments()
+            oldest = float(self._times[segments[0][0]])
+            newest = float(self._times[(self.head - 1) % self.capacity])
+        return {
+            "open": self.is_open,
+            "recording": self.running,
+            "capacity": self.capacity,
+            "count": self.count,
+            "symbols": len(self._symbols),
+            "oldest": oldest,
+            "newest": newest,
+            "appended": self.appended,
+            "dropped_symbols": self.dropped_symbols,
+            "errors": self.errors,
+        }
+
+
+def _downsample(times: np.ndarray, series: Dict[str, np.ndarray], step: float, agg: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """step초 구간별 집계 (구간 시작 시각 기준, 시각은 오름차순이어야 함)"""
+    buckets = np.floor(times / step)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    bucket_times = buckets[starts] * step
+    if agg == "last":
+        ends = np.concatenate((starts[1:], [len(times)])) - 1
+        return bucket_times, {field: values[ends] for field, values in series.items()}
+    result = {}
+    for field, values in series.items():
+        present = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+        counts = np.add.reduceat(present.astype(np.int64), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[field] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    return bucket_times, result
+
+
+def _nan_to_none(values: List[float]) -> List[Optional[float]]:
+    return [None if value != value else value for value in values]
+
+
+# 앱 전체에서 공유하는 자산 컨텍스트 시계열 기록기
+ctx_history = CtxHistory(settings.CTX_HISTORY_DIR, settings.CTX_HISTORY_CAPACITY, settings.CTX_HISTORY_MAX_ASSETS)
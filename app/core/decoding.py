@@ -0,0 +1,62 @@
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json으로 폴백
+    orjson = None
+
+
+def loads(raw: Any) -> Any:
+    """
+    업스트림 JSON(bytes/str) 디코딩 (orjson이 있으면 orjson, 없으면 표준 json)
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    공백 없는 JSON bytes 직렬화 (캐시 저장용, 서명 메시지에는 사용하지 말 것)
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def decode_response(response: Any) -> Any:
+    """
+    HTTP 응답 본문을 bytes에서 바로 디코딩 (str 변환/charset 추정 생략)
+    - 본문이 bytes가 아닌 응답 객체는 response.json()으로 처리
+    """
+    content = getattr(response, "content", None)
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return loads(content)
+    return response.json()
+
+
+def _to_float(x: Any) -> Any:
+    try:
+        return float(x)
+    except Exception:
+        return x
+
+
+def format_asset_ctx(symbol: str, ctx: Dict) -> Dict:
+    """
+    자산 컨텍스트 원본(문자열 필드)에서 필요한 필드만 float 변환하여 반환
+    """
+    return {
+        "symbol": symbol,
+        "funding": _to_float(ctx.get("funding")),
+        "openInterest": _to_float(ctx.get("openInterest")),
+        "markPx": _to_float(ctx.get("markPx")),
+        "midPx": _to_float(ctx.get("midPx")),
+        "oraclePx": _to_float(ctx.get("oraclePx")),
+        "premium": _to_float(ctx.get("premium")),
+        "prevDayPx": _to_float(ctx.get("prevDayPx")),
+        "dayNtlVlm": _to_float(ctx.get("dayNtlVlm")),
+        "impactPxs": [_to_float(x) for x in ctx.get("impactPxs", [])],
+        "dayBaseVlm": _to_float(ctx.get("dayBaseVlm")),
+    }
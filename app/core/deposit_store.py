@@ -0,0 +1,151 @@
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.core.sqlite_store import SqliteStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deposit_addresses (
+    destination_address TEXT NOT NULL,
+    destination_chain TEXT NOT NULL,
+    source_chain TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    deposit_address TEXT NOT NULL,
+    response TEXT NOT NULL,
+    verified INTEGER,
+    verified_count INTEGER,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (destination_address, destination_chain, source_chain, asset)
+);
+CREATE INDEX IF NOT EXISTS idx_deposit_addresses_deposit ON deposit_addresses (deposit_address);
+"""
+
+
+def normalize_chain_address(address: str) -> str:
+    """
+    EVM 주소(0x...)는 대소문자 구분이 없으므로 소문자로, 그 외(솔라나 등)는 그대로 저장
+    """
+    return address.lower() if address.startswith("0x") else address
+
+
+class DepositStore(SqliteStore):
+    """
+    HyperUnit 입금 주소 영구 저장소 (SQLite)
+    - /gen/{src}/{dst}/{asset}/{addr}는 같은 입력에 같은 입금 주소를 반환하므로 한 번 생성한 결과를 저장해 재사용
+    - (목적지 주소, 체인, 자산) 기본 키 조회와 입금 주소 → 사용자 역조회 모두 인덱스로 로컬에서 처리
+    - 가디언 서명 검증 결과(verified, verified_count)를 함께 저장
+    """
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "destination_address": row["destination_address"],
+            "destination_chain": row["destination_chain"],
+            "source_chain": row["source_chain"],
+            "asset": row["asset"],
+            "deposit_address": row["deposit_address"],
+            "response": json.loads(row["response"]),
+            "verified": None if row["verified"] is None else bool(row["verified"]),
+            "verified_count": row["verified_count"],
+            "created_at": row["created_at"],
+        }
+
+    def get(self, destination_address: str, source_chain: str, asset: str, destination_chain: str = "hyperliquid") -> Optional[Dict[str, Any]]:
+        """
+        (목적지 주소, 체인, 자산)으로 저장된 입금 주소 조회 (없으면 None)
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT * FROM deposit_addresses WHERE destination_address = ? AND destination_chain = ? AND source_chain = ? AND asset = ?",
+                (normalize_chain_address(destination_address), destination_chain, source_chain, asset),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._row_to_dict(row)
+
+    def lookup_deposit(self, deposit_address: str) -> Optional[Dict[str, Any]]:
+        """
+        입금 주소 → 사용자(목적지 주소) 역조회 (없으면 None)
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT * FROM deposit_addresses WHERE deposit_address = ?",
+                (normalize_chain_address(deposit_address),),
+            ).fetchone()
+        return None if row is None else self._row_to_dict(row)
+
+    def list_for(self, destination_address: str) -> Dict[str, Dict[str, Any]]:
+        """
+        목적지 주소의 저장된 입금 주소 전체 (자산 → 항목)
+        """
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT * FROM deposit_addresses WHERE destination_address = ?",
+                (normalize_chain_address(destination_address),),
+            ).fetchall()
+        return {row["asset"]: self._row_to_dict(row) for row in rows}
+
+    def put(
+        self,
+        destination_address: str,
+        source_chain: str,
+        asset: str,
+        response: Dict[str, Any],
+        destination_chain: str = "hyperliquid",
+        verified: Optional[bool] = None,
+        verified_count: Optional[int] = None,
+    ) -> None:
+        """
+        HyperUnit /gen 응답 저장 (같은 키가 있으면 덮어씀)
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO deposit_addresses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_chain_address(destination_address),
+                    destination_chain,
+                    source_chain,
+                    asset,
+                    normalize_chain_address(response["address"]),
+                    json.dumps(response, separators=(",", ":")),
+                    None if verified is None else int(verified),
+                    verified_count,
+                    time.time(),
+                ),
+            )
+            conn.commit()
+        self.writes += 1
+
+    def set_verification(self, destination_address: str, source_chain: str, asset: str, verified: bool, verified_count: int, destination_chain: str = "hyperliquid") -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE deposit_addresses SET verified = ?, verified_count = ? "
+                "WHERE destination_address = ? AND destination_chain = ? AND source_chain = ? AND asset = ?",
+                (int(verified), verified_count, normalize_chain_address(destination_address), destination_chain, source_chain, asset),
+            )
+            conn.commit()
+        self.writes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
+
+
+# 앱 전체에서 공유하는 입금 주소 저장소
+deposit_store = DepositStore(settings.DEPOSIT_STORE_PATH)
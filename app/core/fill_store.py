@@ -0,0 +1,230 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from app.config import settings
+from app.core.account_snapshot import normalize_account_address
+from app.core.decoding import dumps, loads
+from app.core.info_client import post_info
+from app.core.singleflight import SingleFlight
+from app.core.sqlite_store import SqliteStore
+
+# userFillsByTime 한 응답의 최대 체결 수 (이보다 적게 오면 마지막 페이지)
+USER_FILLS_PAGE_SIZE = 2000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fills (
+    address TEXT NOT NULL,
+    time INTEGER NOT NULL,
+    tid INTEGER NOT NULL,
+    oid INTEGER NOT NULL,
+    coin TEXT NOT NULL,
+    fill TEXT NOT NULL,
+    PRIMARY KEY (address, time, tid, oid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_fills_coin ON fills (address, coin, time, tid, oid);
+"""
+
+Cursor = Tuple[int, int, int]
+
+
+def encode_cursor(fill: Dict[str, Any]) -> str:
+    return f"{fill['time']}:{fill['tid']}:{fill['oid']}"
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    "time:tid:oid" 형식의 페이지 커서 파싱 (잘못된 커서는 ValueError)
+    """
+    parts = cursor.split(":")
+    if len(parts) != 3:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    try:
+        return int(parts[0]), int(parts[1]), int(parts[2])
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class FillStore(SqliteStore):
+    """
+    주소별 체결(userFills) 로컬 저장소 (SQLite)
+    - (주소, 시간, tid, oid) 기본 키 = 시간순 클러스터링 (WITHOUT ROWID), 코인 조회는 (주소, 코인, 시간) 인덱스
+    - 같은 체결을 다시 받아도 기본 키로 중복 제거 (증분 동기화 경계의 겹침 허용)
+    - 최신순 페이지는 (time, tid, oid) 커서 기준 인덱스 범위 조회이므로 전체 체결 수와 무관
+    """
+
+    SCHEMA = _SCHEMA
+
+    def put_many(self, address: str, fills: Sequence[Dict[str, Any]]) -> int:
+        """
+        체결 목록 저장 (이미 있는 체결은 무시), 새로 저장된 수 반환
+        """
+        if not fills:
+            return 0
+        address = normalize_account_address(address)
+        rows = [
+            (address, int(fill["time"]), int(fill["tid"]), int(fill.get("oid", 0)), fill["coin"], dumps(fill))
+            for fill in fills
+        ]
+        with self._lock:
+            conn = self._connection()
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO fills VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+            inserted = conn.total_changes - before
+        self.writes += inserted
+        return inserted
+
+    def last_time(self, address: str) -> Optional[int]:
+        """저장된 가장 최근 체결 시각 (ms, 없으면 None)"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT MAX(time) FROM fills WHERE address = ?",
+                (normalize_account_address(address),),
+            ).fetchone()
+        return row[0]
+
+    def page(
+        self,
+        address: str,
+        limit: int,
+        cursor: Optional[Cursor] = None,
+        coin: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        최신순 체결 limit개 (cursor가 있으면 그 체결보다 오래된 것부터)
+        - coin, [start_time, end_time] (ms)로 범위 제한
+        """
+        where = ["address = ?"]
+        params: List[Any] = [normalize_account_address(address)]
+        if coin is not None:
+            where.append("coin = ?")
+            params.append(coin)
+        if cursor is not None:
+            where.append("(time, tid, oid) < (?, ?, ?)")
+            params.extend(cursor)
+        if start_time is not None:
+            where.append("time >= ?")
+            params.append(start_time)
+        if end_time is not None:
+            where.append("time <= ?")
+            params.append(end_time)
+        params.append(limit)
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT fill FROM fills WHERE {' AND '.join(where)} "
+                "ORDER BY time DESC, tid DESC, oid DESC LIMIT ?",
+                params,
+            ).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "writes": self.writes,
+        }
+
+
+class FillSync:
+    """
+    userFillsByTime 증분 동기화
+    - 저장된 마지막 체결 시각부터 조회 (경계 시각의 체결은 다시 받아 기본 키로 중복 제거)
+    - 한 응답이 USER_FILLS_PAGE_SIZE개면 마지막 체결 시각부터 이어서 조회
+    - 같은 주소의 동시 동기화는 1회로 합치고, FILL_SYNC_MIN_INTERVAL 안의 재동기화는 생략
+    - 조회 전 동기화(refresh)가 업스트림 오류로 실패해도 저장된 체결이 있으면 그대로 응답 (stale)
+    """
+
+    def __init__(self, store: FillStore):
+        self.store = store
+        self._flight = SingleFlight("fills")
+        self._synced_at: Dict[str, float] = {}
+        self.syncs = 0
+        self.requests = 0
+        self.failures = 0
+
+    async def sync(self, address: str, force: bool = False) -> int:
+        """주소의 새 체결을 저장소에 반영하고 새로 저장된 수 반환"""
+        address = normalize_account_address(address)
+        synced_at = self._synced_at.get(address)
+        if not force and synced_at is not None and time.time() - synced_at < settings.FILL_SYNC_MIN_INTERVAL:
+            return 0
+        return await self._flight.do(address, lambda: self._sync(address))
+
+    async def _sync(self, address: str) -> int:
+        started = time.time()
+        start_time = await asyncio.to_thread(self.store.last_time, address) or 0
+        inserted = 0
+        while True:
+            fills = await post_info({"type": "userFillsByTime", "user": address, "startTime": start_time})
+            self.requests += 1
+            inserted += await asyncio.to_thread(self.store.put_many, address, fills)
+            if len(fills) < USER_FILLS_PAGE_SIZE:
+                break
+            last_time = max(int(fill["time"]) for fill in fills)
+            # 한 시각에 페이지 크기 이상 체결이 몰린 경우에도 진행하도록 최소 1ms 전진
+            start_time = last_time if last_time > start_time else start_time + 1
+        self._synced_at[address] = started
+        self.syncs += 1
+        return inserted
+
+    async def refresh(self, address: str) -> bool:
+        """
+        조회 전 동기화, 저장소가 최신이면 True
+        - 업스트림 오류면 로그를 남기고 False (저장된 체결로 응답)
+        - 저장된 체결이 하나도 없으면 응답할 내용이 없으므로 오류를 그대로 올림
+        """
+        try:
+            await self.sync(address)
+            return True
+        except Exception as e:
+            if await asyncio.to_thread(self.store.last_time, address) is None:
+                raise
+            self.failures += 1
+            print(f"[fills] {address} 체결 동기화 실패, 저장된 체결로 응답: {e}")
+            return False
+
+    def synced_at(self, address: str) -> Optional[float]:
+        """주소의 마지막 동기화 성공 시각 (unix 초, 이 프로세스에서 동기화한 적 없으면 None)"""
+        return self._synced_at.get(normalize_account_address(address))
+
+    def clear(self) -> None:
+        self._synced_at.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "addresses": len(self._synced_at),
+            "syncs": self.syncs,
+            "requests": self.requests,
+            "failures": self.failures,
+            **self.store.stats(),
+        }
+
+
+def format_fill(fill: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    userFills 항목을 주문 내역 항목으로 변환
+    """
+    return {
+        "order_id": fill.get("oid"),
+        "trade_id": fill.get("tid"),
+        "symbol": fill["coin"],
+        "side": "buy" if fill.get("side") == "B" else "sell",
+        "size": float(fill["sz"]),
+        "price": float(fill["px"]),
+        "direction": fill.get("dir"),
+        "closed_pnl": float(fill.get("closedPnl", 0) or 0),
+        "fee": float(fill.get("fee", 0) or 0),
+        "fee_token": fill.get("feeToken"),
+        "crossed": fill.get("crossed"),
+        "hash": fill.get("hash"),
+        "status": "filled",
+        "time": fill["time"],
+        "timestamp": datetime.fromtimestamp(fill["time"] / 1000, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+
+
+# 앱 전체에서 공유하는 체결 저장소 / 동기화
+fill_store = FillStore(settings.FILL_STORE_PATH)
+fill_sync = FillSync(fill_store)
@@ -0,0 +1,113 @@
+import asyncio
+from typing import Dict, List, Set, Tuple
+import httpx
+from app.config import settings
+
+# 업스트림 base URL -> 공용 AsyncClient (FastAPI lifespan에서 생성/종료)
+_clients: Dict[str, httpx.AsyncClient] = {}
+# lifespan 밖(테스트, 스크립트 등)에서 호출될 때 이벤트 루프별로 만드는 클라이언트
+_fallback_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+# 교체된 fallback 클라이언트 종료 작업 (완료 전 GC 방지)
+_closing: Set[asyncio.Future] = set()
+
+
+def _upstream_base_urls() -> List[str]:
+    return [
+        settings.HYPERLIQUID_API_URL,
+        settings.HYPERUNIT_API_URL,
+        settings.HYPEREVM_RPC_URL,
+    ]
+
+
+def _create_client(base_url: str) -> httpx.AsyncClient:
+    """
+    커넥션 풀/HTTP2/keep-alive/타임아웃 설정이 적용된 AsyncClient 생성
+    """
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+    return httpx.AsyncClient(
+        base_url=base_url,
+        http2=settings.HTTP_HTTP2,
+        limits=limits,
+        timeout=timeout,
+    )
+
+
+async def init_http_clients() -> None:
+    """
+    업스트림별 공용 클라이언트 생성 (앱 시작 시 1회)
+    """
+    for base_url in _upstream_base_urls():
+        if base_url not in _clients:
+            _clients[base_url] = _create_client(base_url)
+
+
+async def close_http_clients() -> None:
+    """
+    공용 클라이언트 종료 (앱 종료 시)
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """
+    base_url에 해당하는 공용 AsyncClient 반환
+    - lifespan에서 생성된 클라이언트가 있으면 그대로 사용
+    - 없으면 현재 이벤트 루프 전용 클라이언트를 만들어 재사용 (루프가 바뀌면 새로 생성)
+    """
+    client = _clients.get(base_url)
+    if client is not None and not client.is_closed:
+        return client
+    loop = asyncio.get_running_loop()
+    cached = _fallback_clients.get(base_url)
+    if cached is None or cached[0] is not loop or cached[1].is_closed:
+        if cached is not None:
+            _discard_client(*cached)
+        cached = (loop, _create_client(base_url))
+        _fallback_clients[base_url] = cached
+    return cached[1]
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception:
+        # 이미 닫힌 이벤트 루프에 묶인 커넥션은 소켓 정리만 실패할 수 있음
+        pass
+
+
+def _discard_client(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    """
+    이전 이벤트 루프의 fallback 클라이언트 종료 (커넥션 누수 방지)
+    - 그 루프가 다른 스레드에서 아직 실행 중이면 그 루프에서, 아니면 현재 루프에서 aclose
+    """
+    if client.is_closed:
+        return
+    if loop.is_running() and not loop.is_closed():
+        future = asyncio.run_coroutine_threadsafe(_aclose_quietly(client), loop)
+    else:
+        future = asyncio.ensure_future(_aclose_quietly(client))
+    _closing.add(future)
+    future.add_done_callback(_closing.discard)
+
+
+def hyperliquid_http() -> httpx.AsyncClient:
+    """Hyperliquid REST API(HYPERLIQUID_API_URL)용 공용 클라이언트"""
+    return get_http_client(settings.HYPERLIQUID_API_URL)
+
+
+def hyperunit_http() -> httpx.AsyncClient:
+    """HyperUnit API(HYPERUNIT_API_URL)용 공용 클라이언트"""
+    return get_http_client(settings.HYPERUNIT_API_URL)
+
+
+def hyperevm_http() -> httpx.AsyncClient:
+    """HyperEVM RPC(HYPEREVM_RPC_URL)용 공용 클라이언트"""
+    return get_http_client(settings.HYPEREVM_RPC_URL)
@@ -1,94 +1,89 @@
-import httpx
 from app.config import settings
-import hashlib
-from typing import Dict, List
-import asyncio
-import time
+from app.core.info_client import cached_info, meta_and_asset_ctxs
+from app.core.universe import asset_ctxs_view, get_universe
+from app.core.decoding import format_asset_ctx
+from app.core.asset_table import Condition, asset_table, query_columns
+from app.core.ctx_history import ctx_history
+from app.core.screener import SCREENER_COLUMNS, build_screen
+from app.core.market_data import mirror
+from app.core.orderbook import estimate_market_order, orderbooks
+from typing import List, Optional, Sequence, Tuple
 
 PRECOMPILE_ADDR = "0x0000000000000000000000000000000000000807"
 DECIMALS = 6
 
-# 마켓 ID -> 코인 심볼 매핑을 위한 캐시 (최초 1회만 요청)
-_market_id_to_symbol: Dict[int, str] = {}
-_symbol_list: List[str] = []
-_symbols_last_fetched: float = 0
-_symbols_lock = asyncio.Lock()
-_SYMBOLS_CACHE_TTL = 300  # 5분
-
-async def _fetch_market_meta() -> None:
-    global _market_id_to_symbol, _symbol_list, _symbols_last_fetched
-    url = f"{settings.HYPERLIQUID_API_URL}/info"
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(url, json={"type": "meta"})
-        resp.raise_for_status()
-        data = resp.json()
-        universe: List[dict] = data.get("universe", [])
-        _market_id_to_symbol = {i: asset["name"] for i, asset in enumerate(universe)}
-        _symbol_list = [asset["name"] for asset in universe]
-        _symbols_last_fetched = time.time()
-
 async def get_price(market_id: int) -> dict:
-    # 1. 마켓 ID -> 코인 심볼 매핑 (최초 1회만 meta 호출)
-    if not _market_id_to_symbol:
-        await _fetch_market_meta()
-    symbol = _market_id_to_symbol.get(market_id)
+    # 1. 마켓 ID -> 코인 심볼 매핑 (유니버스 인덱스, O(1))
+    symbol = (await get_universe()).name(market_id)
     if not symbol:
         raise ValueError(f"Invalid market_id: {market_id}")
-    # 2. 가격 전체 조회
-    url = f"{settings.HYPERLIQUID_API_URL}/info"
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(url, json={"type": "allMids"})
-        resp.raise_for_status()
-        mids = resp.json()  # {"BTC": "69123.5", ...}
+    # 2. WebSocket 미러에서 가격 조회 (없거나 stale이면 REST 폴백)
+    price = mirror.get_mid(symbol)
+    if price is not None:
+        return {"symbol": symbol, "price": price}
+    mids = await cached_info({"type": "allMids"}, settings.CACHE_TTL_ALL_MIDS)  # {"BTC": "69123.5", ...}
     price_str = mids.get(symbol)
     if price_str is None:
         raise ValueError(f"Price not found for symbol: {symbol}")
     return {"symbol": symbol, "price": float(price_str)}
 
-async def get_orderbook(symbol: str) -> dict:
+async def get_prices(market_ids: List[int]) -> List[dict]:
+    """
+    여러 마켓 ID의 가격을 한 번의 allMids 스냅샷으로 조회한다.
+    - 항목별 실패는 {"market_id": ..., "error": ...}로 반환 (전체 요청은 실패하지 않음)
+    """
+    universe = await get_universe()
+    mids = mirror.get_mids()
+    if mids is None:
+        mids = await cached_info({"type": "allMids"}, settings.CACHE_TTL_ALL_MIDS)
+    results = []
+    for market_id in market_ids:
+        symbol = universe.name(market_id)
+        if not symbol:
+            results.append({"market_id": market_id, "error": f"Invalid market_id: {market_id}"})
+            continue
+        price = mids.get(symbol)
+        if price is None:
+            results.append({"market_id": market_id, "symbol": symbol, "error": f"Price not found for symbol: {symbol}"})
+            continue
+        results.append({"market_id": market_id, "symbol": symbol, "price": float(price)})
+    return results
+
+async def get_orderbook(symbol: str, depth: Optional[int] = None) -> dict:
     """
     Hypeliquid에서 심볼별 오더북(호가) 정보를 조회한다.
-    반환 예시: {"symbol": symbol, "bids": [[가격, 수량], ...], "asks": [[가격, 수량], ...]}
-    """
-    url = f"{settings.HYPERLIQUID_API_URL}/info"
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(url, json={"type": "l2Book", "coin": symbol})
-        resp.raise_for_status()
-        data = resp.json()
-        print("get_orderbook", data)
-        # data['levels']는 [bids, asks] 리스트 구조임
-        '''
-        {
-            "coin": "BTC",
-            "time": ...,
-            "levels": [
-                [ ...bids... ],  // 0번 인덱스: 매수호가 리스트
-                [ ...asks... ]   // 1번 인덱스: 매도호가 리스트
-            ]
-        }
-        '''
-        levels = data.get("levels", [[], []])
-        bids = levels[0] if len(levels) > 0 else []
-        asks = levels[1] if len(levels) > 1 else []
-    return {"symbol": symbol, "bids": bids, "asks": asks}
+    - WebSocket l2Book 푸시로 유지되는 로컬 오더북에서 반환 (없거나 stale이면 REST l2Book으로 갱신)
+    - depth: 상위 N개 레벨만 반환 (생략시 전체)
+    반환 예시: {"symbol": symbol, "bids": [[가격, 수량], ...], "asks": [[가격, 수량], ...], "time": ...}
+    """
+    book = await orderbooks.get_book(symbol)
+    return book.to_dict(depth)
 
-async def get_symbols() -> List[str]:
+async def get_orderbook_summary(symbol: str, depth: int = 10) -> dict:
     """
-    Hypeliquid에서 거래 가능한 모든 심볼(코인명) 리스트를 반환한다. (5분 캐싱)
+    최우선 매수/매도 호가, 스프레드, 중간가, 상위 depth 레벨의 누적 수량을 반환한다.
     """
-    async with _symbols_lock:
-        now = time.time()
-        if not _symbol_list or now - _symbols_last_fetched > _SYMBOLS_CACHE_TTL:
-            await _fetch_market_meta()
-        return list(_symbol_list)
+    book = await orderbooks.get_book(symbol)
+    return book.summary(depth)
+
+async def get_slippage_estimate(symbol: str, side: str, size: float) -> dict:
+    """
+    오더북 누적 호가 기준 시장가 주문(side, size)의 예상 VWAP, 최악 체결가, 슬리피지(bps), 보호 지정가를 반환한다.
+    """
+    return await estimate_market_order(symbol, side, size)
+
+async def get_symbols() -> Tuple[str, ...]:
+    """
+    Hypeliquid에서 거래 가능한 모든 심볼(코인명) 리스트를 반환한다. (유니버스, 5분 캐싱)
+    - 불변 튜플을 그대로 반환하므로 복사/lock 없음
+    """
+    return (await get_universe()).names
 
 async def is_valid_symbol(symbol: str) -> bool:
     """
-    현재 캐시된 심볼 리스트에 symbol이 존재하는지 확인한다. (비어 있으면 fetch)
+    현재 유니버스에 symbol이 존재하는지 확인한다. (해시 조회, 비어 있으면 fetch)
     """
-    if not _symbol_list:
-        await get_symbols()
-    return symbol in _symbol_list
+    return symbol in await get_universe()
 
 async def get_asset_ctx(symbol: str) -> dict:
     """
@@ -110,34 +105,76 @@ async def get_asset_ctx(symbol: str) -> dict:
       }
     - symbol이 없으면 ValueError 발생
     """
-    url = f"{settings.HYPERLIQUID_API_URL}/info"
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(url, json={"type": "metaAndAssetCtxs"})
-        resp.raise_for_status()
-        data = resp.json()
-        universe = data[0]["universe"]
-        asset_ctxs = data[1]
-        symbol_to_idx = {asset["name"]: idx for idx, asset in enumerate(universe)}
-        idx = symbol_to_idx.get(symbol)
-        if idx is None:
-            raise ValueError(f"Symbol not found: {symbol}")
-        ctx = asset_ctxs[idx]
-    # 필요한 필드만 float 변환 및 반환
-    def f(x):
-        try:
-            return float(x)
-        except Exception:
-            return x
+    # WebSocket 미러(activeAssetCtx 구독 코인)에 있으면 바로 반환, 없으면 REST 폴백
+    # 스냅샷 폴백은 요청한 심볼만 변환 (지연 변환 뷰)
+    ctx = mirror.get_asset_ctx(symbol)
+    if ctx is not None:
+        return format_asset_ctx(symbol, ctx)
+    asset_ctx = asset_ctxs_view(await meta_and_asset_ctxs.get()).asset_ctx(symbol)
+    if asset_ctx is None:
+        raise ValueError(f"Symbol not found: {symbol}")
+    return asset_ctx
+
+async def get_asset_ctxs(symbols: Optional[List[str]] = None) -> List[dict]:
+    """
+    여러 심볼의 자산 컨텍스트를 하나의 metaAndAssetCtxs 스냅샷에서 조회한다.
+    - symbols가 None이면 전체 유니버스 반환
+    - 항목별 실패는 {"symbol": ..., "error": ...}로 반환
+    """
+    view = asset_ctxs_view(await meta_and_asset_ctxs.get())
+    if symbols is None:
+        return view.all_asset_ctxs()
+    results = []
+    for symbol in symbols:
+        asset_ctx = view.asset_ctx(symbol)
+        if asset_ctx is None:
+            results.append({"symbol": symbol, "error": f"Symbol not found: {symbol}"})
+        else:
+            results.append(asset_ctx)
+    return results
+
+async def query_asset_ctxs(
+    conditions: Sequence[Condition] = (),
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    limit: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> dict:
+    """
+    전체 유니버스 자산 컨텍스트에서 서버 측 필터/정렬/상위 N 조회
+    - metaAndAssetCtxs 스냅샷당 한 번 만든 컬럼형 테이블(asset_table)로 처리
+    - 잘못된 컬럼/조건은 ValueError
+    반환 예시: {"matched": 42, "count": 20, "results": [{"symbol": "BTC", "funding": 0.0000125, ...}, ...]}
+    """
+    table = asset_table(await meta_and_asset_ctxs.get())
+    matched, results = table.query(conditions, sort_by, descending, limit, fields)
+    return {"matched": matched, "count": len(results), "results": results}
+
+async def screen_asset_ctxs(
+    conditions: Sequence[Condition] = (),
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    absolute: bool = False,
+    limit: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+    window_seconds: Optional[float] = None,
+) -> dict:
+    """
+    전체 유니버스 펀딩/프리미엄 스크리너 (연율 펀딩, 베이시스, OI 가중치, 롤링 z-score)
+    - 스냅샷당 한 번의 벡터 연산으로 모든 지표를 계산하고 필터/정렬/상위 N 적용
+    - z-score는 시계열 기록(ctx_history)이 있을 때만 값이 있음 (없으면 null)
+    - 잘못된 컬럼/조건은 ValueError
+    """
+    window_seconds = settings.SCREENER_WINDOW_SECONDS if window_seconds is None else window_seconds
+    table = asset_table(await meta_and_asset_ctxs.get())
+    screen = build_screen(table, ctx_history, window_seconds)
+    matched, results = query_columns(
+        screen.names, screen.columns, conditions, sort_by, descending, limit, fields or SCREENER_COLUMNS, absolute
+    )
     return {
-        "symbol": symbol,
-        "funding": f(ctx.get("funding")),
-        "openInterest": f(ctx.get("openInterest")),
-        "markPx": f(ctx.get("markPx")),
-        "midPx": f(ctx.get("midPx")),
-        "oraclePx": f(ctx.get("oraclePx")),
-        "premium": f(ctx.get("premium")),
-        "prevDayPx": f(ctx.get("prevDayPx")),
-        "dayNtlVlm": f(ctx.get("dayNtlVlm")),
-        "impactPxs": [f(x) for x in ctx.get("impactPxs", [])],
-        "dayBaseVlm": f(ctx.get("dayBaseVlm")),
-    }
\ No newline at end of file
+        "matched": matched,
+        "count": len(results),
+        "window": window_seconds,
+        "samples": screen.samples,
+        "results": results,
+    }
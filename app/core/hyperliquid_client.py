@@ -3,66 +3,22 @@ import hashlib
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 from eth_keys.datatypes import PublicKey, Signature
-import httpx
-import json
 import time
 from web3 import Web3, Account
 from app.config import settings
+from app.core.account_snapshot import accounts, normalize_account_address
+from app.core.fill_store import decode_cursor, encode_cursor, fill_store, fill_sync, format_fill
+from app.core.info_client import cached_info, post_info
+from app.core.order_pipeline import pipeline
+from app.core.signer import signers
+from app.core.orderbook import orderbooks, protective_price
+from app.core.universe import float_to_wire, get_asset_id, get_universe, round_price, round_size
 import hmac
 import struct
-from eth_account import Account
-from eth_account.messages import encode_defunct
 # from app.core.hyperliquid_sdk_client import close_position_real  # Remove this import to avoid circular import
 import asyncio
 
-# Hyperliquid 서명 관련 함수들
-def generate_hyperliquid_signature(data: dict, private_key: str) -> str:
-    """
-    Hyperliquid API용 EIP-191 이더리움 서명 생성
-    Args:
-        data: 서명할 args dict
-        private_key: 이더리움 개인키(hex)
-    Returns:
-        0x로 시작하는 hex string 서명
-    """
-    msg = json.dumps(data, separators=(',', ':'))
-    message = encode_defunct(text=msg)
-    signed_message = Account.sign_message(message, private_key)
-    return signed_message.signature.hex()
-
-def create_signed_order_request(order_data: Dict, private_key: str) -> Dict:
-    """
-    서명된 주문 요청 생성
-    
-    Args:
-        order_data: 주문 데이터
-        private_key: 개인키
-    
-    Returns:
-        서명된 요청 데이터
-    """
-    try:
-        # 1. 타임스탬프 추가
-        timestamp = int(time.time() * 1000)  # 밀리초 단위
-        order_data_with_timestamp = {
-            **order_data,
-            "timestamp": timestamp
-        }
-        
-        # 2. 서명 생성
-        signature = generate_hyperliquid_signature(order_data_with_timestamp, private_key)
-        
-        # 3. 서명된 요청 구성
-        signed_request = {
-            "action": "order",
-            "args": order_data_with_timestamp,
-            "signature": signature
-        }
-        
-        return signed_request
-        
-    except Exception as e:
-        raise Exception(f"Signed request creation failed: {str(e)}")
+# 주문/취소 action 서명과 nonce 발급은 app.core.order_pipeline (SubmissionPipeline) 사용
 
 # Hyperliquid 거래 관련 함수들
 def normalize_hyperliquid_address(address: str) -> str:
@@ -76,147 +32,222 @@ async def get_user_state(address: str) -> Dict:
     """
     Hyperliquid에서 사용자 상태 정보 조회
     - 포지션, 잔고, 마진 정보 등
+    - 주소별 계정 스냅샷(app.core.account_snapshot)을 공유하므로 반환 dict는 수정하지 말 것
     """
-    url = f"{settings.HYPERLIQUID_API_URL}/info"
-    payload = {
-        "type": "clearinghouseState",
-        "user": normalize_hyperliquid_address(address)
-    }
-    print(f"[get_user_state] 요청 payload: {payload}")
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
-        print(f"[get_user_state] 응답 status: {response.status_code}")
-        print(f"[get_user_state] 응답 본문: {response.text}")
-        response.raise_for_status()
-        return response.json()
+    return await accounts.get(address)
 
 async def get_account_info_real(address: str) -> Dict:
     """
     Hyperliquid에서 실제 계정 정보 조회
     - 잔고, 포지션, 마진 정보 등을 종합적으로 반환
+    - clearinghouseState 스냅샷 1회 조회로 계정/포지션 정보를 함께 구성
     """
     address = normalize_hyperliquid_address(address)
-    print(address)
     try:
-        # 1. 사용자 상태 정보 조회
         user_state = await get_user_state(address)
-        print(user_state)
-        
-        # 2. 포지션 정보 조회
-        positions_data = await get_positions_real(address)
-        
-        # 3. 계정 정보 구성
-        account_info = {
-            "address": address,
-            "total_balance": 0.0,
-            "available_balance": 0.0,
-            "margin_used": 0.0,
-            "margin_ratio": 0.0,
-            "positions": positions_data.get("positions", [])
-        }
-        
-        # 4. 잔고 정보 계산 (user_state에서 추출)
-        if "assetPositions" in user_state:
-            for asset_pos in user_state["assetPositions"]:
-                position_data = asset_pos.get("position", {})
-                if isinstance(position_data, dict):
-                    position_value = float(position_data.get("szi", "0"))
-                else:
-                    position_value = float(position_data) if position_data != "0" else 0
-                
-                if position_value != 0:
-                    account_info["total_balance"] += abs(position_value)
-                    account_info["margin_used"] += abs(position_value)
-        
-        # 5. 마진 비율 계산
-        if account_info["total_balance"] > 0:
-            account_info["margin_ratio"] = account_info["margin_used"] / account_info["total_balance"]
-        
-        # 6. 사용 가능한 잔고 계산
-        account_info["available_balance"] = account_info["total_balance"] - account_info["margin_used"]
-        
-        return account_info
+        return build_account_info(address, user_state)
         
     except Exception as e:
         raise Exception(f"Failed to fetch account info: {str(e)}")
 
+def build_account_info(address: str, user_state: Dict) -> Dict:
+    """
+    clearinghouseState 스냅샷에서 계정 정보 구성 (업스트림 호출 없음)
+    """
+    # 1. 포지션 정보 구성 (같은 스냅샷 사용)
+    positions_data = build_positions(address, user_state)
+    
+    # 2. 계정 정보 구성
+    account_info = {
+        "address": address,
+        "total_balance": 0.0,
+        "available_balance": 0.0,
+        "margin_used": 0.0,
+        "margin_ratio": 0.0,
+        "positions": positions_data.get("positions", [])
+    }
+    
+    # 3. 잔고 정보 계산 (user_state에서 추출)
+    if "assetPositions" in user_state:
+        for asset_pos in user_state["assetPositions"]:
+            position_data = asset_pos.get("position", {})
+            if isinstance(position_data, dict):
+                position_value = float(position_data.get("szi", "0"))
+            else:
+                position_value = float(position_data) if position_data != "0" else 0
+            
+            if position_value != 0:
+                account_info["total_balance"] += abs(position_value)
+                account_info["margin_used"] += abs(position_value)
+    
+    # 4. 마진 비율 계산
+    if account_info["total_balance"] > 0:
+        account_info["margin_ratio"] = account_info["margin_used"] / account_info["total_balance"]
+    
+    # 5. 사용 가능한 잔고 계산
+    account_info["available_balance"] = account_info["total_balance"] - account_info["margin_used"]
+    
+    return account_info
+
+def build_positions(address: str, user_state: Dict) -> Dict:
+    """
+    clearinghouseState 스냅샷에서 포지션 정보 구성 (업스트림 호출 없음)
+    """
+    positions = []
+    total_unrealized_pnl = 0.0
+    total_realized_pnl = 0.0
+    
+    if "assetPositions" in user_state:
+        for asset_pos in user_state["assetPositions"]:
+            position_data = asset_pos.get("position", {})
+            
+            if isinstance(position_data, dict):
+                position_value = float(position_data.get("szi", "0"))
+                symbol = position_data.get("coin", "UNKNOWN")
+                entry_price = float(position_data.get("entryPx", "0"))
+                unrealized_pnl = float(position_data.get("unrealizedPnl", "0"))
+                position_value_usd = float(position_data.get("positionValue", "0"))
+            else:
+                position_value = float(position_data) if position_data != "0" else 0
+                symbol = asset_pos.get("coin", "UNKNOWN")
+                entry_price = float(asset_pos.get("entryPx", "0"))
+                unrealized_pnl = 0.0
+                position_value_usd = 0.0
+            
+            if position_value != 0:  # 포지션이 있는 경우만
+                side = "long" if position_value > 0 else "short"
+                size = abs(position_value)
+                
+                # 마크가격은 현재가로 대체 (실제로는 별도 API 호출 필요)
+                mark_price = entry_price  # 임시로 진입가격 사용
+                
+                total_unrealized_pnl += unrealized_pnl
+                
+                position_info = {
+                    "symbol": symbol,
+                    "side": side,
+                    "size": size,
+                    "entry_price": entry_price,
+                    "mark_price": mark_price,
+                    "unrealized_pnl": unrealized_pnl,
+                    "realized_pnl": 0.0,  # TODO: 실제 실현 손익 계산
+                    "liquidation_price": None  # TODO: 청산가격 계산
+                }
+                
+                positions.append(position_info)
+    
+    return {
+        "address": address,
+        "positions": positions,
+        "total_unrealized_pnl": total_unrealized_pnl,
+        "total_realized_pnl": total_realized_pnl
+    }
+
 async def get_positions_real(address: str) -> Dict:
     """
     Hyperliquid에서 실제 포지션 정보 조회
     """
     address = normalize_hyperliquid_address(address)
     try:
-        # 1. 사용자 상태 정보 조회
         user_state = await get_user_state(address)
-        
-        # 2. 포지션 정보 추출
-        positions = []
-        total_unrealized_pnl = 0.0
-        total_realized_pnl = 0.0
-        
-        if "assetPositions" in user_state:
-            for asset_pos in user_state["assetPositions"]:
-                position_data = asset_pos.get("position", {})
-                
-                if isinstance(position_data, dict):
-                    position_value = float(position_data.get("szi", "0"))
-                    symbol = position_data.get("coin", "UNKNOWN")
-                    entry_price = float(position_data.get("entryPx", "0"))
-                    unrealized_pnl = float(position_data.get("unrealizedPnl", "0"))
-                    position_value_usd = float(position_data.get("positionValue", "0"))
-                else:
-                    position_value = float(position_data) if position_data != "0" else 0
-                    symbol = asset_pos.get("coin", "UNKNOWN")
-                    entry_price = float(asset_pos.get("entryPx", "0"))
-                    unrealized_pnl = 0.0
-                    position_value_usd = 0.0
-                
-                if position_value != 0:  # 포지션이 있는 경우만
-                    side = "long" if position_value > 0 else "short"
-                    size = abs(position_value)
-                    
-                    # 마크가격은 현재가로 대체 (실제로는 별도 API 호출 필요)
-                    mark_price = entry_price  # 임시로 진입가격 사용
-                    
-                    total_unrealized_pnl += unrealized_pnl
-                    
-                    position_info = {
-                        "symbol": symbol,
-                        "side": side,
-                        "size": size,
-                        "entry_price": entry_price,
-                        "mark_price": mark_price,
-                        "unrealized_pnl": unrealized_pnl,
-                        "realized_pnl": 0.0,  # TODO: 실제 실현 손익 계산
-                        "liquidation_price": None  # TODO: 청산가격 계산
-                    }
-                    
-                    positions.append(position_info)
-        
-        return {
-            "address": address,
-            "positions": positions,
-            "total_unrealized_pnl": total_unrealized_pnl,
-            "total_realized_pnl": total_realized_pnl
-        }
+        return build_positions(address, user_state)
         
     except Exception as e:
         raise Exception(f"Failed to fetch positions: {str(e)}")
 
+async def get_portfolio(addresses: List[str], include_spot: bool = False) -> Dict:
+    """
+    여러 주소의 포트폴리오를 한 번에 조회
+    - clearinghouseState는 계정 스냅샷 계층에서 일괄 조회 (캐시 적중분은 업스트림 호출 없음)
+    - include_spot이면 spotClearinghouseState도 함께 동시 조회
+    - 주소별 실패/시간 초과는 해당 항목의 error 필드로 반환 (전체 요청은 실패하지 않음)
+    - 반환: 주소별 계정 정보, 코인별 합산 익스포저, 총 평가금액(accountValue 합)
+    """
+    states, errors = await accounts.get_many(addresses)
+    spot_states: Dict[str, Dict] = {}
+    if include_spot:
+        semaphore = asyncio.Semaphore(settings.PORTFOLIO_CONCURRENCY)
+
+        async def fetch_spot(user: str) -> None:
+            async with semaphore:
+                try:
+                    spot_states[user] = await asyncio.wait_for(
+                        cached_info({"type": "spotClearinghouseState", "user": user}, settings.CACHE_TTL_USER_STATE),
+                        settings.PORTFOLIO_TIMEOUT,
+                    )
+                except Exception:
+                    # 스팟 잔고 실패는 perp 결과를 막지 않음 (spot_balances 생략)
+                    pass
+
+        await asyncio.gather(*(fetch_spot(user) for user in states))
+
+    results = []
+    exposure: Dict[str, Dict[str, float]] = {}
+    total_equity = 0.0
+    for user in dict.fromkeys(normalize_account_address(address) for address in addresses):
+        if user not in states:
+            results.append({"address": user, "error": errors.get(user, "Account state not found")})
+            continue
+        user_state = states[user]
+        account_info = build_account_info(normalize_hyperliquid_address(user), user_state)
+        account_value = float(user_state.get("marginSummary", {}).get("accountValue", "0"))
+        total_equity += account_value
+        entry = {
+            **account_info,
+            "address": user,
+            "account_value": account_value,
+            "withdrawable": float(user_state.get("withdrawable", "0")),
+        }
+        if user in spot_states:
+            entry["spot_balances"] = spot_states[user].get("balances", [])
+        results.append(entry)
+
+        for asset_pos in user_state.get("assetPositions", []):
+            position_data = asset_pos.get("position")
+            if not isinstance(position_data, dict):
+                continue
+            szi = float(position_data.get("szi", "0"))
+            if szi == 0:
+                continue
+            coin = position_data.get("coin", "UNKNOWN")
+            if coin not in exposure:
+                exposure[coin] = {
+                    "long_size": 0.0,
+                    "short_size": 0.0,
+                    "net_size": 0.0,
+                    "long_notional": 0.0,
+                    "short_notional": 0.0,
+                    "net_notional": 0.0,
+                }
+            coin_exposure = exposure[coin]
+            notional = abs(float(position_data.get("positionValue", "0")))
+            if szi > 0:
+                coin_exposure["long_size"] += szi
+                coin_exposure["long_notional"] += notional
+            else:
+                coin_exposure["short_size"] += -szi
+                coin_exposure["short_notional"] += notional
+            coin_exposure["net_size"] += szi
+            coin_exposure["net_notional"] += notional if szi > 0 else -notional
+
+    return {
+        "accounts": results,
+        "exposure": exposure,
+        "total_equity": total_equity,
+        "count": len(results),
+        "errors": sum(1 for item in results if "error" in item),
+    }
+
 async def get_open_orders(address: str) -> List[Dict]:
     """
     미체결 주문 조회
     """
-    url = f"{settings.HYPERLIQUID_API_URL}/info"
     payload = {
         "type": "openOrders",
         "user": normalize_hyperliquid_address(address)
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
-        response.raise_for_status()
-        return response.json()
+    return await post_info(payload)
 
 async def place_order(
     private_key: str,
@@ -225,147 +256,241 @@ async def place_order(
     size: float,
     price: Optional[float] = None,
     order_type: str = "market",
-    reduce_only: bool = False
+    reduce_only: bool = False,
+    time_in_force: str = "Gtc"
 ) -> Dict:
     """
-    Hyperliquid에 실제 주문 실행 - 실제 Hyperliquid API 사용
+    Hyperliquid에 실제 주문 실행 (place_orders의 1건 주문, 같은 제출 파이프라인/nonce 발급 사용)
     
     Args:
         private_key: 지갑 개인키
         symbol: 거래 심볼 (예: "BTC")
         side: "buy" (Long) 또는 "sell" (Short)
-        size: 포지션 크기 (USD)
-        price: 지정가 주문시 가격
+        size: 포지션 크기 (코인 수량)
+        price: 지정가 주문시 가격 (시장가는 생략 시 보호 지정가)
         order_type: "market" 또는 "limit"
         reduce_only: 포지션 감소만 허용
+        time_in_force: 지정가 주문의 Gtc/Ioc/Alo
     
     Returns:
         주문 결과
     """
     try:
-        # 1. 계정 생성
-        account = Account.from_key(private_key)
-        
-        # 2. Hyperliquid API 형식으로 주문 데이터 구성
-        order_data = {
-            "user": normalize_hyperliquid_address(account.address),
-            "coin": symbol,
-            "is_buy": side == "buy",
-            "sz": str(size),
-            "limit_px": str(price) if price and order_type == "limit" else "0",
-            "reduce_only": reduce_only
-        }
-        
-        # 3. 서명 생성
-        signature = generate_hyperliquid_signature(order_data, private_key)
-        
-        # 4. 서명된 요청 구성
-        signed_request = {
-            "action": "order",
-            "args": order_data,
-            "signature": signature
+        result = await place_orders(private_key, [{
+            "symbol": symbol,
+            "side": side,
+            "size": size,
+            "price": price,
+            "order_type": order_type,
+            "reduce_only": reduce_only,
+            "time_in_force": time_in_force,
+        }])
+        [item] = result["orders"]
+        if not item["success"]:
+            raise Exception(item["error"])
+        return {
+            **item,
+            "price": price,
+            "order_type": order_type,
+            "timestamp": int(time.time()),
+            "api_response": result["api_response"],
         }
         
-        # 5. 실제 Hyperliquid API 호출
-        url = f"{settings.HYPERLIQUID_API_URL}/exchange"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=signed_request)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "order_id": result.get("response", {}).get("data", {}).get("oid", f"order_{int(time.time())}"),
-                    "symbol": symbol,
-                    "side": side,
-                    "size": size,
-                    "price": price,
-                    "order_type": order_type,
-                    "status": "submitted",
-                    "timestamp": int(time.time()),
-                    "api_response": result
-                }
-            else:
-                # API 오류 처리
-                error_detail = f"API Error: {response.status_code}"
-                try:
-                    error_response = response.json()
-                    error_detail += f" - {error_response}"
-                except:
-                    error_detail += f" - {response.text}"
-                
-                raise Exception(f"Order placement failed: {error_detail}")
-        
     except Exception as e:
         raise Exception(f"Order placement failed: {str(e)}")
 
-async def cancel_order(private_key: str, order_id: str) -> Dict:
+async def cancel_order(private_key: str, order_id: str, symbol: Optional[str] = None) -> Dict:
     """
-    실제 주문 취소 - 실제 Hyperliquid API 사용
+    실제 주문 취소 (cancel_orders의 1건 취소, 같은 제출 파이프라인/nonce 발급 사용)
+    - symbol을 생략하면 지갑의 미체결 주문에서 order_id의 심볼을 찾음
     """
     try:
-        account = Account.from_key(private_key)
+        if symbol is None:
+            open_orders = await get_open_orders(signers.address(private_key))
+            symbol = next((order["coin"] for order in open_orders if str(order.get("oid")) == str(order_id)), None)
+            if symbol is None:
+                raise Exception(f"Open order not found: {order_id}")
+        result = await cancel_orders(private_key, [{"symbol": symbol, "order_id": order_id}])
+        [item] = result["cancels"]
+        if not item["success"]:
+            raise Exception(item["error"])
+        return {**item, "api_response": result["api_response"]}
         
-        # Hyperliquid API 형식으로 취소 데이터 구성
-        cancel_data = {
-            "user": normalize_hyperliquid_address(account.address),
-            "oid": order_id
-        }
+    except Exception as e:
+        raise Exception(f"Order cancellation failed: {str(e)}")
+
+# Hyperliquid asset symbol -> id 매핑은 app.core.universe.get_asset_id 사용 (meta 기반, 전체 자산)
+
+def _order_wire(asset_id: int, sz_decimals: int, order: Dict, price: float) -> Dict:
+    """
+    주문 1건을 Hyperliquid order action의 wire 형식으로 변환
+    - market: 보호 지정가의 IOC 지정가 주문, limit: time_in_force(Gtc/Ioc/Alo) 지정가 주문
+    - 가격은 tick 규칙(유효숫자 5자리, 소수점 6 - szDecimals자리), 수량은 szDecimals 자리로 반올림
+    """
+    tif = "Ioc" if order.get("order_type", "market") == "market" else order.get("time_in_force", "Gtc")
+    size = round_size(float(order["size"]), sz_decimals)
+    if size <= 0:
+        raise ValueError(f"size rounds to zero at {sz_decimals} decimals")
+    return {
+        "a": asset_id,
+        "b": order["side"] == "buy",
+        "p": float_to_wire(round_price(float(price), sz_decimals)),
+        "s": float_to_wire(size),
+        "r": bool(order.get("reduce_only", False)),
+        "t": {"limit": {"tif": tif}},
+    }
+
+async def _market_limit_price(symbol: str, side: str, size: float, books: Dict, mark_prices: Dict) -> float:
+    """
+    시장가 주문의 보호 지정가 (오더북 누적 호가 기준, app.core.orderbook.protective_price)
+    - 오더북 조회 실패/반대편 호가 없음이면 마크 가격에서 MARKET_ORDER_MAX_SLIPPAGE_BPS 바깥
+    - 오더북과 마크 가격은 심볼당 1회만 조회 (books/mark_prices에 보관)
+    """
+    if symbol not in books:
+        try:
+            books[symbol] = await orderbooks.get_book(symbol)
+        except Exception as e:
+            print(f"[orders] {symbol} 오더북 조회 실패, 마크 가격 사용: {e}")
+            books[symbol] = None
+    book = books[symbol]
+    limit_price = protective_price(book.estimate_fill(side, size)) if book is not None else None
+    if limit_price is not None:
+        return limit_price
+    if symbol not in mark_prices:
+        from app.core.hyperliquid_sdk_client import get_mark_price  # Local import to avoid circular import
+        mark_prices[symbol] = await get_mark_price(symbol)
+    sign = 1.0 if side == "buy" else -1.0
+    return mark_prices[symbol] * (1 + sign * settings.MARKET_ORDER_MAX_SLIPPAGE_BPS / 1e4)
+
+async def post_exchange_action(private_key: str, action: Dict) -> Dict:
+    """
+    action 1개를 L1 action 서명(EIP-712 phantom agent)해 /exchange로 전송하고 응답 JSON 반환
+    - 여러 주문/취소를 담은 action도 서명 1회, 왕복 1회로 처리
+    - 제출 파이프라인을 거치므로 같은 지갑의 action도 지갑별 nonce로 동시에 전송 가능
+    """
+    return await pipeline.submit(private_key, action)
+
+def _action_statuses(result: Dict, count: int) -> List[Dict]:
+    """
+    /exchange 응답의 항목별 status 목록 추출 (전체 실패 응답이면 모든 항목에 같은 오류)
+    """
+    if result.get("status") != "ok":
+        return [{"error": str(result.get("response", result))}] * count
+    statuses = result.get("response", {}).get("data", {}).get("statuses", [])
+    return [statuses[i] if i < len(statuses) else {"error": "Missing status"} for i in range(count)]
+
+def _status_result(status) -> Dict:
+    if isinstance(status, dict) and "error" in status:
+        return {"success": False, "status": "failed", "error": status["error"]}
+    if isinstance(status, dict) and "filled" in status:
+        return {"success": True, "status": "filled", "order_id": status["filled"].get("oid"), "fill": status["filled"]}
+    if isinstance(status, dict) and "resting" in status:
+        return {"success": True, "status": "resting", "order_id": status["resting"].get("oid")}
+    return {"success": True, "status": status if isinstance(status, str) else "submitted"}
+
+async def place_orders(private_key: str, orders: List[Dict]) -> Dict:
+    """
+    여러 주문을 하나의 서명된 order action으로 일괄 실행
+    
+    Args:
+        private_key: 지갑 개인키
+        orders: [{"symbol", "side"("buy"/"sell"), "size", "price", "order_type", "reduce_only", "time_in_force"}, ...]
+    
+    Returns:
+        {"success", "orders": [요청 순서대로 항목별 결과], "api_response"}
+        - 심볼 오류 등 전송 전 실패 항목은 action에서 제외하고 해당 항목에 error로 표시
+    """
+    try:
+        results: List[Optional[Dict]] = [None] * len(orders)
+        wires: List[Dict] = []
+        wire_index: List[int] = []
+        universe = await get_universe()
+        # 시장가 주문의 오더북/마크 가격은 심볼당 1회만 조회
+        books: Dict = {}
+        mark_prices: Dict[str, float] = {}
+        for i, order in enumerate(orders):
+            try:
+                asset_id = universe.asset_id(order["symbol"])
+                if asset_id is None:
+                    raise ValueError(f"Symbol not found: {order['symbol']}")
+                price = order.get("price")
+                if not price:
+                    if order.get("order_type", "market") == "limit":
+                        raise ValueError("price is required for limit orders")
+                    price = await _market_limit_price(order["symbol"], order["side"], float(order["size"]), books, mark_prices)
+                wires.append(_order_wire(asset_id, universe.sz_decimals[asset_id], order, price))
+                wire_index.append(i)
+            except Exception as e:
+                results[i] = {"success": False, "status": "failed", "error": str(e)}
         
-        # 서명 생성
-        signature = generate_hyperliquid_signature(cancel_data, private_key)
+        api_response = None
+        if wires:
+            api_response = await post_exchange_action(private_key, {"type": "order", "orders": wires, "grouping": "na"})
+            for i, status in zip(wire_index, _action_statuses(api_response, len(wires))):
+                results[i] = _status_result(status)
         
-        # 서명된 요청 구성
-        signed_request = {
-            "action": "cancel",
-            "args": cancel_data,
-            "signature": signature
+        items = [{"symbol": order["symbol"], "side": order["side"], "size": order["size"], **result} for order, result in zip(orders, results)]
+        return {
+            "success": all(item["success"] for item in items),
+            "orders": items,
+            "api_response": api_response,
         }
         
-        # 실제 Hyperliquid API 호출
-        url = f"{settings.HYPERLIQUID_API_URL}/exchange"
+    except Exception as e:
+        raise Exception(f"Bulk order placement failed: {str(e)}")
+
+async def cancel_orders(private_key: str, cancels: List[Dict]) -> Dict:
+    """
+    여러 주문을 하나의 서명된 cancel action으로 일괄 취소
+    
+    Args:
+        private_key: 지갑 개인키
+        cancels: [{"symbol", "order_id"}, ...]
+    """
+    try:
+        results: List[Optional[Dict]] = [None] * len(cancels)
+        wires: List[Dict] = []
+        wire_index: List[int] = []
+        for i, cancel in enumerate(cancels):
+            try:
+                wires.append({"a": await get_asset_id(cancel["symbol"]), "o": int(cancel["order_id"])})
+                wire_index.append(i)
+            except Exception as e:
+                results[i] = {"success": False, "status": "failed", "error": str(e)}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=signed_request)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "order_id": order_id,
-                    "status": "cancelled",
-                    "api_response": result
-                }
-            else:
-                # API 오류 처리
-                error_detail = f"API Error: {response.status_code}"
-                try:
-                    error_response = response.json()
-                    error_detail += f" - {error_response}"
-                except:
-                    error_detail += f" - {response.text}"
-                
-                raise Exception(f"Order cancellation failed: {error_detail}")
+        api_response = None
+        if wires:
+            api_response = await post_exchange_action(private_key, {"type": "cancel", "cancels": wires})
+            for i, status in zip(wire_index, _action_statuses(api_response, len(wires))):
+                result = _status_result(status)
+                if result["success"]:
+                    result["status"] = "cancelled"
+                results[i] = result
+        
+        items = [{"symbol": cancel["symbol"], "order_id": cancel["order_id"], **result} for cancel, result in zip(cancels, results)]
+        return {
+            "success": all(item["success"] for item in items),
+            "cancels": items,
+            "api_response": api_response,
+        }
         
     except Exception as e:
-        raise Exception(f"Order cancellation failed: {str(e)}")
+        raise Exception(f"Bulk order cancellation failed: {str(e)}")
 
-# Hyperliquid asset symbol to id 매핑 (공식 문서/SDK 참고, 예시)
-ASSET_ID_MAP = {
-    "BTC": 1,
-    "ETH": 2,
-    # 필요시 추가
-}
-
-def generate_hyperliquid_signature_v2(action: dict, nonce: int, private_key: str) -> str:
+async def cancel_all_orders(private_key: str, symbol: Optional[str] = None) -> Dict:
     """
-    Hyperliquid v2 주문용 EIP-191 서명 (action+nonce 직렬화)
+    지갑의 미체결 주문 전체(또는 symbol의 주문만)를 하나의 cancel action으로 취소
     """
-    msg = json.dumps({"action": action, "nonce": nonce}, separators=(',', ':'))
-    message = encode_defunct(text=msg)
-    signed_message = Account.sign_message(message, private_key)
-    return signed_message.signature.hex()
+    address = signers.address(private_key)
+    open_orders = await get_open_orders(address)
+    targets = [
+        {"symbol": order["coin"], "order_id": order["oid"]}
+        for order in open_orders
+        if symbol is None or order.get("coin") == symbol
+    ]
+    if not targets:
+        return {"success": True, "cancels": [], "api_response": None}
+    return await cancel_orders(private_key, targets)
 
 async def close_position_real(
     address: str,
@@ -390,24 +515,50 @@ async def close_position_real(
     )
     return result
 
+async def close_all_positions(address: str, ratio: float = 1.0) -> Dict:
+    """
+    주소의 모든 포지션 일괄 청산 (app.core.hyperliquid_sdk_client.close_all_positions 위임)
+    """
+    from app.core import hyperliquid_sdk_client  # Local import to avoid circular import
+    return await hyperliquid_sdk_client.close_all_positions(address=address, ratio=ratio)
+
 async def get_trade_history(address: str, limit: int = 50) -> List[Dict]:
     """
-    거래 내역 조회
+    거래 내역 조회 (최신순 limit개)
+    - userFillsByTime 증분 동기화 후 로컬 체결 저장소에서 조회 (전체 userFills를 매번 받지 않음)
+    - 동기화가 실패해도 저장된 체결이 있으면 저장소 기준으로 응답
     """
     try:
-        url = f"{settings.HYPERLIQUID_API_URL}/info"
-        payload = {
-            "type": "userFills",
-            "user": normalize_hyperliquid_address(address)
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            fills = response.json()
-            
-            # 최근 거래만 반환
-            return fills[:limit]
+        await fill_sync.refresh(address)
+        return await asyncio.to_thread(fill_store.page, address, limit)
             
     except Exception as e:
-        raise Exception(f"Failed to fetch trade history: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"Failed to fetch trade history: {str(e)}") 
+
+async def get_order_history(
+    address: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    coin: Optional[str] = None,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+) -> Dict:
+    """
+    주문(체결) 내역 최신순 페이지 조회
+    - cursor: 이전 페이지의 next_cursor (생략시 가장 최근부터), 잘못된 커서는 ValueError
+    - 첫 페이지 조회 시에만 증분 동기화 (다음 페이지는 같은 저장소 상태에서 이어서 조회)
+    - 첫 페이지 동기화가 실패하면 저장된 체결로 응답하고 stale=true (synced_at: 마지막 동기화 성공 시각)
+    """
+    page_cursor = decode_cursor(cursor) if cursor else None
+    stale = False
+    if page_cursor is None:
+        stale = not await fill_sync.refresh(address)
+    fills = await asyncio.to_thread(fill_store.page, address, limit, page_cursor, coin, start_time, end_time)
+    return {
+        "address": address,
+        "orders": [format_fill(fill) for fill in fills],
+        "count": len(fills),
+        "next_cursor": encode_cursor(fills[-1]) if len(fills) == limit else None,
+        "stale": stale,
+        "synced_at": fill_sync.synced_at(address),
+    }
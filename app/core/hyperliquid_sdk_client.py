@@ -1,6 +1,13 @@
+import asyncio
 from hyperliquid import HyperliquidAsync
 from app.config import settings
-from typing import Optional
+from app.core.info_client import meta_and_asset_ctxs
+from app.core.market_data import mirror
+from app.core.order_pipeline import nonces
+from app.core.orderbook import orderbooks, protective_price
+from app.core.signer import signers
+from app.core.universe import asset_ctxs_view
+from typing import Dict, List, Optional, Tuple
 
 # HyperliquidAsync 인스턴스 생성 (최신 SDK 방식)
 client = HyperliquidAsync({
@@ -11,46 +18,180 @@ client = HyperliquidAsync({
 
 async def get_mark_price(symbol: str) -> float:
     """
-    심볼의 마크 가격(mark price)을 Hyperliquid public_post_info로 조회
+    심볼의 마크 가격(mark price)을 Hyperliquid metaAndAssetCtxs 스냅샷에서 조회
+    - activeAssetCtx 구독 중인 코인은 WebSocket 미러에서 바로 반환
     """
-    req = {
-        'type': 'metaAndAssetCtxs'
-    }
-    data = await client.public_post_info(req)
-    # universe와 assetCtxs 구조에서 심볼 인덱스 찾기
-    universe = data[0]['universe']
-    asset_ctxs = data[1]
-    for idx, asset in enumerate(universe):
-        if asset['name'] == symbol:
-            return float(asset_ctxs[idx]['markPx'])
-    raise Exception(f"Mark price not found for {symbol}")
+    ctx = mirror.get_asset_ctx(symbol)
+    if ctx is not None and ctx.get("markPx") is not None:
+        return float(ctx["markPx"])
+    # metaAndAssetCtxs 스냅샷은 stale-while-revalidate 캐시에서 조회 (매 호출 다운로드 방지)
+    data = await meta_and_asset_ctxs.get()
+    # 유니버스 인덱스로 심볼의 마크 가격만 변환 (지연 변환 뷰)
+    mark_price = asset_ctxs_view(data).mark_price(symbol)
+    if mark_price is None:
+        raise Exception(f"Mark price not found for {symbol}")
+    return mark_price
+
+async def _market_order_prices(symbol: str, orders: List[Tuple[str, float]]) -> List[Tuple[float, Dict]]:
+    """
+    같은 심볼 시장가 주문들([(side, size), ...])에 넘길 (가격, SDK params) 목록
+    - 오더북 누적 호가로 추정한 보호 지정가 사용 (SDK가 기본 슬리피지 5%를 더하지 않도록 slippage=0)
+    - 오더북 조회 실패/반대편 호가 없음이면 마크 가격 + SDK 기본 슬리피지
+    - 오더북과 마크 가격은 심볼당 1회만 조회
+    """
+    try:
+        book = await orderbooks.get_book(symbol)
+    except Exception as e:
+        print(f"[sdk] {symbol} 오더북 조회 실패, 마크 가격 사용: {e}")
+        book = None
+    prices = []
+    mark_price = None
+    for side, size in orders:
+        limit_price = protective_price(book.estimate_fill(side, size)) if book is not None else None
+        if limit_price is not None:
+            prices.append((limit_price, {"slippage": "0"}))
+            continue
+        if mark_price is None:
+            mark_price = await get_mark_price(symbol)
+        prices.append((mark_price, {}))
+    return prices
+
+async def _create_orders(orders: List[dict], params: Optional[dict] = None) -> List[dict]:
+    """
+    SDK create_orders와 같은 요청/응답 처리지만 nonce는 order_pipeline의 NonceManager에서 발급
+    - SDK는 self.milliseconds()를 nonce로 쓰므로, 동기 구간인 create_orders_request 동안만 발급받은 nonce를 반환하게 함
+    - 직접 제출(pipeline.submit)과 같은 서명 지갑 기준으로 발급하므로 두 경로의 nonce가 겹치지 않음 (NONCE_BACKEND=redis면 워커 간에도)
+    """
+    await client.load_markets()
+    nonce = await nonces.next(signers.address(client.privateKey))
+    client.milliseconds = lambda: nonce
+    try:
+        request = client.create_orders_request(orders, params or {})
+    finally:
+        del client.milliseconds
+    response = await client.privatePostExchange(request)
+    statuses = client.safe_list(client.safe_dict(client.safe_dict(response, "response", {}), "data", {}), "statuses", [])
+    return client.parse_orders(statuses, None)
+
+async def _place_market_order(symbol: str, side: str, size: float) -> dict:
+    [(price, params)] = await _market_order_prices(symbol, [(side, size)])
+    [resp] = await _create_orders([{
+        "symbol": f"{symbol}/USDC:USDC",
+        "type": "market",
+        "side": side,
+        "amount": size,
+        "price": price,
+        "params": params,
+    }])
+    return resp
 
 async def place_long(symbol: str, size: float):
-    """롱(매수) 포지션 오픈 (시장가)"""
-    market = f"{symbol}/USDC:USDC"
-    mark_price = await get_mark_price(symbol)
-    resp = await client.create_market_order(
-        market,
-        "buy",
-        size,
-        price=mark_price
-    )
+    """롱(매수) 포지션 오픈 (시장가, 오더북 기준 보호 지정가)"""
+    resp = await _place_market_order(symbol, "buy", size)
     print("롱 주문 결과:", resp)
     return resp
 
 async def place_short(symbol: str, size: float):
-    """숏(매도) 포지션 오픈 (시장가)"""
-    market = f"{symbol}/USDC:USDC"
-    mark_price = await get_mark_price(symbol)
-    resp = await client.create_market_order(
-        market,
-        "sell",
-        size,
-        price=mark_price
-    )
+    """숏(매도) 포지션 오픈 (시장가, 오더북 기준 보호 지정가)"""
+    resp = await _place_market_order(symbol, "sell", size)
     print("숏 주문 결과:", resp)
     return resp
 
+def _build_close_orders(positions: List[dict], ratio: float) -> List[dict]:
+    """
+    포지션 목록에서 반대 방향 청산 주문 목록 구성
+    """
+    close_orders = []
+    for pos in positions:
+        close_size = float(pos["contracts"] if "contracts" in pos else pos.get("size", 0)) * ratio
+        if close_size > 0:
+            close_side = "sell" if pos["side"] == "long" else "buy"
+            close_orders.append({
+                "market": pos["symbol"],
+                "side": close_side,
+                "size": close_size
+            })
+    return close_orders
+
+class WalletMismatchError(Exception):
+    """요청 주소가 서버 SDK 지갑(HYPERLIQUID_API_ADDRESS)과 다름 (다른 지갑의 포지션은 청산할 수 없음)"""
+
+
+def _require_sdk_wallet(address: str) -> None:
+    """
+    청산 대상 주소가 SDK 지갑 주소인지 확인
+    - 청산 주문은 서버 SDK 지갑으로 서명되므로, 다른 주소의 포지션을 기준으로 주문하면 SDK 지갑에 엉뚱한 주문이 나감
+    """
+    if not settings.HYPERLIQUID_API_ADDRESS or address.lower() != settings.HYPERLIQUID_API_ADDRESS.lower():
+        raise WalletMismatchError(f"Address {address} is not the trading wallet")
+
+def _close_order_result(order: dict, resp: Optional[dict] = None, error: Optional[str] = None) -> dict:
+    """
+    청산 주문 1건의 결과 항목 (create_orders 응답의 info: {"filled"|"resting"|"error": ...})
+    """
+    info = resp.get("info") if resp is not None and isinstance(resp.get("info"), dict) else {}
+    if error is None and "error" in info:
+        error = str(info["error"])
+    if error is not None:
+        return {
+            "order_id": f"error_{order['market']}_{order['side']}_{order['size']}",
+            "market": order["market"],
+            "side": order["side"],
+            "size": order["size"],
+            "status": "failed",
+            "error": error
+        }
+    # 체결 여부를 filled 정보로 판단
+    is_filled = resp.get("status") == "filled" or "filled" in info
+    return {
+        "order_id": resp.get("id") or f"close_{order['market']}_{order['side']}_{order['size']}",
+        "market": order["market"],
+        "side": order["side"],
+        "size": order["size"],
+        "status": "filled" if is_filled else "resting" if "resting" in info else resp.get("status") or "submitted",
+        "api_response": resp
+    }
+
+async def _submit_close_orders(close_orders: List[dict], order_type: str, price: float, market_prices: List[Tuple[float, Dict]]) -> List[dict]:
+    """
+    청산 주문 전체를 _create_orders 1회(= order action 1개, NonceManager nonce 1개)로 전송 (결과는 close_orders 순서)
+    - 모든 주문은 reduceOnly (재시도해도 포지션이 반대로 열리지 않음)
+    - 시장가는 오더북 기준 보호 지정가(없으면 마크 가격 + SDK 기본 슬리피지), 지정가는 price
+    - 거래소가 첫 주문을 거부하면 SDK가 예외를 내므로 모든 항목을 failed로 표시
+    """
+    requests = []
+    for order, (market_price, market_params) in zip(close_orders, market_prices):
+        if order_type == "limit":
+            requests.append({"symbol": order["market"], "type": "limit", "side": order["side"], "amount": order["size"], "price": price, "params": {"reduceOnly": True}})
+        else:
+            requests.append({"symbol": order["market"], "type": "market", "side": order["side"], "amount": order["size"], "price": market_price, "params": {"reduceOnly": True, **market_params}})
+    try:
+        responses = await _create_orders(requests)
+    except Exception as e:
+        return [_close_order_result(order, error=str(e)) for order in close_orders]
+    return [
+        _close_order_result(order, responses[i]) if i < len(responses) else _close_order_result(order, error="Missing status")
+        for i, order in enumerate(close_orders)
+    ]
+
+async def _resolve_market_prices(close_orders: List[dict]) -> List[Tuple[float, Dict]]:
+    """
+    청산 주문별 시장가 주문 (가격, SDK params) 목록 (close_orders 순서)
+    - 마켓별 오더북/마크 가격은 호출당 1회씩, 마켓끼리는 동시에 조회
+    """
+    by_market: Dict[str, List[int]] = {}
+    for i, order in enumerate(close_orders):
+        by_market.setdefault(order["market"], []).append(i)
+    resolved = await asyncio.gather(*(
+        _market_order_prices(market.split("/")[0], [(close_orders[i]["side"], close_orders[i]["size"]) for i in indexes])
+        for market, indexes in by_market.items()
+    ))
+    market_prices: List[Tuple[float, Dict]] = [None] * len(close_orders)
+    for indexes, prices in zip(by_market.values(), resolved):
+        for i, market_price in zip(indexes, prices):
+            market_prices[i] = market_price
+    return market_prices
+
 async def close_position_real(
     address: str,
     symbol: str,
@@ -61,8 +202,10 @@ async def close_position_real(
 ) -> dict:
     """
     HyperliquidAsync SDK 기반으로 포지션 종료 (비율 기반)
-    address 인자는 현재 SDK에서는 사용하지 않음 (agent_wallet 기준)
+    - address는 SDK 지갑 주소여야 함 (다르면 WalletMismatchError)
+    - 시장가 청산 가격(오더북 보호 지정가/마크 가격)은 호출당 1회만 조회하고, 청산 주문은 action 1개로 전송
     """
+    _require_sdk_wallet(address)
     market = f"{symbol}/USDC:USDC"
     # 1. 포지션 정보 조회 (최신 SDK)
     positions = await client.fetch_positions([market], params={"user": address})
@@ -74,58 +217,11 @@ async def close_position_real(
                 target_positions.append(pos)
     if not target_positions:
         raise Exception(f"No position found for {symbol} {side if side else ''}")
-    close_orders = []
-    for pos in target_positions:
-        close_size = float(pos["contracts"] if "contracts" in pos else pos.get("size", 0)) * ratio
-        if close_size > 0:
-            close_side = "sell" if pos["side"] == "long" else "buy"
-            close_orders.append({
-                "market": market,
-                "side": close_side,
-                "size": close_size
-            })
-    executed_orders = []
-    for order in close_orders:
-        try:
-            # 시장가 주문 시 마크 가격을 price로 사용
-            mark_price = await get_mark_price(symbol)
-            if order_type == "limit":
-                resp = await client.create_limit_order(
-                    order["market"],
-                    "limit",
-                    order["side"],
-                    order["size"],
-                    price
-                )
-            else:
-                resp = await client.create_market_order(
-                    order["market"],
-                    order["side"],
-                    order["size"],
-                    price=mark_price
-                )
-            # 체결 여부를 filled 정보로 판단
-            is_filled = (
-                resp.get("status") == "filled"
-                or ("info" in resp and isinstance(resp["info"], dict) and "filled" in resp["info"]))
-            executed_order = {
-                "order_id": resp.get("order_id", f"close_{order['market']}_{order['side']}_{order['size']}"),
-                "market": order["market"],
-                "side": order["side"],
-                "size": order["size"],
-                "status": "filled" if is_filled else resp.get("status", "submitted"),
-                "api_response": resp
-            }
-        except Exception as e:
-            executed_order = {
-                "order_id": f"error_{order['market']}_{order['side']}_{order['size']}",
-                "market": order["market"],
-                "side": order["side"],
-                "size": order["size"],
-                "status": "failed",
-                "error": str(e)
-            }
-        executed_orders.append(executed_order)
+    close_orders = _build_close_orders(target_positions, ratio)
+    # 2. 시장가 청산 기준 가격은 주문 루프 밖에서 1회만 조회
+    market_prices = await _resolve_market_prices(close_orders) if order_type != "limit" else [(0.0, {})] * len(close_orders)
+    # 3. 청산 주문을 action 1개로 전송
+    executed_orders = await _submit_close_orders(close_orders, order_type, price, market_prices)
     return {
         "success": all(o["status"] == "filled" for o in executed_orders),
         "symbol": symbol,
@@ -135,4 +231,34 @@ async def close_position_real(
         "total_closed_size": sum(float(order["size"]) for order in close_orders),
         "status": "filled" if all(o["status"] == "filled" for o in executed_orders) else "failed",
         "message": f"Position close orders submitted for {symbol}"
-    } 
\ No newline at end of file
+    }
+
+async def close_all_positions(address: str, ratio: float = 1.0) -> dict:
+    """
+    주소의 모든 포지션을 시장가로 한 번에 청산
+    - address는 SDK 지갑 주소여야 함 (다르면 WalletMismatchError)
+    - 포지션 조회 1회, 마켓별 오더북/마크 가격 1회씩 동시 조회, 청산 주문은 action 1개로 전송
+    """
+    _require_sdk_wallet(address)
+    positions = await client.fetch_positions(None, params={"user": address})
+    close_orders = _build_close_orders(positions, ratio)
+    if not close_orders:
+        return {
+            "success": True,
+            "ratio": ratio,
+            "orders": [],
+            "total_closed_size": 0.0,
+            "status": "no_positions",
+            "message": "No open positions"
+        }
+    market_prices = await _resolve_market_prices(close_orders)
+    executed_orders = await _submit_close_orders(close_orders, "market", 0.0, market_prices)
+    all_filled = all(o["status"] == "filled" for o in executed_orders)
+    return {
+        "success": all_filled,
+        "ratio": ratio,
+        "orders": executed_orders,
+        "total_closed_size": sum(float(order["size"]) for order in close_orders),
+        "status": "filled" if all_filled else "failed",
+        "message": f"Close orders submitted for {len(close_orders)} positions"
+    }
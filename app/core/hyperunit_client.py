@@ -1,6 +1,8 @@
+import asyncio
 import base64
 import hashlib
-from typing import Dict, Optional, List
+from functools import lru_cache
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
 from eth_keys.datatypes import PublicKey, Signature
 
@@ -13,6 +15,9 @@ MAINNET_GUARDIAN_NODES = {
 
 GUARDIAN_SIGNATURE_THRESHOLD = 2
 
+# (공개키, 페이로드, 서명) 검증 결과 memoization 크기
+SIGNATURE_CACHE_SIZE = 4096
+
 @dataclass
 class Proposal:
     destination_address: str
@@ -67,7 +72,6 @@ def verify_signature(public_key: PublicKey, message: bytes, signature_b64: str)
         
         # 서명 길이 검증
         if len(signature_bytes) not in [64, 65]:
-            print(f"Invalid signature length: {len(signature_bytes)} bytes")
             return False
         
         # 64바이트 서명인 경우 v 값 추가
@@ -84,10 +88,44 @@ def verify_signature(public_key: PublicKey, message: bytes, signature_b64: str)
         result = public_key.verify_msg_hash(message_hash, signature)
         return result
         
-    except Exception as e:
-        print(f"Signature verification failed: {e}")
+    except Exception:
         return False
 
+@lru_cache(maxsize=32)
+def _cached_guardian_nodes(guardian_nodes: Tuple[Tuple[str, str], ...]) -> Dict[str, PublicKey]:
+    # 가디언 공개키는 노드 구성당 1회만 파싱
+    return process_guardian_nodes(dict(guardian_nodes))
+
+def get_guardian_public_keys(guardian_nodes: Dict[str, str]) -> Dict[str, PublicKey]:
+    """
+    가디언 노드 공개키(hex) → PublicKey (파싱 결과 캐시, 반환 dict는 수정하지 말 것)
+    """
+    return _cached_guardian_nodes(tuple(sorted(guardian_nodes.items())))
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def verify_signature_cached(public_key: PublicKey, message: bytes, signature_b64: str) -> bool:
+    """
+    verify_signature 결과 memoization (같은 제안/서명 재검증 시 secp256k1 연산 생략)
+    """
+    return verify_signature(public_key, message, signature_b64)
+
+def _verify_node(node_id: str, public_key: PublicKey, proposal: Proposal, signature_b64: str) -> bool:
+    # coin_type이 ethereum이 아니면 레거시 → 신규 페이로드 순서로 시도
+    if proposal.coin_type == 'ethereum':
+        payloads = [new_proposal_to_payload(node_id, proposal)]
+    else:
+        payloads = [legacy_proposal_to_payload(node_id, proposal), new_proposal_to_payload(node_id, proposal)]
+    return any(verify_signature_cached(public_key, payload, signature_b64) for payload in payloads)
+
+def _build_result(node_results: Dict[str, bool], errors: List[str], threshold: int) -> VerificationResult:
+    verified_count = sum(1 for is_verified in node_results.values() if is_verified)
+    return VerificationResult(
+        success=verified_count >= threshold,
+        verified_count=verified_count,
+        errors=errors if errors else None,
+        verification_details=node_results
+    )
+
 def verify_deposit_address_signatures(
     signatures: Dict[str, str],
     proposal: Proposal,
@@ -98,51 +136,45 @@ def verify_deposit_address_signatures(
         guardian_nodes = MAINNET_GUARDIAN_NODES
 
     try:
-        processed_nodes = process_guardian_nodes(guardian_nodes)
-        verified_count = 0
+        processed_nodes = get_guardian_public_keys(guardian_nodes)
         errors = []
         verification_details = {}
 
         for node_id, public_key in processed_nodes.items():
+            if node_id not in signatures:
+                verification_details[node_id] = False
+                continue
             try:
-                if node_id not in signatures:
-                    verification_details[node_id] = False
-                    continue
-
-                is_verified = False
-
-                # coin_type이 ethereum이 아니면 레거시/신규 페이로드 모두 시도
-                if proposal.coin_type != 'ethereum':
-                    legacy_payload = legacy_proposal_to_payload(node_id, proposal)
-                    print('legacy_payload', legacy_payload)
-                    is_verified = verify_signature(public_key, legacy_payload, signatures[node_id])
-                    print('is_verified', is_verified)
-                    if not is_verified:
-                        new_payload = new_proposal_to_payload(node_id, proposal)
-                        is_verified = verify_signature(public_key, new_payload, signatures[node_id])
-                else:
-                    payload = new_proposal_to_payload(node_id, proposal)
-                    print('payload', payload)
-                    is_verified = verify_signature(public_key, payload, signatures[node_id])
-                    print('is_verified', is_verified)
-
-                
-
-                verification_details[node_id] = is_verified
-                if is_verified:
-                    verified_count += 1
-
+                verification_details[node_id] = _verify_node(node_id, public_key, proposal, signatures[node_id])
             except Exception as e:
                 errors.append(f"Verification failed for node {node_id}: {str(e)}")
                 verification_details[node_id] = False
 
+        return _build_result(verification_details, errors, threshold)
+
+    except Exception as e:
         return VerificationResult(
-            success=verified_count >= threshold,
-            verified_count=verified_count,
-            errors=errors if errors else None,
-            verification_details=verification_details
+            success=False,
+            verified_count=0,
+            errors=[f"Global verification error: {str(e)}"],
+            verification_details={}
         )
 
+async def verify_deposit_address_signatures_async(
+    signatures: Dict[str, str],
+    proposal: Proposal,
+    guardian_nodes: Optional[Dict[str, str]] = None,
+    threshold: int = GUARDIAN_SIGNATURE_THRESHOLD
+) -> VerificationResult:
+    """
+    verify_deposit_address_signatures의 비동기 버전
+    - 노드별 서명 검증을 이벤트 루프 밖(기본 스레드 풀)에서 동시에 실행
+    """
+    if guardian_nodes is None:
+        guardian_nodes = MAINNET_GUARDIAN_NODES
+
+    try:
+        processed_nodes = get_guardian_public_keys(guardian_nodes)
     except Exception as e:
         return VerificationResult(
             success=False,
@@ -151,6 +183,36 @@ def verify_deposit_address_signatures(
             verification_details={}
         )
 
+    loop = asyncio.get_running_loop()
+    node_ids = [node_id for node_id in processed_nodes if node_id in signatures]
+    outcomes = await asyncio.gather(
+        *(
+            loop.run_in_executor(None, _verify_node, node_id, processed_nodes[node_id], proposal, signatures[node_id])
+            for node_id in node_ids
+        ),
+        return_exceptions=True
+    )
+    errors = []
+    verification_details = {node_id: False for node_id in processed_nodes}
+    for node_id, outcome in zip(node_ids, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append(f"Verification failed for node {node_id}: {str(outcome)}")
+        else:
+            verification_details[node_id] = outcome
+    return _build_result(verification_details, errors, threshold)
+
+async def verify_deposit_addresses(
+    items: List[Tuple[Dict[str, str], Proposal]],
+    guardian_nodes: Optional[Dict[str, str]] = None,
+    threshold: int = GUARDIAN_SIGNATURE_THRESHOLD
+) -> List[VerificationResult]:
+    """
+    여러 (서명, 제안)을 동시에 검증 (입력 순서대로 결과 반환)
+    """
+    return await asyncio.gather(
+        *(verify_deposit_address_signatures_async(signatures, proposal, guardian_nodes, threshold) for signatures, proposal in items)
+    )
+
 # 래퍼 함수: 기존 verify_signatures 패턴 호환
 def verify_signatures(
     protocol_address: str,
@@ -0,0 +1,67 @@
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.config import settings
+from app.core.cache import StaleWhileRevalidate, cache
+from app.core.decoding import decode_response
+from app.core.http_pool import hyperliquid_http
+from app.core.singleflight import SingleFlight
+
+# Hyperliquid /info 요청 coalescing (동일 payload 동시 요청은 1회만 업스트림 호출)
+info_flight = SingleFlight("info")
+
+
+def info_key(payload: Dict) -> str:
+    """
+    payload를 정규화한 coalescing key (키 순서와 무관하게 동일 payload는 동일 key)
+    """
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+async def coalesce_info(payload: Dict, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    임의의 /info 조회 함수(fetch)를 payload 기준으로 coalescing
+    - SDK(public_post_info) 등 다른 전송 경로도 같은 key 공간을 공유
+    """
+    return await info_flight.do(info_key(payload), fetch)
+
+
+async def _post_info(payload: Dict) -> Any:
+    url = f"{settings.HYPERLIQUID_API_URL}/info"
+    resp = await hyperliquid_http().post(url, json=payload)
+    resp.raise_for_status()
+    return decode_response(resp)
+
+
+async def post_info(payload: Dict) -> Any:
+    """
+    Hyperliquid /info POST (공용 커넥션 풀 + 동시 요청 coalescing)
+    - 반환값은 동시 호출자끼리 공유하므로 수정하지 말 것
+    """
+    return await coalesce_info(payload, lambda: _post_info(payload))
+
+
+async def cached_info(payload: Dict, ttl: float, fetch: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+    """
+    /info 응답을 2단계 캐시(L1 + Redis L2)에 ttl초 동안 저장하여 워커 간 공유
+    - fetch를 생략하면 post_info(REST)로 조회
+    """
+    if fetch is None:
+        fetch = lambda: post_info(payload)
+    return await cache.get_or_fetch("info:" + info_key(payload), ttl, fetch)
+
+
+async def _fetch_meta_and_asset_ctxs() -> Any:
+    return await cached_info({"type": "metaAndAssetCtxs"}, settings.CACHE_TTL_ASSET_CTXS)
+
+
+# metaAndAssetCtxs 전체 스냅샷 (수백 KB) stale-while-revalidate 캐시
+meta_and_asset_ctxs = StaleWhileRevalidate(
+    "metaAndAssetCtxs",
+    _fetch_meta_and_asset_ctxs,
+    fresh_ttl=settings.ASSET_CTXS_FRESH_TTL,
+    stale_ttl=settings.ASSET_CTXS_STALE_TTL,
+)
+
+
+def get_info_stats() -> Dict[str, int]:
+    return info_flight.stats()
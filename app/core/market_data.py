@@ -0,0 +1,122 @@
+import time
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.core.info_client import post_info
+from app.core.ws_feed import HyperliquidWsFeed, feed
+
+
+class MarketMirror:
+    """
+    WebSocket 푸시로 유지되는 시장 데이터 인메모리 미러
+    - allMids: 전체 심볼 중간가
+    - activeAssetCtx: (선택) 지정 코인의 자산 컨텍스트
+    - 재연결 시 REST allMids 스냅샷으로 재동기화
+    - 마지막 갱신 후 MARKET_FEED_STALE_SECONDS가 지나면 stale로 보고 조회 시 None 반환 (REST 폴백)
+    """
+
+    def __init__(self, ws_feed: HyperliquidWsFeed):
+        self.feed = ws_feed
+        self.mids: Dict[str, float] = {}
+        self.mids_updated_at = 0.0
+        self.asset_ctxs: Dict[str, Dict[str, Any]] = {}
+        self.asset_ctx_updated_at: Dict[str, float] = {}
+        self.hits = 0
+        self.fallbacks = 0
+        self.resyncs = 0
+        ws_feed.on("allMids", self._on_all_mids)
+        ws_feed.on("activeAssetCtx", self._on_asset_ctx)
+        ws_feed.on_resync(self.resync)
+
+    def _on_all_mids(self, data: Dict) -> None:
+        mids = data.get("mids", {}) if isinstance(data, dict) else {}
+        for symbol, px in mids.items():
+            self.mids[symbol] = float(px)
+        self.mids_updated_at = time.time()
+
+    def _on_asset_ctx(self, data: Dict) -> None:
+        if not isinstance(data, dict) or "coin" not in data:
+            return
+        self.asset_ctxs[data["coin"]] = data.get("ctx", {})
+        self.asset_ctx_updated_at[data["coin"]] = time.time()
+
+    async def resync(self) -> None:
+        """
+        REST allMids 스냅샷으로 미러 전체 재동기화
+        """
+        mids = await post_info({"type": "allMids"})
+        self.mids = {symbol: float(px) for symbol, px in mids.items()}
+        self.mids_updated_at = time.time()
+        self.resyncs += 1
+
+    def _is_fresh(self, updated_at: float) -> bool:
+        return updated_at > 0 and time.time() - updated_at <= settings.MARKET_FEED_STALE_SECONDS
+
+    def is_stale(self) -> bool:
+        return not self._is_fresh(self.mids_updated_at)
+
+    def get_mid(self, symbol: str) -> Optional[float]:
+        """
+        미러에서 중간가 조회 (없거나 stale이면 None → 호출자가 REST 폴백)
+        """
+        if self._is_fresh(self.mids_updated_at):
+            px = self.mids.get(symbol)
+            if px is not None:
+                self.hits += 1
+                return px
+        self.fallbacks += 1
+        return None
+
+    def get_mids(self) -> Optional[Dict[str, float]]:
+        """
+        미러 전체 중간가 dict (stale이면 None → 호출자가 REST 폴백), 반환 dict는 수정하지 말 것
+        """
+        if self._is_fresh(self.mids_updated_at):
+            self.hits += 1
+            return self.mids
+        self.fallbacks += 1
+        return None
+
+    def get_asset_ctx(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        미러에서 자산 컨텍스트(원본 문자열 필드) 조회 (구독하지 않았거나 stale이면 None)
+        """
+        ctx = self.asset_ctxs.get(symbol)
+        if ctx is not None and self._is_fresh(self.asset_ctx_updated_at.get(symbol, 0.0)):
+            self.hits += 1
+            return ctx
+        self.fallbacks += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "feed": self.feed.stats(),
+            "symbols": len(self.mids),
+            "mids_age": (time.time() - self.mids_updated_at) if self.mids_updated_at else None,
+            "stale": self.is_stale(),
+            "asset_ctx_coins": len(self.asset_ctxs),
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "resyncs": self.resyncs,
+        }
+
+
+# 앱 전체에서 공유하는 시장 데이터 미러
+mirror = MarketMirror(feed)
+
+
+def _asset_ctx_coins() -> List[str]:
+    return [coin.strip() for coin in settings.MARKET_FEED_ASSET_CTX_COINS.split(",") if coin.strip()]
+
+
+async def start_market_data() -> None:
+    """
+    WebSocket 시장 데이터 피드 시작 (앱 lifespan에서 호출)
+    """
+    await feed.subscribe({"type": "allMids"})
+    for coin in _asset_ctx_coins():
+        await feed.subscribe({"type": "activeAssetCtx", "coin": coin})
+    await feed.start()
+
+
+async def stop_market_data() -> None:
+    await feed.stop()
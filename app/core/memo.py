@@ -0,0 +1,35 @@
+from typing import Any, Callable, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LastValue(Generic[T]):
+    """
+    마지막 key 1개의 계산 결과만 보관하는 메모 (key가 바뀌면 다시 계산해 교체)
+    - 최신 스냅샷/윈도우처럼 같은 입력이 반복 조회되는 파생 값(뷰, 테이블, 통계)에 사용
+    - by_identity=True면 key를 `is`로 비교 (스냅샷 list처럼 내용 비교가 비싼 객체), 아니면 `==`
+    - key 객체를 참조로 보관하므로 id() 재사용으로 잘못 적중하지 않음
+    - (key, 값) 튜플 참조 하나만 교체하므로 이벤트 루프에서 lock 없이 사용
+    """
+
+    __slots__ = ("by_identity", "_entry", "hits", "misses")
+
+    def __init__(self, by_identity: bool = False):
+        self.by_identity = by_identity
+        self._entry: Optional[Tuple[Any, T]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, build: Callable[[], T]) -> T:
+        """key가 마지막 key와 같으면 보관한 값, 아니면 build()로 만들어 교체"""
+        entry = self._entry
+        if entry is not None and (entry[0] is key if self.by_identity else entry[0] == key):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = build()
+        self._entry = (key, value)
+        return value
+
+    def clear(self) -> None:
+        self._entry = None
@@ -0,0 +1,171 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+import redis.asyncio as redis
+from app.config import settings
+from app.core.decoding import decode_response
+from app.core.http_pool import hyperliquid_http
+from app.core.signer import signers
+
+
+class NonceManager:
+    """
+    지갑별 단조 증가 nonce 발급기 (프로세스 내)
+    - 기본값은 현재 시각(ms), 같은 ms에 여러 번 발급하면 직전 nonce + 1
+    - 지갑별 마지막 값만 보관하며, 이벤트 루프에서 await 없이 처리되므로 전역 lock이 필요 없음
+    - 프로세스마다 따로 발급하므로 uvicorn 워커가 여러 개면 NONCE_BACKEND=redis 필요
+    """
+
+    def __init__(self):
+        self._last: Dict[str, int] = {}
+        self.issued = 0
+
+    def next_local(self, wallet: str) -> int:
+        wallet = wallet.lower()
+        nonce = max(int(time.time() * 1000), self._last.get(wallet, 0) + 1)
+        self._last[wallet] = nonce
+        self.issued += 1
+        return nonce
+
+    async def next(self, wallet: str) -> int:
+        return self.next_local(wallet)
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "wallets": len(self._last), "issued": self.issued}
+
+
+# max(Redis 서버 시각(ms), 직전 nonce + 1, 이 워커의 직전 nonce + 1)을 원자적으로 발급
+_NEXT_NONCE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local last = tonumber(redis.call('GET', KEYS[1]) or '0')
+local nonce = math.max(now, last + 1, tonumber(ARGV[1]))
+redis.call('SET', KEYS[1], string.format('%d', nonce), 'PX', ARGV[2])
+return nonce
+"""
+
+
+class RedisNonceManager(NonceManager):
+    """
+    Redis 공유 nonce 발급기 (여러 uvicorn 워커가 같은 지갑으로 주문해도 nonce가 겹치지 않음)
+    - 지갑별 마지막 nonce를 Redis에 두고 Lua 스크립트 1회로 읽기/증가/저장
+    - Redis 오류 시 프로세스 내 발급으로 대체 (워커 간 중복 가능성을 로그로 남김)
+    """
+
+    def __init__(self, url: str, db: int, prefix: str = "hub:nonce:", ttl_ms: int = 86_400_000):
+        super().__init__()
+        self._redis = redis.from_url(url, db=db)
+        self._script = self._redis.register_script(_NEXT_NONCE_SCRIPT)
+        self.prefix = prefix
+        self.ttl_ms = ttl_ms
+        self.fallbacks = 0
+
+    async def next(self, wallet: str) -> int:
+        wallet = wallet.lower()
+        try:
+            nonce = int(await self._script(keys=[self.prefix + wallet], args=[self._last.get(wallet, 0) + 1, self.ttl_ms]))
+        except Exception as e:
+            self.fallbacks += 1
+            print(f"[nonce] Redis 발급 실패, 프로세스 내 발급으로 대체 (워커 간 중복 가능): {e}")
+            return self.next_local(wallet)
+        self._last[wallet] = nonce
+        self.issued += 1
+        return nonce
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "backend": "redis", "fallbacks": self.fallbacks}
+
+
+class SubmissionPipeline:
+    """
+    서명된 action 제출 파이프라인
+    - 제출 순서대로 nonce를 발급(NonceManager, 워커 간 공유 시 Redis)한 뒤 서명/전송은 동시에 진행 (같은 지갑도 여러 건 in-flight)
+    - 지갑별 동시 전송 수는 ORDER_MAX_INFLIGHT_PER_WALLET으로 제한
+    - 제출(enqueue)부터 응답(ack)까지의 지연 시간을 최근 ORDER_LATENCY_WINDOW건 기준으로 집계
+    """
+
+    def __init__(self, nonce_manager: NonceManager):
+        self.nonces = nonce_manager
+        self._wallet_slots: Dict[str, asyncio.Semaphore] = {}
+        self._latencies: Deque[float] = deque(maxlen=settings.ORDER_LATENCY_WINDOW)
+        self.submitted = 0
+        self.acked = 0
+        self.failed = 0
+        self.inflight = 0
+
+    def _slots(self, wallet: str) -> asyncio.Semaphore:
+        slots = self._wallet_slots.get(wallet)
+        if slots is None:
+            slots = self._wallet_slots[wallet] = asyncio.Semaphore(settings.ORDER_MAX_INFLIGHT_PER_WALLET)
+        return slots
+
+    async def submit(self, private_key: str, action: Dict) -> Dict:
+        """
+        action에 nonce를 붙여 L1 action 서명(EIP-712 phantom agent) 후 /exchange로 전송하고 응답 JSON 반환
+        - 업스트림 비정상 응답은 Exception("API Error: ...")
+        """
+        enqueued_at = time.perf_counter()
+        wallet = signers.address(private_key).lower()
+        nonce = await self.nonces.next(wallet)
+        self.submitted += 1
+        async with self._slots(wallet):
+            self.inflight += 1
+            try:
+                signed_request = {
+                    "action": action,
+                    "nonce": nonce,
+                    "signature": await signers.sign_action(private_key, action, nonce),
+                }
+                response = await hyperliquid_http().post(f"{settings.HYPERLIQUID_API_URL}/exchange", json=signed_request)
+                if response.status_code != 200:
+                    error_detail = f"API Error: {response.status_code}"
+                    try:
+                        error_detail += f" - {response.json()}"
+                    except Exception:
+                        error_detail += f" - {response.text}"
+                    raise Exception(error_detail)
+                result = decode_response(response)
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.inflight -= 1
+        self.acked += 1
+        self._latencies.append((time.perf_counter() - enqueued_at) * 1000)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        count = len(latencies)
+        return {
+            "submitted": self.submitted,
+            "acked": self.acked,
+            "failed": self.failed,
+            "inflight": self.inflight,
+            "nonces": self.nonces.stats(),
+            "latency_ms": {
+                "count": count,
+                "avg": sum(latencies) / count if count else None,
+                "p50": latencies[count // 2] if count else None,
+                "p99": latencies[min(count - 1, int(count * 0.99))] if count else None,
+                "max": latencies[-1] if count else None,
+            },
+        }
+
+
+def _create_nonce_manager() -> NonceManager:
+    if settings.NONCE_BACKEND == "redis":
+        return RedisNonceManager(settings.REDIS_URL, settings.REDIS_DB)
+    return NonceManager()
+
+
+# 앱 전체에서 공유하는 nonce 발급기 / 주문 제출 파이프라인 (NONCE_BACKEND=redis이면 워커 간 공유)
+nonces = _create_nonce_manager()
+pipeline = SubmissionPipeline(nonces)
@@ -0,0 +1,311 @@
+import asyncio
+import time
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from operator import mul
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.core.info_client import post_info
+from app.core.ws_feed import HyperliquidWsFeed, feed
+
+
+class OrderBook:
+    """
+    코인별 L2 오더북 (가격/수량을 float 배열로 보관)
+    - bids는 가격 내림차순, asks는 가격 오름차순 (Hyperliquid l2Book 순서 그대로)
+    - l2Book 푸시는 상위 레벨 전체 스냅샷이므로 푸시마다 배열을 통째로 교체
+    - 최우선 호가/스프레드는 O(1), 누적 수량/누적 금액은 필요할 때 한 번만 계산 후 재사용
+    """
+
+    __slots__ = (
+        "coin", "bid_px", "bid_sz", "ask_px", "ask_sz",
+        "time", "updated_at", "last_read_at", "_bid_cum", "_ask_cum", "_bid_ntl", "_ask_ntl",
+    )
+
+    def __init__(self, coin: str):
+        self.coin = coin
+        self.bid_px = array("d")
+        self.bid_sz = array("d")
+        self.ask_px = array("d")
+        self.ask_sz = array("d")
+        self.time: Optional[int] = None  # 업스트림 타임스탬프 (ms)
+        self.updated_at = 0.0
+        self.last_read_at = time.time()
+        self._bid_cum: Optional[array] = None
+        self._ask_cum: Optional[array] = None
+        self._bid_ntl: Optional[array] = None
+        self._ask_ntl: Optional[array] = None
+
+    def apply_snapshot(self, levels: List[List[Dict]], ts: Optional[int] = None) -> None:
+        """
+        l2Book levels([[bids...], [asks...]], 각 레벨은 {"px", "sz", "n"})를 배열로 반영
+        """
+        bids = levels[0] if len(levels) > 0 else []
+        asks = levels[1] if len(levels) > 1 else []
+        self.bid_px = array("d", [float(level["px"]) for level in bids])
+        self.bid_sz = array("d", [float(level["sz"]) for level in bids])
+        self.ask_px = array("d", [float(level["px"]) for level in asks])
+        self.ask_sz = array("d", [float(level["sz"]) for level in asks])
+        self._bid_cum = None
+        self._ask_cum = None
+        self._bid_ntl = None
+        self._ask_ntl = None
+        self.time = ts
+        self.updated_at = time.time()
+
+    def is_empty(self) -> bool:
+        return not self.bid_px and not self.ask_px
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        return (self.bid_px[0], self.bid_sz[0]) if self.bid_px else None
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        return (self.ask_px[0], self.ask_sz[0]) if self.ask_px else None
+
+    def spread(self) -> Optional[float]:
+        if not self.bid_px or not self.ask_px:
+            return None
+        return self.ask_px[0] - self.bid_px[0]
+
+    def mid(self) -> Optional[float]:
+        if not self.bid_px or not self.ask_px:
+            return None
+        return (self.ask_px[0] + self.bid_px[0]) / 2
+
+    def cumulative_sizes(self, side: str) -> array:
+        """
+        side("bids"/"asks")의 레벨별 누적 수량 배열
+        """
+        if side == "bids":
+            if self._bid_cum is None:
+                self._bid_cum = array("d", accumulate(self.bid_sz))
+            return self._bid_cum
+        if self._ask_cum is None:
+            self._ask_cum = array("d", accumulate(self.ask_sz))
+        return self._ask_cum
+
+    def cumulative_notionals(self, side: str) -> array:
+        """
+        side("bids"/"asks")의 레벨별 누적 금액(가격 * 수량) 배열
+        """
+        if side == "bids":
+            if self._bid_ntl is None:
+                self._bid_ntl = array("d", accumulate(map(mul, self.bid_px, self.bid_sz)))
+            return self._bid_ntl
+        if self._ask_ntl is None:
+            self._ask_ntl = array("d", accumulate(map(mul, self.ask_px, self.ask_sz)))
+        return self._ask_ntl
+
+    def estimate_fill(self, side: str, size: float) -> Dict:
+        """
+        side("buy"/"sell") 시장가 주문 size가 현재 호가를 소진할 때의 예상 체결 결과
+        - buy는 asks, sell은 bids를 최우선 호가부터 소진
+        - 누적 수량 배열에서 이분 탐색으로 마지막 레벨을 찾고, 누적 금액으로 VWAP 계산 (레벨 수와 무관하게 O(log n))
+        - 슬리피지는 중간가(없으면 최우선 호가) 대비 불리한 방향을 양수로 한 bps
+        - 보이는 호가 수량이 부족하면 filled < size, fully_filled=False
+        """
+        book_side = "asks" if side == "buy" else "bids"
+        px = self.ask_px if side == "buy" else self.bid_px
+        cum = self.cumulative_sizes(book_side)
+        ntl = self.cumulative_notionals(book_side)
+        mid = self.mid()
+        result = {
+            "symbol": self.coin,
+            "side": side,
+            "size": size,
+            "filled": 0.0,
+            "fully_filled": False,
+            "levels": 0,
+            "best_price": px[0] if px else None,
+            "mid": mid,
+            "vwap": None,
+            "worst_price": None,
+            "notional": 0.0,
+            "slippage_bps": None,
+            "impact_bps": None,
+            "time": self.time,
+        }
+        if not px or size <= 0:
+            return result
+        last = bisect_left(cum, size)
+        if last < len(px):
+            filled = size
+            notional = (ntl[last - 1] if last else 0.0) + (size - (cum[last - 1] if last else 0.0)) * px[last]
+        else:
+            last = len(px) - 1
+            filled = cum[last]
+            notional = ntl[last]
+        vwap = notional / filled
+        worst = px[last]
+        ref = mid if mid is not None else px[0]
+        sign = 1.0 if side == "buy" else -1.0
+        result.update(
+            filled=filled,
+            fully_filled=filled >= size,
+            levels=last + 1,
+            vwap=vwap,
+            worst_price=worst,
+            notional=notional,
+            slippage_bps=sign * (vwap - ref) / ref * 1e4,
+            impact_bps=sign * (worst - ref) / ref * 1e4,
+        )
+        return result
+
+    def levels(self, side: str, depth: Optional[int] = None) -> List[List[float]]:
+        """
+        상위 depth개 레벨을 [[가격, 수량], ...] 형태로 반환
+        """
+        px, sz = (self.bid_px, self.bid_sz) if side == "bids" else (self.ask_px, self.ask_sz)
+        n = len(px) if depth is None else min(depth, len(px))
+        return [[px[i], sz[i]] for i in range(n)]
+
+    def cumulative_levels(self, side: str, depth: Optional[int] = None) -> List[List[float]]:
+        """
+        상위 depth개 레벨을 [[가격, 누적수량], ...] 형태로 반환
+        """
+        px = self.bid_px if side == "bids" else self.ask_px
+        cum = self.cumulative_sizes(side)
+        n = len(px) if depth is None else min(depth, len(px))
+        return [[px[i], cum[i]] for i in range(n)]
+
+    def to_dict(self, depth: Optional[int] = None) -> Dict:
+        return {
+            "symbol": self.coin,
+            "bids": self.levels("bids", depth),
+            "asks": self.levels("asks", depth),
+            "time": self.time,
+        }
+
+    def summary(self, depth: int = 10) -> Dict:
+        best_bid = self.best_bid()
+        best_ask = self.best_ask()
+        return {
+            "symbol": self.coin,
+            "best_bid": {"px": best_bid[0], "sz": best_bid[1]} if best_bid else None,
+            "best_ask": {"px": best_ask[0], "sz": best_ask[1]} if best_ask else None,
+            "spread": self.spread(),
+            "mid": self.mid(),
+            "bids_cumulative": self.cumulative_levels("bids", depth),
+            "asks_cumulative": self.cumulative_levels("asks", depth),
+            "time": self.time,
+        }
+
+
+class OrderBookManager:
+    """
+    읽는 쪽이 있는 코인만 l2Book을 구독하고, 일정 시간 읽히지 않은 오더북은 구독 해제 후 제거
+    - WebSocket이 연결되어 있고 최근 푸시가 있으면 로컬 오더북을 그대로 반환
+    - 그 외(피드 미연결, 첫 조회, stale)에는 REST l2Book 스냅샷으로 갱신
+    """
+
+    def __init__(self, ws_feed: HyperliquidWsFeed):
+        self.feed = ws_feed
+        self.books: Dict[str, OrderBook] = {}
+        self._evict_task: Optional[asyncio.Task] = None
+        self.local_reads = 0
+        self.rest_reads = 0
+        self.evictions = 0
+        ws_feed.on("l2Book", self._on_l2_book)
+
+    def _on_l2_book(self, data: Dict) -> None:
+        if not isinstance(data, dict):
+            return
+        book = self.books.get(data.get("coin"))
+        if book is None:
+            return  # 이미 제거된 코인의 늦은 푸시
+        book.apply_snapshot(data.get("levels", [[], []]), data.get("time"))
+
+    def _is_fresh(self, book: OrderBook) -> bool:
+        return (
+            self.feed.connected
+            and book.updated_at > 0
+            and time.time() - book.updated_at <= settings.ORDERBOOK_STALE_SECONDS
+        )
+
+    async def get_book(self, coin: str) -> OrderBook:
+        book = self.books.get(coin)
+        if book is None:
+            book = OrderBook(coin)
+            self.books[coin] = book
+            await self.feed.subscribe({"type": "l2Book", "coin": coin})
+        book.last_read_at = time.time()
+        if self._is_fresh(book):
+            self.local_reads += 1
+            return book
+        data = await post_info({"type": "l2Book", "coin": coin})
+        book.apply_snapshot(data.get("levels", [[], []]), data.get("time"))
+        self.rest_reads += 1
+        return book
+
+    async def evict_idle(self) -> None:
+        """
+        ORDERBOOK_IDLE_SECONDS 동안 읽히지 않은 오더북 구독 해제 및 제거
+        """
+        deadline = time.time() - settings.ORDERBOOK_IDLE_SECONDS
+        for coin, book in list(self.books.items()):
+            if book.last_read_at < deadline:
+                del self.books[coin]
+                await self.feed.unsubscribe({"type": "l2Book", "coin": coin})
+                self.evictions += 1
+
+    async def _evict_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.ORDERBOOK_EVICT_INTERVAL)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                print(f"[orderbook] idle 오더북 정리 실패: {e}")
+
+    async def start(self) -> None:
+        if self._evict_task is None or self._evict_task.done():
+            self._evict_task = asyncio.create_task(self._evict_loop())
+
+    async def stop(self) -> None:
+        task, self._evict_task = self._evict_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict:
+        return {
+            "books": len(self.books),
+            "local_reads": self.local_reads,
+            "rest_reads": self.rest_reads,
+            "evictions": self.evictions,
+        }
+
+
+# 앱 전체에서 공유하는 오더북 관리자
+orderbooks = OrderBookManager(feed)
+
+
+def protective_price(estimate: Dict) -> Optional[float]:
+    """
+    시장가 주문의 보호 지정가 (이 가격보다 불리하게는 체결되지 않음)
+    - 예상 최악 체결가에서 MARKET_ORDER_SLIPPAGE_BUFFER_BPS만큼 바깥
+    - 중간가 대비 MARKET_ORDER_MAX_SLIPPAGE_BPS를 넘지 않도록 제한
+    - 보이는 호가로 전량 체결되지 않으면 상한 가격 사용, 반대편 호가가 없으면 None
+    """
+    if estimate["worst_price"] is None:
+        return None
+    ref = estimate["mid"] if estimate["mid"] is not None else estimate["best_price"]
+    sign = 1.0 if estimate["side"] == "buy" else -1.0
+    limit = ref * (1 + sign * settings.MARKET_ORDER_MAX_SLIPPAGE_BPS / 1e4)
+    if not estimate["fully_filled"]:
+        return limit
+    price = estimate["worst_price"] * (1 + sign * settings.MARKET_ORDER_SLIPPAGE_BUFFER_BPS / 1e4)
+    return min(price, limit) if sign > 0 else max(price, limit)
+
+
+async def estimate_market_order(symbol: str, side: str, size: float) -> Dict:
+    """
+    심볼 오더북 기준 시장가 주문의 예상 VWAP/최악 체결가/슬리피지와 보호 지정가(limit_price)
+    """
+    book = await orderbooks.get_book(symbol)
+    estimate = book.estimate_fill(side, size)
+    estimate["limit_price"] = protective_price(estimate)
+    return estimate
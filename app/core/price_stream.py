@@ -0,0 +1,104 @@
+import asyncio
+from typing import Dict, FrozenSet, Optional, Set
+from app.config import settings
+from app.core.market_data import mirror
+from app.core.ws_feed import HyperliquidWsFeed, feed
+
+
+class ConflatingQueue:
+    """
+    클라이언트별 가격 큐 (심볼별 최신 값만 유지)
+    - 클라이언트가 느리면 같은 심볼의 이전 값은 최신 값으로 덮어씀 (conflation)
+    - 보관 항목 수는 구독 심볼 수(또는 전체 유니버스 크기)를 넘지 않으므로 메모리가 무한히 늘지 않음
+    - offer는 동기 함수라 브로드캐스터가 느린 클라이언트를 기다리는 일이 없음
+    """
+
+    def __init__(self, symbols: Optional[FrozenSet[str]] = None):
+        self.symbols = symbols
+        self._pending: Dict[str, float] = {}
+        self._event = asyncio.Event()
+        self.delivered = 0
+        self.conflated = 0
+
+    def offer(self, updates: Dict[str, float]) -> None:
+        pending = self._pending
+        for symbol, px in updates.items():
+            if self.symbols is not None and symbol not in self.symbols:
+                continue
+            if symbol in pending:
+                self.conflated += 1
+            pending[symbol] = px
+        if pending:
+            self._event.set()
+
+    async def get(self) -> Dict[str, float]:
+        """
+        대기 중인 최신 가격 묶음을 한 번에 꺼냄 (없으면 새 값이 올 때까지 대기)
+        """
+        while not self._pending:
+            self._event.clear()
+            await self._event.wait()
+        batch, self._pending = self._pending, {}
+        self._event.clear()
+        self.delivered += len(batch)
+        return batch
+
+
+class PriceBroadcaster:
+    """
+    하나의 allMids 업스트림 구독을 다수의 다운스트림 클라이언트로 fan-out
+    - 푸시마다 직전 값과 비교해 변경된 심볼만 각 클라이언트 큐에 전달
+    """
+
+    def __init__(self, ws_feed: HyperliquidWsFeed):
+        self._clients: Set[ConflatingQueue] = set()
+        self._last: Dict[str, float] = {}
+        self.pushes = 0
+        ws_feed.on("allMids", self._on_all_mids)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def _on_all_mids(self, data: Dict) -> None:
+        mids = data.get("mids", {}) if isinstance(data, dict) else {}
+        last = self._last
+        changed: Dict[str, float] = {}
+        for symbol, px in mids.items():
+            value = float(px)
+            if last.get(symbol) != value:
+                last[symbol] = value
+                changed[symbol] = value
+        if not changed:
+            return
+        self.pushes += 1
+        for queue in list(self._clients):
+            queue.offer(changed)
+
+    def subscribe(self, symbols: Optional[FrozenSet[str]] = None) -> ConflatingQueue:
+        """
+        클라이언트 큐 등록 (STREAM_MAX_CLIENTS 초과 시 OverflowError)
+        - 미러에 최신 스냅샷이 있으면 초기값으로 바로 전달
+        """
+        if len(self._clients) >= settings.STREAM_MAX_CLIENTS:
+            raise OverflowError("Too many streaming clients")
+        queue = ConflatingQueue(symbols)
+        snapshot = mirror.get_mids()
+        if snapshot:
+            queue.offer(snapshot)
+        self._clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: ConflatingQueue) -> None:
+        self._clients.discard(queue)
+
+    def stats(self) -> Dict:
+        return {
+            "clients": len(self._clients),
+            "pushes": self.pushes,
+            "conflated": sum(queue.conflated for queue in self._clients),
+        }
+
+
+# 앱 전체에서 공유하는 가격 브로드캐스터
+broadcaster = PriceBroadcaster(feed)
@@ -0,0 +1,133 @@
+import time
+from typing import Dict, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.core.asset_table import AssetTable
+from app.core.ctx_history import CtxHistory
+from app.core.memo import LastValue
+
+# Hyperliquid 펀딩은 1시간 주기 → 연율 환산 배수
+FUNDING_PERIODS_PER_YEAR = 24 * 365
+
+# 롤링 z-score를 계산하는 지표
+Z_METRICS: Tuple[str, ...] = ("funding", "premium", "basis")
+
+SCREENER_COLUMNS: Tuple[str, ...] = (
+    "funding",
+    "fundingAnnualized",  # funding * 24 * 365
+    "premium",  # 오라클 대비 프리미엄 (Hyperliquid premium)
+    "basis",  # markPx / oraclePx - 1
+    "markPx",
+    "oraclePx",
+    "openInterestNtl",  # openInterest * markPx (USD)
+    "oiWeight",  # 전체 미결제약정(USD) 대비 비중
+    "oiWeightedFunding",  # fundingAnnualized * oiWeight
+    "dayNtlVlm",
+    "change24h",
+    "fundingZ",  # 롤링 윈도우 대비 z-score (시계열 기록 필요)
+    "premiumZ",
+    "basisZ",
+)
+
+
+def _masked_mean_std(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """[행, 열] 배열의 열별 NaN 제외 평균/표준편차/표본 수 (경고 없이 빈 열은 NaN)"""
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(present, values, 0.0).sum(axis=0) / counts
+        var = np.where(present, (values - mean) ** 2, 0.0).sum(axis=0) / counts
+    return mean, np.sqrt(var), counts
+
+
+class WindowStats:
+    """
+    시계열 기록의 롤링 윈도우 통계 (슬롯별 평균/표준편차/표본 수)
+    - 새 행이 기록되기 전까지는 같은 통계를 재사용 (history.appended 기준)
+    """
+
+    __slots__ = ("samples", "stats")
+
+    def __init__(self, samples: int, stats: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]):
+        self.samples = samples
+        self.stats = stats
+
+
+# 마지막 윈도우 통계 / 스크리너 테이블 (입력이 바뀔 때만 다시 계산)
+_windows: LastValue[WindowStats] = LastValue()
+_screens: LastValue["Screen"] = LastValue()
+
+
+def _build_window_stats(history: CtxHistory, window_seconds: float) -> WindowStats:
+    rows = history.window(("funding", "premium", "markPx", "oraclePx"), time.time() - window_seconds)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        basis = rows["markPx"] / rows["oraclePx"] - 1.0
+    metrics = {"funding": rows["funding"], "premium": rows["premium"], "basis": basis}
+    return WindowStats(
+        len(rows["funding"]),
+        {metric: _masked_mean_std(values) for metric, values in metrics.items()},
+    )
+
+
+def window_stats(history: CtxHistory, window_seconds: float) -> Optional[WindowStats]:
+    """기록이 열려 있으면 최근 window_seconds 구간의 지표별 통계, 아니면 None"""
+    if not history.is_open:
+        return None
+    key = (history, history.directory, history.appended, history.count, window_seconds)
+    return _windows.get(key, lambda: _build_window_stats(history, window_seconds))
+
+
+class Screen:
+    """
+    스크리너 컬럼 테이블 (AssetTable과 같은 행 순서, 지표마다 float64 배열 1개)
+    - 스냅샷/윈도우 통계가 바뀔 때만 한 번의 벡터 연산으로 생성
+    """
+
+    __slots__ = ("names", "columns", "samples")
+
+    def __init__(self, table: AssetTable, history: CtxHistory, stats: Optional[WindowStats]):
+        self.names = table.names
+        columns = table.columns
+        funding_annualized = columns["funding"] * FUNDING_PERIODS_PER_YEAR
+        oi_ntl = columns["openInterestNtl"]
+        total_oi = np.nansum(oi_ntl)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            basis = columns["markPx"] / columns["oraclePx"] - 1.0
+            oi_weight = oi_ntl / total_oi if total_oi > 0 else np.full(len(oi_ntl), np.nan)
+        current = {"funding": columns["funding"], "premium": columns["premium"], "basis": basis}
+        self.columns: Dict[str, np.ndarray] = {
+            "funding": columns["funding"],
+            "fundingAnnualized": funding_annualized,
+            "premium": columns["premium"],
+            "basis": basis,
+            "markPx": columns["markPx"],
+            "oraclePx": columns["oraclePx"],
+            "openInterestNtl": oi_ntl,
+            "oiWeight": oi_weight,
+            "oiWeightedFunding": funding_annualized * oi_weight,
+            "dayNtlVlm": columns["dayNtlVlm"],
+            "change24h": columns["change24h"],
+        }
+        self.samples = stats.samples if stats is not None else 0
+        history_slots = history.slots_for(self.names) if stats is not None else None
+        for metric in Z_METRICS:
+            z = np.full(len(self.names), np.nan)
+            if history_slots is not None:
+                valid = history_slots >= 0
+                mean, std, counts = (values[history_slots[valid]] for values in stats.stats[metric])
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    z[valid] = np.where(
+                        (std > 0) & (counts >= settings.SCREENER_MIN_SAMPLES),
+                        (current[metric][valid] - mean) / std,
+                        np.nan,
+                    )
+            self.columns[metric + "Z"] = z
+
+
+def build_screen(table: AssetTable, history: CtxHistory, window_seconds: float) -> Screen:
+    """
+    스냅샷 테이블 + 롤링 윈도우 통계로 스크리너 테이블 생성 (입력이 같으면 재사용)
+    """
+    stats = window_stats(history, window_seconds)
+    # AssetTable/WindowStats는 __eq__가 없으므로 튜플 비교는 객체 동일성 비교
+    return _screens.get((table, stats), lambda: Screen(table, history, stats))
@@ -0,0 +1,104 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_utils import keccak
+from hyperliquid.ccxt import hyperliquid as HyperliquidSdk
+from app.config import settings
+
+# 서명 키 없이 L1 action 인코딩(msgpack action hash, EIP-712 구조화 데이터)에만 쓰는 SDK 인스턴스
+_encoder = HyperliquidSdk({})
+
+# Hyperliquid L1 action 서명 도메인 (SDK sign_l1_action과 동일)
+_L1_DOMAIN = {
+    "chainId": 1337,
+    "name": "Exchange",
+    "verifyingContract": "0x0000000000000000000000000000000000000000",
+    "version": "1",
+}
+_L1_TYPES = {
+    "Agent": [
+        {"name": "source", "type": "string"},
+        {"name": "connectionId", "type": "bytes32"},
+    ],
+}
+
+
+@lru_cache(maxsize=256)
+def load_account(private_key: str) -> LocalAccount:
+    """
+    개인키(hex) → 서명 객체 (키당 1회만 파싱, 프로세스 풀 워커에서도 워커별로 캐시)
+    """
+    return Account.from_key(private_key)
+
+
+def sign_l1_action(private_key: str, action: Dict, nonce: int) -> Dict[str, Any]:
+    """
+    /exchange L1 action 서명 (EIP-712 phantom agent) → {"r", "s", "v"}
+    - action msgpack 해시와 EIP-712 인코딩은 SDK(create_orders/cancel_orders와 같은 코드)로 계산
+    - 서명만 캐시된 키(load_account)로 처리 (SDK 내장 순수 파이썬 ECDSA보다 수 배 빠름)
+    - action의 key 순서가 해시에 포함되므로 wire 형식 순서를 그대로 유지해야 함
+    """
+    is_testnet = "testnet" in settings.HYPERLIQUID_API_URL
+    phantom_agent = _encoder.construct_phantom_agent(_encoder.action_hash(action, None, nonce), is_testnet)
+    message = _encoder.eth_encode_structured_data(_L1_DOMAIN, _L1_TYPES, phantom_agent)
+    signed = load_account(private_key).unsafe_sign_hash(keccak(message))
+    return {"r": f"0x{signed.r:064x}", "s": f"0x{signed.s:064x}", "v": signed.v}
+
+
+class SignerRegistry:
+    """
+    서명 키 레지스트리 + 이벤트 루프 밖 서명 워커 풀
+    - 키는 처음 사용할 때 한 번만 파싱해 캐시 (load_account)
+    - secp256k1 서명은 SIGNER_POOL 설정에 따라 스레드/프로세스 풀에서 실행해
+      주문 폭주 중에도 시장 데이터 핸들러가 막히지 않도록 함 ("inline"이면 루프에서 직접 실행)
+    """
+
+    def __init__(self, mode: str, workers: int):
+        self.mode = mode
+        self.workers = workers
+        self._executor: Optional[Executor] = None
+        self.signed = 0
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.mode == "inline":
+            return None
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="signer")
+        return self._executor
+
+    def address(self, private_key: str) -> str:
+        """키의 지갑 주소 (캐시된 서명 객체 사용)"""
+        return load_account(private_key).address
+
+    async def sign_action(self, private_key: str, action: Dict, nonce: int) -> Dict[str, Any]:
+        """/exchange L1 action 서명 ({"r", "s", "v"}, 풀 설정에 따라 루프 밖에서 실행)"""
+        self.signed += 1
+        executor = self._get_executor()
+        if executor is None:
+            return sign_l1_action(private_key, action, nonce)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, sign_l1_action, private_key, action, nonce)
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        info = load_account.cache_info()
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "cached_keys": info.currsize,
+            "signed": self.signed,
+        }
+
+
+# 앱 전체에서 공유하는 서명 레지스트리
+signers = SignerRegistry(settings.SIGNER_POOL, settings.SIGNER_WORKERS)
@@ -0,0 +1,47 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    동일 key로 동시에 들어온 비동기 호출을 하나의 업스트림 요청으로 합치는 유틸
+    - 먼저 들어온 호출(leader)이 실제 요청을 실행하고, 뒤따르는 호출은 같은 결과를 공유
+    - 한 호출자가 취소되어도 공유 작업은 취소되지 않음 (asyncio.shield)
+    - 결과 객체는 모든 호출자가 공유하므로 호출자가 수정하지 않아야 함
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.calls = 0        # 전체 호출 수
+        self.executions = 0   # 실제 업스트림 실행 수
+        self.coalesced = 0    # 진행 중 요청에 합쳐진 호출 수
+        self.errors = 0       # 실패한 업스트림 실행 수
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 호출자가 취소된 경우에도 "exception never retrieved" 경고가 나지 않도록 처리
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,46 @@
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+
+class SqliteStore:
+    """
+    SQLite 영구 저장소 공통 기반 (하위 클래스는 SCHEMA만 정의)
+    - 연결은 처음 사용할 때 열며(WAL 모드, synchronous=NORMAL), 스레드 간 공유를 위해 lock으로 직렬화
+    - 메서드는 동기(블로킹) 호출이므로 이벤트 루프에서는 asyncio.to_thread로 호출
+    - 행은 sqlite3.Row (이름/인덱스 모두로 접근)
+    """
+
+    # 연결을 열 때 실행할 CREATE TABLE/INDEX IF NOT EXISTS 스크립트
+    SCHEMA = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def open(self, path: str) -> None:
+        """다른 파일로 전환 (기존 연결은 닫음)"""
+        self.close()
+        self.path = path
+
+    def close(self) -> None:
+        with self._lock:
+            conn, self._conn = self._conn, None
+            if conn is not None:
+                conn.close()
@@ -0,0 +1,211 @@
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.core.decoding import format_asset_ctx
+from app.core.info_client import cached_info
+from app.core.memo import LastValue
+from app.core.singleflight import SingleFlight
+
+
+@dataclass(frozen=True)
+class Universe:
+    """
+    Hyperliquid 퍼프 마켓 유니버스 (불변 객체)
+    - names[i]: 자산 인덱스(asset id) i의 심볼
+    - index: 심볼 → 자산 인덱스 (O(1) 조회)
+    - sz_decimals / max_leverage: 자산 인덱스 순서의 compact 배열
+    - 갱신 시 새 객체를 만들어 모듈 전역 참조만 교체하므로 읽는 쪽은 lock 없이 사용
+    """
+
+    names: Tuple[str, ...]
+    index: Dict[str, int]
+    sz_decimals: array
+    max_leverage: array
+    fetched_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_meta(cls, meta: Dict) -> "Universe":
+        """
+        meta 응답({"universe": [{"name", "szDecimals", "maxLeverage", ...}, ...]})으로 생성
+        """
+        assets = meta.get("universe", [])
+        names = tuple(asset["name"] for asset in assets)
+        return cls(
+            names=names,
+            index={name: i for i, name in enumerate(names)},
+            sz_decimals=array("b", [int(asset.get("szDecimals", 0)) for asset in assets]),
+            max_leverage=array("H", [int(asset.get("maxLeverage", 0)) for asset in assets]),
+        )
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def asset_id(self, symbol: str) -> Optional[int]:
+        return self.index.get(symbol)
+
+    def name(self, asset_id: int) -> Optional[str]:
+        if 0 <= asset_id < len(self.names):
+            return self.names[asset_id]
+        return None
+
+    def info(self, symbol: str) -> Optional[Dict]:
+        idx = self.index.get(symbol)
+        if idx is None:
+            return None
+        return {
+            "symbol": symbol,
+            "asset_id": idx,
+            "szDecimals": self.sz_decimals[idx],
+            "maxLeverage": self.max_leverage[idx],
+        }
+
+
+EMPTY_UNIVERSE = Universe.from_meta({"universe": []})
+
+# 현재 유니버스 (교체는 참조 대입 한 번으로 원자적으로 이루어짐)
+_current: Universe = EMPTY_UNIVERSE
+_refresh_flight = SingleFlight("universe")
+
+
+def current_universe() -> Universe:
+    """
+    현재 유니버스를 즉시 반환 (비어 있을 수 있음, 업스트림 호출 없음)
+    """
+    return _current
+
+
+def install_universe(meta: Dict) -> Universe:
+    """
+    meta(또는 metaAndAssetCtxs의 [0])로 새 유니버스를 만들어 교체
+    """
+    global _current
+    _current = Universe.from_meta(meta)
+    return _current
+
+
+async def _refresh() -> Universe:
+    meta = await cached_info({"type": "meta"}, settings.CACHE_TTL_META)
+    return install_universe(meta)
+
+
+async def get_universe() -> Universe:
+    """
+    유니버스 반환 (비어 있거나 CACHE_TTL_META가 지나면 갱신, 동시 갱신은 1회로 합침)
+    """
+    universe = _current
+    if not universe.names or time.time() - universe.fetched_at > settings.CACHE_TTL_META:
+        universe = await _refresh_flight.do("meta", _refresh)
+    return universe
+
+
+async def get_asset_id(symbol: str) -> int:
+    """
+    심볼의 Hyperliquid 자산 인덱스(asset id) 반환 (없으면 ValueError)
+    """
+    asset_id = (await get_universe()).asset_id(symbol)
+    if asset_id is None:
+        raise ValueError(f"Symbol not found: {symbol}")
+    return asset_id
+
+
+def round_price(price: float, sz_decimals: int) -> float:
+    """
+    퍼프 주문 가격을 tick 규칙에 맞게 반올림
+    - 유효숫자 5자리 (정수부가 더 길면 정수부 전체), 소수점은 (6 - szDecimals)자리 이내
+    """
+    significant = max(5, len(str(int(abs(price)))))
+    return round(float(f"{price:.{significant}g}"), max(0, 6 - sz_decimals))
+
+
+def round_size(size: float, sz_decimals: int) -> float:
+    """주문 수량을 자산의 szDecimals 자리로 반올림"""
+    return round(size, sz_decimals)
+
+
+def float_to_wire(value: float) -> str:
+    """
+    가격/수량을 /exchange wire 문자열로 변환 (불필요한 0 제거, 예: 3000.0 → "3000")
+    """
+    text = f"{value:.8f}".rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+
+def find_asset_ctx(snapshot, symbol: str) -> Optional[Dict]:
+    """
+    metaAndAssetCtxs 스냅샷([meta, assetCtxs])에서 심볼의 자산 컨텍스트를 찾음
+    - 유니버스 인덱스로 O(1) 조회하고, 스냅샷과 어긋난 경우(신규 상장 직후 등)에만 선형 탐색
+    """
+    assets = snapshot[0]["universe"]
+    asset_ctxs = snapshot[1]
+    idx = _current.asset_id(symbol)
+    if idx is None or idx >= len(assets) or assets[idx]["name"] != symbol:
+        idx = next((i for i, asset in enumerate(assets) if asset["name"] == symbol), None)
+        if idx is None:
+            return None
+    return asset_ctxs[idx]
+
+
+class AssetCtxsView:
+    """
+    metaAndAssetCtxs 스냅샷([meta, assetCtxs])의 지연 변환 뷰
+    - 요청된 심볼의 자산 컨텍스트만 float 변환하고, 같은 스냅샷 안에서는 결과를 재사용
+    - 수백 개 자산 전체를 매 요청 변환하지 않으므로 단건 조회(get_asset_ctx/get_mark_price) 비용이 자산 수와 무관
+    - 반환 dict는 공유되므로 수정하지 말 것
+    """
+
+    __slots__ = ("snapshot", "_formatted", "_mark_px")
+
+    def __init__(self, snapshot: List):
+        self.snapshot = snapshot
+        self._formatted: Dict[str, Dict] = {}
+        self._mark_px: Dict[str, float] = {}
+
+    def raw(self, symbol: str) -> Optional[Dict]:
+        return find_asset_ctx(self.snapshot, symbol)
+
+    def asset_ctx(self, symbol: str) -> Optional[Dict]:
+        """심볼의 변환된 자산 컨텍스트 (없으면 None)"""
+        formatted = self._formatted.get(symbol)
+        if formatted is None:
+            ctx = self.raw(symbol)
+            if ctx is None:
+                return None
+            formatted = self._formatted[symbol] = format_asset_ctx(symbol, ctx)
+        return formatted
+
+    def mark_price(self, symbol: str) -> Optional[float]:
+        """심볼의 마크 가격만 변환 (없으면 None)"""
+        price = self._mark_px.get(symbol)
+        if price is None:
+            ctx = self.raw(symbol)
+            if ctx is None or ctx.get("markPx") is None:
+                return None
+            price = self._mark_px[symbol] = float(ctx["markPx"])
+        return price
+
+    def all_asset_ctxs(self) -> List[Dict]:
+        """스냅샷 순서대로 전체 자산 컨텍스트 (이미 변환된 심볼은 재사용)"""
+        results = []
+        for asset, ctx in zip(self.snapshot[0]["universe"], self.snapshot[1]):
+            name = asset["name"]
+            formatted = self._formatted.get(name)
+            if formatted is None:
+                formatted = self._formatted[name] = format_asset_ctx(name, ctx)
+            results.append(formatted)
+        return results
+
+
+# 마지막 스냅샷의 뷰 (스냅샷 객체가 바뀌면 새 뷰 생성)
+_views: LastValue[AssetCtxsView] = LastValue(by_identity=True)
+
+
+def asset_ctxs_view(snapshot: List) -> AssetCtxsView:
+    """
+    스냅샷의 지연 변환 뷰 반환 (같은 스냅샷 객체면 같은 뷰를 재사용해 변환 결과 공유)
+    """
+    return _views.get(snapshot, lambda: AssetCtxsView(snapshot))
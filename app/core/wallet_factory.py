@@ -0,0 +1,195 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from eth_account import Account
+from web3 import Web3
+from app.config import settings
+from app.core.deposit_store import deposit_store
+from app.core.http_pool import hyperunit_http
+from app.core.hyperunit_client import Proposal, verify_deposit_addresses
+
+# 입금 주소를 생성할 자산: 응답 key → (src_chain, asset)
+# 새 자산은 register_deposit_asset으로 추가 (gen_wallet/지갑 풀에 자동 반영)
+DEPOSIT_ASSETS: Dict[str, Tuple[str, str]] = {
+    "ETH": ("ethereum", "eth"),
+    "SOL": ("solana", "sol"),
+}
+
+
+class DepositVerificationError(Exception):
+    """입금 주소 가디언 서명 검증 실패"""
+
+
+class DepositAddressError(Exception):
+    """HyperUnit 입금 주소 생성 응답이 비정상 (status != "OK" 또는 주소 없음)"""
+
+
+def register_deposit_asset(label: str, source_chain: str, asset: str) -> None:
+    DEPOSIT_ASSETS[label] = (source_chain, asset)
+
+
+async def generate_deposit_address(destination_address: str, source_chain: str, asset: str) -> Dict:
+    """
+    HyperUnit 입금 주소 생성 GET /gen/{src_chain}/hyperliquid/{asset}/{dst_addr} (공용 커넥션 풀)
+    - 같은 입력은 같은 주소를 반환하므로 입금 주소 저장소에 있으면 업스트림 호출 없이 반환
+    - status가 "OK"이고 주소가 있는 응답만 저장 (아니면 DepositAddressError)
+    - 저장소(SQLite) 조회/저장은 이벤트 루프를 막지 않도록 스레드에서 실행
+    """
+    stored = await asyncio.to_thread(deposit_store.get, destination_address, source_chain, asset)
+    if stored is not None:
+        return stored["response"]
+    url = f"{settings.HYPERUNIT_API_URL}/gen/{source_chain}/hyperliquid/{asset}/{destination_address}"
+    response = await hyperunit_http().get(url)
+    response.raise_for_status()
+    data = response.json()
+    if not isinstance(data, dict) or data.get("status") != "OK" or not data.get("address"):
+        raise DepositAddressError(f"{source_chain}/{asset} 입금 주소 생성 실패: {data}")
+    await asyncio.to_thread(deposit_store.put, destination_address, source_chain, asset, data)
+    return data
+
+
+async def verify_deposit_data(destination_address: str, deposit_data: Dict[str, Dict]) -> None:
+    """
+    자산별 입금 주소의 가디언 서명을 동시에 검증 (실패 시 DepositVerificationError)
+    - 검증 결과는 입금 주소 저장소에 기록하며, 이미 검증된 주소는 다시 검증하지 않음
+    """
+    labels = []
+    proposals = []
+    for label, data in deposit_data.items():
+        source_chain, asset = DEPOSIT_ASSETS[label]
+        stored = await asyncio.to_thread(deposit_store.get, destination_address, source_chain, asset)
+        if stored is not None and stored["verified"]:
+            continue
+        labels.append(label)
+        proposals.append((
+            data["signatures"],
+            Proposal(
+                destination_address=destination_address,
+                destination_chain="hyperliquid",
+                asset=asset,
+                address=data["address"],
+                source_chain=source_chain
+            ),
+        ))
+    results = await verify_deposit_addresses(proposals)
+    for label, verification_result in zip(labels, results):
+        source_chain, asset = DEPOSIT_ASSETS[label]
+        await asyncio.to_thread(
+            deposit_store.set_verification,
+            destination_address, source_chain, asset, verification_result.success, verification_result.verified_count,
+        )
+    for label, verification_result in zip(labels, results):
+        if not verification_result.success:
+            error_detail = f"{label} 입금 주소 생성 실패: {verification_result.verified_count}/2 서명 검증됨"
+            if verification_result.errors:
+                error_detail += f", 에러: {', '.join(verification_result.errors)}"
+            if verification_result.verification_details:
+                error_detail += f", 검증 상세: {verification_result.verification_details}"
+            raise DepositVerificationError(error_detail)
+
+
+async def get_deposit_addresses(destination_address: str) -> Dict[str, Dict]:
+    """
+    목적지(Hyperliquid) 주소의 등록된 모든 자산 입금 주소를 동시에 조회
+    - 저장소에 있는 자산은 로컬 조회, 없는 자산만 HyperUnit에 요청
+    - HYPERUNIT_VERIFY_SIGNATURES이면 가디언 서명 검증까지 완료한 결과만 반환
+    """
+    labels = list(DEPOSIT_ASSETS)
+    responses = await asyncio.gather(*(
+        generate_deposit_address(destination_address, *DEPOSIT_ASSETS[label]) for label in labels
+    ))
+    deposit_data = dict(zip(labels, responses))
+    if settings.HYPERUNIT_VERIFY_SIGNATURES:
+        await verify_deposit_data(destination_address, deposit_data)
+    return deposit_data
+
+
+async def create_wallet() -> Dict:
+    """
+    새 지갑 생성 + 등록된 모든 자산의 입금 주소를 동시에 생성
+    - HYPERUNIT_VERIFY_SIGNATURES이면 가디언 서명 검증까지 완료한 결과만 반환
+    반환: {"wallet": {"address", "private_key"}, "deposit_address": {"ETH": {...}, "SOL": {...}, ...}}
+    """
+    account = Account.create()
+    return {
+        "wallet": {"address": account.address, "private_key": Web3.to_hex(account.key)},
+        "deposit_address": await get_deposit_addresses(account.address),
+    }
+
+
+class WalletPool:
+    """
+    입금 주소까지 생성해 둔 지갑 풀 (WALLET_POOL_SIZE > 0이면 사용)
+    - gen_wallet은 풀에서 즉시 꺼내 반환하고, 백그라운드 작업이 풀을 다시 채움
+    - 생성 실패 시 WALLET_POOL_RETRY_SECONDS 후 재시도 (그동안 gen_wallet은 직접 생성으로 폴백)
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._wallets: List[Dict] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.created = 0
+        self.served = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def take(self) -> Optional[Dict]:
+        """
+        풀에서 지갑 1개를 꺼냄 (비어 있으면 None → 호출자가 직접 생성)
+        """
+        if not self._wallets:
+            self.misses += 1
+            return None
+        wallet = self._wallets.pop(0)
+        self.served += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return wallet
+
+    async def _refill(self) -> None:
+        while True:
+            while len(self._wallets) < self.size:
+                try:
+                    self._wallets.append(await create_wallet())
+                    self.created += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.errors += 1
+                    print(f"[wallet_pool] 지갑 생성 실패: {e}")
+                    await asyncio.sleep(settings.WALLET_POOL_RETRY_SECONDS)
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    async def start(self) -> None:
+        if self.size <= 0 or self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._refill())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "available": len(self._wallets),
+            "created": self.created,
+            "served": self.served,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+# 앱 전체에서 공유하는 사전 생성 지갑 풀
+wallet_pool = WalletPool(settings.WALLET_POOL_SIZE)
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import websockets
+from app.config import settings
+from app.core.decoding import loads
+
+# 채널 메시지 핸들러: data(dict/list)를 받아 동기적으로 처리 (이벤트 루프를 막지 않도록 가볍게 유지)
+MessageHandler = Callable[[Any], None]
+# (재)연결 직후 호출되는 스냅샷 재동기화 훅
+ResyncHook = Callable[[], Awaitable[None]]
+
+
+def subscription_key(subscription: Dict) -> str:
+    return json.dumps(subscription, sort_keys=True, separators=(",", ":"))
+
+
+class HyperliquidWsFeed:
+    """
+    Hyperliquid WebSocket 구독 관리자
+    - 하나의 연결 위에서 여러 구독(allMids, activeAssetCtx, l2Book 등)을 관리
+    - channel 별 핸들러로 메시지를 분배
+    - 연결이 끊기면 지수 백오프로 재연결 후 모든 구독을 복구하고 resync 훅으로 스냅샷 재동기화
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._subscriptions: Dict[str, Dict] = {}
+        self._handlers: Dict[str, List[MessageHandler]] = {}
+        self._resync_hooks: List[ResyncHook] = []
+        self._ws: Optional[Any] = None
+        self._task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.reconnects = 0
+        self.messages = 0
+        self.last_message_at = 0.0
+        self.last_error: Optional[str] = None
+
+    def on(self, channel: str, handler: MessageHandler) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def on_resync(self, hook: ResyncHook) -> None:
+        self._resync_hooks.append(hook)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def subscribe(self, subscription: Dict) -> None:
+        """
+        구독 등록 (연결 중이면 즉시 전송, 아니면 다음 연결 시 전송)
+        """
+        key = subscription_key(subscription)
+        if key in self._subscriptions:
+            return
+        self._subscriptions[key] = subscription
+        await self._send({"method": "subscribe", "subscription": subscription})
+
+    async def unsubscribe(self, subscription: Dict) -> None:
+        key = subscription_key(subscription)
+        if self._subscriptions.pop(key, None) is None:
+            return
+        await self._send({"method": "unsubscribe", "subscription": subscription})
+
+    def is_subscribed(self, subscription: Dict) -> bool:
+        return subscription_key(subscription) in self._subscriptions
+
+    async def _send(self, message: Dict) -> None:
+        ws = self._ws
+        if ws is None or not self.connected:
+            return
+        try:
+            await ws.send(json.dumps(message))
+        except Exception as e:
+            # 전송 실패는 재연결 루프에서 구독 복구로 처리
+            self.last_error = str(e)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.connected = False
+        self._ws = None
+
+    async def _run(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                async with websockets.connect(self.url, max_size=None) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    attempt = 0
+                    await self._on_connected()
+                    self._heartbeat_task = asyncio.create_task(self._heartbeat())
+                    try:
+                        async for raw in ws:
+                            self._on_raw_message(raw)
+                    finally:
+                        self._heartbeat_task.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"[ws_feed] 연결 오류: {e}")
+            self.connected = False
+            self._ws = None
+            self.reconnects += 1
+            delay = min(settings.WS_RECONNECT_MAX_DELAY, settings.WS_RECONNECT_BASE_DELAY * (2 ** attempt))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _on_connected(self) -> None:
+        # 1. 기존 구독 복구
+        for subscription in list(self._subscriptions.values()):
+            await self._send({"method": "subscribe", "subscription": subscription})
+        # 2. 끊겨 있던 동안 놓친 데이터는 REST 스냅샷으로 재동기화
+        for hook in self._resync_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                print(f"[ws_feed] 재동기화 실패: {e}")
+
+    async def _heartbeat(self) -> None:
+        # Hyperliquid는 60초간 메시지가 없으면 연결을 끊으므로 주기적으로 ping 전송
+        while True:
+            await asyncio.sleep(settings.WS_PING_INTERVAL)
+            await self._send({"method": "ping"})
+
+    def _on_raw_message(self, raw: Any) -> None:
+        try:
+            message = loads(raw)
+        except ValueError:
+            return
+        self.dispatch(message)
+
+    def dispatch(self, message: Dict) -> None:
+        """
+        수신 메시지를 channel 핸들러로 분배 ({"channel": ..., "data": ...})
+        """
+        self.messages += 1
+        self.last_message_at = time.time()
+        channel = message.get("channel")
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(message.get("data"))
+            except Exception as e:
+                print(f"[ws_feed] {channel} 핸들러 오류: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "subscriptions": len(self._subscriptions),
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+            "last_message_age": (time.time() - self.last_message_at) if self.last_message_at else None,
+            "last_error": self.last_error,
+        }
+
+
+# 앱 전체에서 공유하는 Hyperliquid WebSocket 피드
+feed = HyperliquidWsFeed(settings.HYPERLIQUID_WS_URL)
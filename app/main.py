@@ -1,9 +1,55 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api import price
 from app.api import trading
+from app.api import system
+from app.config import settings
+from app.core import http_pool
+from app.core.cache import cache
+from app.core import market_data
+from app.core.orderbook import orderbooks
+from app.core.account_snapshot import accounts
+from app.core.order_pipeline import nonces
+from app.core.signer import signers
+from app.core.wallet_factory import wallet_pool
+from app.core.deposit_store import deposit_store
+from app.core.fill_store import fill_store
+from app.core.ctx_history import ctx_history
+from app.core import candles
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 업스트림 공용 HTTP 커넥션 풀 생성/종료
+    await http_pool.init_http_clients()
+    # 입금 주소까지 생성해 둔 지갑 풀 (WALLET_POOL_SIZE > 0)
+    await wallet_pool.start()
+    # WebSocket 시장 데이터 피드 (가격 조회를 인메모리 미러에서 처리)
+    if settings.MARKET_FEED_ENABLED:
+        await market_data.start_market_data()
+        await orderbooks.start()
+        await accounts.start()
+        await candles.start_candles()
+    # 자산 컨텍스트 시계열 기록 (CTX_HISTORY_ENABLED)
+    await ctx_history.start()
+    yield
+    await ctx_history.stop()
+    await wallet_pool.stop()
+    await candles.stop_candles()
+    await accounts.stop()
+    await orderbooks.stop()
+    await market_data.stop_market_data()
+    await http_pool.close_http_clients()
+    await cache.close()
+    await nonces.close()
+    signers.shutdown()
+    deposit_store.close()
+    fill_store.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # 라우터 등록
 app.include_router(price.router, prefix="/price")
-app.include_router(trading.router, prefix="/trading")
\ No newline at end of file
+app.include_router(trading.router, prefix="/trading")
+app.include_router(system.router, prefix="/system")
\ No newline at end of file
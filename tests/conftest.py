@@ -0,0 +1,42 @@
+import pytest
+from app.core.account_snapshot import accounts
+from app.core.cache import cache
+from app.core.candles import candle_store, candles
+from app.core.deposit_store import deposit_store
+from app.core.fill_store import fill_store, fill_sync
+from app.core.info_client import meta_and_asset_ctxs
+
+
+@pytest.fixture(autouse=True)
+def clear_upstream_cache():
+    """테스트 간 업스트림 응답 캐시가 공유되지 않도록 매 테스트마다 L1 비우기"""
+    cache.clear()
+    meta_and_asset_ctxs.invalidate()
+    accounts.clear()
+    yield
+    cache.clear()
+    meta_and_asset_ctxs.invalidate()
+    accounts.clear()
+
+
+# 테스트마다 임시 파일로 전환하는 SQLite 저장소: (저장소, 파일 이름, 저장소 상태를 들고 있는 엔진의 초기화 함수)
+ISOLATED_STORES = [
+    (deposit_store, "deposit_addresses.sqlite3", None),
+    (candle_store, "candles.sqlite3", candles.clear),
+    (fill_store, "fills.sqlite3", fill_sync.clear),
+]
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(tmp_path):
+    """SQLite 저장소는 테스트마다 임시 파일 사용, 저장소를 쓰는 엔진 상태(봉, 동기화 시각) 초기화"""
+    original_paths = [store.path for store, _, _ in ISOLATED_STORES]
+    for store, filename, reset in ISOLATED_STORES:
+        store.open(str(tmp_path / filename))
+        if reset is not None:
+            reset()
+    yield
+    for (store, _, reset), original_path in zip(ISOLATED_STORES, original_paths):
+        if reset is not None:
+            reset()
+        store.open(original_path)
@@ -0,0 +1,178 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.account_snapshot import AccountSnapshots, AccountStateError
+from app.core.cache import cache
+from app.core.ws_feed import HyperliquidWsFeed
+
+client = TestClient(app)
+
+ADDRESS = "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6"
+
+USER_STATE = {
+    "marginSummary": {"accountValue": "1000.0", "totalMarginUsed": "100.0"},
+    "withdrawable": "900.0",
+    "assetPositions": [
+        {"position": {"coin": "BTC", "szi": "0.5", "entryPx": "60000", "unrealizedPnl": "12.5"}},
+    ],
+}
+
+
+def mock_response(data, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = data
+    response.text = "error"
+    return response
+
+
+@patch("httpx.AsyncClient.post")
+def test_account_views_share_one_snapshot(mock_post):
+    """계정/포지션/잔고 조회가 clearinghouseState 1회 조회를 공유"""
+    mock_post.return_value = mock_response(USER_STATE)
+
+    account = client.get(f"/trading/account/{ADDRESS}")
+    positions = client.get(f"/trading/positions/{ADDRESS}")
+    balance = client.get(f"/trading/wallet_balance?address={ADDRESS}")
+
+    assert account.status_code == 200
+    assert account.json()["positions"][0]["symbol"] == "BTC"
+    assert positions.json()["positions"][0]["size"] == 0.5
+    assert balance.json()["balance"]["account_value"] == "1000.0"
+    mock_post.assert_called_once()
+    assert mock_post.call_args[1]["json"] == {"type": "clearinghouseState", "user": ADDRESS.lower()}
+
+
+def test_non_200_raises_account_state_error():
+    snapshots = AccountSnapshots(HyperliquidWsFeed("ws://unused"))
+    with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=mock_response({}, 429))):
+        with pytest.raises(AccountStateError) as exc:
+            asyncio.run(snapshots.get(ADDRESS))
+    assert exc.value.status_code == 429
+
+
+def test_web_data_push_updates_watched_snapshot():
+    """감시 주소는 webData2 푸시 스냅샷으로 업스트림 호출 없이 응답"""
+    feed = HyperliquidWsFeed("ws://unused")
+    snapshots = AccountSnapshots(feed)
+    feed.connected = True
+
+    async def scenario():
+        await snapshots.watch(ADDRESS)
+        feed.dispatch({"channel": "webData2", "data": {"user": ADDRESS, "clearinghouseState": USER_STATE}})
+        with patch("httpx.AsyncClient.post", new=AsyncMock()) as mock_post:
+            state = await snapshots.get(ADDRESS.lower())
+            assert mock_post.await_count == 0
+        return state
+
+    assert asyncio.run(scenario()) is USER_STATE
+    assert snapshots.stats()["push_hits"] == 1
+
+
+def test_web_data_push_ignored_for_unwatched_address():
+    feed = HyperliquidWsFeed("ws://unused")
+    snapshots = AccountSnapshots(feed)
+    feed.dispatch({"channel": "webData2", "data": {"user": ADDRESS, "clearinghouseState": USER_STATE}})
+    assert snapshots.stats()["pushed"] == 0
+
+
+def test_user_events_invalidate_snapshot():
+    """체결 등 userEvents 푸시가 오면 스냅샷을 무효화하고 다음 조회에서 새로 가져옴"""
+    feed = HyperliquidWsFeed("ws://unused")
+    snapshots = AccountSnapshots(feed)
+    updated = {**USER_STATE, "withdrawable": "500.0"}
+
+    async def scenario():
+        await snapshots.watch(ADDRESS)
+        with patch("httpx.AsyncClient.post", new=AsyncMock(side_effect=[mock_response(USER_STATE), mock_response(updated)])) as mock_post:
+            first = await snapshots.get(ADDRESS)
+            assert await snapshots.get(ADDRESS) is first
+            feed.dispatch({"channel": "user", "data": {"fills": [{"coin": "BTC"}]}})
+            await asyncio.sleep(0)
+            second = await snapshots.get(ADDRESS)
+            assert mock_post.await_count == 2
+        return second
+
+    assert asyncio.run(scenario())["withdrawable"] == "500.0"
+    cache.clear()
+
+
+OTHER = "0x" + "ab" * 20
+
+
+def test_user_events_invalidate_only_event_user():
+    """userEvents 푸시에 user가 있으면 그 주소만 무효화, 무효화 task는 보관했다가 stop에서 완료 대기"""
+    feed = HyperliquidWsFeed("ws://unused")
+    snapshots = AccountSnapshots(feed)
+    feed.connected = True
+
+    async def scenario():
+        await snapshots.watch(ADDRESS)
+        await snapshots.watch(OTHER)
+        for address in (ADDRESS, OTHER):
+            feed.dispatch({"channel": "webData2", "data": {"user": address, "clearinghouseState": USER_STATE}})
+        with patch.object(cache, "invalidate", new=AsyncMock()) as invalidate:
+            feed.dispatch({"channel": "user", "data": {"user": OTHER, "fills": [{"coin": "BTC"}]}})
+            assert len(snapshots._tasks) == 1
+            await snapshots.stop()
+        invalidate.assert_awaited_once_with("account:" + OTHER)
+        assert not snapshots._tasks
+        assert not snapshots.is_watched(ADDRESS) and not snapshots.is_watched(OTHER)
+
+    asyncio.run(scenario())
+    assert snapshots.stats()["invalidations"] == 1
+
+
+def test_portfolio_merges_positions_and_exposure():
+    """여러 주소를 한 번에 조회해 코인별 익스포저와 총 평가금액을 합산"""
+    other_state = {
+        "marginSummary": {"accountValue": "500.0"},
+        "withdrawable": "100.0",
+        "assetPositions": [
+            {"position": {"coin": "BTC", "szi": "-0.2", "entryPx": "61000", "positionValue": "12000"}},
+            {"position": {"coin": "ETH", "szi": "2", "entryPx": "3000", "positionValue": "6000"}},
+        ],
+    }
+    btc_state = {
+        **USER_STATE,
+        "assetPositions": [{"position": {"coin": "BTC", "szi": "0.5", "entryPx": "60000", "positionValue": "30000"}}],
+    }
+
+    async def post(url, json=None, **kwargs):
+        return mock_response(btc_state if json["user"] == ADDRESS.lower() else other_state)
+
+    with patch("httpx.AsyncClient.post", new=AsyncMock(side_effect=post)) as mock_post:
+        response = client.post("/trading/portfolio", json={"addresses": [ADDRESS, OTHER, ADDRESS]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 2
+    assert data["errors"] == 0
+    assert mock_post.await_count == 2
+    assert data["total_equity"] == 1500.0
+    assert data["exposure"]["BTC"]["net_size"] == pytest.approx(0.3)
+    assert data["exposure"]["BTC"]["net_notional"] == pytest.approx(18000.0)
+    assert data["exposure"]["ETH"]["long_size"] == 2.0
+
+
+def test_portfolio_reports_per_address_errors(monkeypatch):
+    monkeypatch.setattr("app.config.settings.PORTFOLIO_TIMEOUT", 0.5)
+
+    async def post(url, json=None, **kwargs):
+        if json["user"] == OTHER:
+            await asyncio.sleep(1)
+        return mock_response(USER_STATE)
+
+    with patch("httpx.AsyncClient.post", new=AsyncMock(side_effect=post)):
+        response = client.post("/trading/portfolio", json={"addresses": [ADDRESS, OTHER]})
+
+    data = response.json()
+    assert data["errors"] == 1
+    assert data["accounts"][0]["account_value"] == 1000.0
+    assert data["accounts"][1] == {"address": OTHER, "error": "Timed out after 0.5s"}
+
+
+def test_portfolio_requires_addresses():
+    assert client.post("/trading/portfolio", json={"addresses": []}).status_code == 400
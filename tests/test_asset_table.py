@@ -0,0 +1,74 @@
+import math
+import pytest
+from fastapi.testclient import TestClient
+from app.core.asset_table import AssetTable, asset_table, parse_conditions
+from app.main import app
+
+client = TestClient(app)
+
+SNAPSHOT = [
+    {"universe": [{"name": "BTC"}, {"name": "ETH"}, {"name": "SOL"}, {"name": "DOGE"}, {"name": "NEW"}]},
+    [
+        {"funding": "0.0000125", "markPx": "69000", "prevDayPx": "60000", "openInterest": "100", "dayNtlVlm": "2000000000"},
+        {"funding": "0.00003", "markPx": "3500", "prevDayPx": "3500", "openInterest": "1000", "dayNtlVlm": "900000000"},
+        {"funding": "-0.00001", "markPx": "150", "prevDayPx": "160", "openInterest": "5000", "dayNtlVlm": "300000000"},
+        {"funding": "0.0001", "markPx": "0.1", "prevDayPx": "0.1", "openInterest": "1", "dayNtlVlm": "1000"},
+        {"funding": "0.0002", "markPx": None, "prevDayPx": "0", "dayNtlVlm": None},
+    ],
+]
+
+
+def test_columns_are_float64_arrays():
+    table = AssetTable(SNAPSHOT)
+    assert table.columns["markPx"].dtype.name == "float64"
+    assert table.columns["funding"][2] == -0.00001
+    assert math.isnan(table.columns["markPx"][4])
+    assert table.columns["change24h"][0] == pytest.approx(0.15)
+    assert table.columns["openInterestNtl"][2] == 750000.0
+    assert asset_table(SNAPSHOT) is asset_table(SNAPSHOT)
+
+
+def test_query_filter_sort_top_n():
+    table = AssetTable(SNAPSHOT)
+    matched, results = table.query(parse_conditions("dayNtlVlm>100000"), "funding", True, 2, ["funding"])
+    assert matched == 3
+    assert results == [{"symbol": "ETH", "funding": 0.00003}, {"symbol": "BTC", "funding": 0.0000125}]
+
+    matched, results = table.query((), "markPx", False, None, ["markPx"])
+    assert matched == 4  # markPx가 없는 NEW는 제외
+    assert [item["symbol"] for item in results] == ["DOGE", "SOL", "ETH", "BTC"]
+
+    _, results = table.query(parse_conditions("funding>=0.0002"), None, True, None, ["markPx", "change24h"])
+    assert results == [{"symbol": "NEW", "markPx": None, "change24h": None}]
+
+
+def test_parse_conditions_rejects_bad_input():
+    assert parse_conditions("dayNtlVlm > 1e6, funding<=0") == [("dayNtlVlm", ">", 1e6), ("funding", "<=", 0.0)]
+    for where in ["volume>1", "funding>>1", "funding>abc"]:
+        with pytest.raises(ValueError):
+            parse_conditions(where)
+
+
+@pytest.fixture
+def fake_snapshot(monkeypatch):
+    class FakeSnapshot:
+        async def get(self):
+            return SNAPSHOT
+
+    monkeypatch.setattr("app.core.hyperevm_client.meta_and_asset_ctxs", FakeSnapshot())
+
+
+def test_query_endpoint(fake_snapshot):
+    response = client.get("/price/query", params={"where": "dayNtlVlm>500000000", "sort": "change24h", "limit": 5, "fields": "change24h,dayNtlVlm"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["matched"] == 2
+    assert [item["symbol"] for item in data["results"]] == ["BTC", "ETH"]
+    assert set(data["results"][0]) == {"symbol", "change24h", "dayNtlVlm"}
+
+
+def test_query_endpoint_errors(fake_snapshot):
+    assert client.get("/price/query", params={"sort": "nope"}).status_code == 400
+    assert client.get("/price/query", params={"where": "funding>x"}).status_code == 400
+    assert client.get("/price/query", params={"fields": "funding,nope"}).status_code == 400
+    assert client.get("/price/query", params={"order": "up"}).status_code == 422
@@ -0,0 +1,213 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from eth_account import Account
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.universe import Universe
+
+API_KEY = "test-trading-key"
+client = TestClient(app, headers={"X-API-Key": API_KEY})
+
+ACCOUNT = Account.create()
+
+
+@pytest.fixture(autouse=True)
+def trading_setup(monkeypatch):
+    monkeypatch.setattr("app.config.settings.HYPERLIQUID_API_PRIVATE", ACCOUNT.key.hex())
+    monkeypatch.setattr("app.config.settings.TRADING_API_KEY", API_KEY)
+    monkeypatch.setattr(
+        "app.core.universe._current",
+        Universe.from_meta({"universe": [{"name": "BTC", "szDecimals": 5}, {"name": "ETH", "szDecimals": 4}]}),
+    )
+
+
+def mock_response(data, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = data
+    return response
+
+
+def exchange_ok(statuses):
+    return mock_response({"status": "ok", "response": {"type": "order", "data": {"statuses": statuses}}})
+
+
+def test_bulk_orders_use_one_signed_action():
+    """N개 주문이 서명 1회, /exchange 요청 1회로 전송되고 결과가 요청 순서대로 매핑됨"""
+    orders = [
+        {"symbol": "BTC", "side": "buy", "size": 0.1, "price": 60000, "order_type": "limit"},
+        {"symbol": "DOGE", "side": "buy", "size": 10, "price": 0.1, "order_type": "limit"},
+        {"symbol": "ETH", "side": "sell", "size": 1, "price": 3000, "order_type": "limit", "time_in_force": "Alo"},
+    ]
+    with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=exchange_ok([
+        {"resting": {"oid": 11}},
+        {"error": "Insufficient margin"},
+    ]))) as mock_post:
+        response = client.post("/trading/orders/bulk", json={"orders": orders})
+
+    assert response.status_code == 200
+    mock_post.assert_awaited_once()
+    body = mock_post.call_args[1]["json"]
+    assert set(body["signature"]) == {"r", "s", "v"}
+    wires = body["action"]["orders"]
+    assert [wire["a"] for wire in wires] == [0, 1]
+    assert wires[1] == {"a": 1, "b": False, "p": "3000", "s": "1", "r": False, "t": {"limit": {"tif": "Alo"}}}
+
+    results = response.json()["orders"]
+    assert results[0]["order_id"] == 11 and results[0]["status"] == "resting"
+    assert results[1]["success"] is False and "DOGE" in results[1]["error"]
+    assert results[2] == {"symbol": "ETH", "side": "sell", "size": 1.0, "success": False, "status": "failed", "error": "Insufficient margin"}
+    assert response.json()["success"] is False
+
+
+def test_bulk_cancel_maps_statuses():
+    with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=exchange_ok(["success", {"error": "Order was never placed"}]))) as mock_post:
+        response = client.post("/trading/orders/cancel", json={"cancels": [
+            {"symbol": "BTC", "order_id": 1},
+            {"symbol": "ETH", "order_id": 2},
+        ]})
+
+    assert mock_post.call_args[1]["json"]["action"] == {"type": "cancel", "cancels": [{"a": 0, "o": 1}, {"a": 1, "o": 2}]}
+    cancels = response.json()["cancels"]
+    assert cancels[0]["status"] == "cancelled"
+    assert cancels[1]["error"] == "Order was never placed"
+
+
+def test_cancel_all_for_symbol():
+    """미체결 주문 조회 1회 + 해당 심볼 주문만 담은 cancel action 1회"""
+    open_orders = [
+        {"coin": "BTC", "oid": 1},
+        {"coin": "ETH", "oid": 2},
+        {"coin": "BTC", "oid": 3},
+    ]
+    with patch("httpx.AsyncClient.post", new=AsyncMock(side_effect=[
+        mock_response(open_orders),
+        exchange_ok(["success", "success"]),
+    ])) as mock_post:
+        response = client.post("/trading/orders/cancel_all", json={"symbol": "BTC"})
+
+    assert response.status_code == 200
+    assert mock_post.await_count == 2
+    assert mock_post.call_args[1]["json"]["action"]["cancels"] == [{"a": 0, "o": 1}, {"a": 0, "o": 3}]
+
+
+def test_bulk_orders_validation():
+    response = client.post("/trading/orders/bulk", json={"orders": [{"symbol": "BTC", "side": "long", "size": 1}]})
+    assert response.status_code == 400
+    assert client.post("/trading/orders/bulk", json={"orders": []}).status_code == 400
+
+
+def test_bulk_orders_require_trading_key(monkeypatch):
+    monkeypatch.setattr("app.config.settings.HYPERLIQUID_API_PRIVATE", "")
+    response = client.post("/trading/orders/cancel", json={"cancels": [{"symbol": "BTC", "order_id": 1}]})
+    assert response.status_code == 503
+
+
+def test_server_wallet_endpoints_require_api_key(monkeypatch):
+    """X-API-Key가 없거나 다르면 401, TRADING_API_KEY가 비어 있으면 서버 지갑 API 전체 비활성화(503)"""
+    routes = [
+        ("/trading/place_order", {"symbol": "BTC", "side": "buy", "size": 0.1, "price": 60000, "order_type": "limit"}),
+        ("/trading/orders/bulk", {"orders": [{"symbol": "BTC", "side": "buy", "size": 0.1, "price": 60000, "order_type": "limit"}]}),
+        ("/trading/orders/cancel", {"cancels": [{"symbol": "BTC", "order_id": 1}]}),
+        ("/trading/orders/cancel_all", {}),
+        ("/trading/close_position", {"symbol": "BTC", "address": ACCOUNT.address}),
+        ("/trading/close_all", {"address": ACCOUNT.address}),
+    ]
+    anonymous = TestClient(app)
+    wrong_key = TestClient(app, headers={"X-API-Key": "wrong"})
+    with patch("httpx.AsyncClient.post", new=AsyncMock()) as mock_post:
+        for path, body in routes:
+            assert anonymous.post(path, json=body).status_code == 401
+            assert wrong_key.post(path, json=body).status_code == 401
+        monkeypatch.setattr("app.config.settings.TRADING_API_KEY", "")
+        for path, body in routes:
+            assert client.post(path, json=body).status_code == 503
+    mock_post.assert_not_awaited()
+
+
+def test_place_order_uses_submission_pipeline():
+    """단건 주문 API도 일괄 주문과 같은 wire 변환/서명/제출 경로를 사용"""
+    with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=exchange_ok([{"resting": {"oid": 42}}]))) as mock_post:
+        response = client.post("/trading/place_order", json={
+            "symbol": "ETH", "side": "sell", "size": 1.23456, "price": 3000.123456, "order_type": "limit", "time_in_force": "Alo",
+        })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True and data["order_id"] == 42 and data["status"] == "resting"
+    body = mock_post.call_args[1]["json"]
+    assert body["action"]["orders"] == [{"a": 1, "b": False, "p": "3000.1", "s": "1.2346", "r": False, "t": {"limit": {"tif": "Alo"}}}]
+    assert set(body["signature"]) == {"r", "s", "v"}
+
+
+def test_order_wire_rounds_price_and_size():
+    """가격은 유효숫자 5자리/소수점 6-szDecimals자리, 수량은 szDecimals 자리로 반올림"""
+    orders = [
+        {"symbol": "BTC", "side": "buy", "size": 0.123456789, "price": 60123.456, "order_type": "limit"},
+        {"symbol": "ETH", "side": "sell", "size": 1.23456, "price": 3000.123456, "order_type": "limit"},
+        {"symbol": "ETH", "side": "sell", "size": 0.00001, "price": 3000, "order_type": "limit"},
+    ]
+    with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=exchange_ok([{"resting": {"oid": 1}}, {"resting": {"oid": 2}}]))) as mock_post:
+        response = client.post("/trading/orders/bulk", json={"orders": orders})
+
+    wires = mock_post.call_args[1]["json"]["action"]["orders"]
+    assert [(wire["p"], wire["s"]) for wire in wires] == [("60123", "0.12346"), ("3000.1", "1.2346")]
+    assert "rounds to zero" in response.json()["orders"][2]["error"]
+
+
+def test_market_order_uses_protective_price(monkeypatch):
+    """시장가 주문은 마크 가격 IOC가 아니라 오더북 기준 보호 지정가로 전송"""
+    from app.core.orderbook import OrderBook
+
+    book = OrderBook("ETH")
+    book.apply_snapshot([
+        [{"px": "2999", "sz": "10", "n": 1}],
+        [{"px": "3000", "sz": "0.5", "n": 1}, {"px": "3001", "sz": "10", "n": 1}],
+    ])
+    monkeypatch.setattr("app.core.orderbook.orderbooks.get_book", AsyncMock(return_value=book))
+    monkeypatch.setattr("app.config.settings.MARKET_ORDER_SLIPPAGE_BUFFER_BPS", 10)
+    with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=exchange_ok([{"filled": {"oid": 5}}]))) as mock_post:
+        client.post("/trading/orders/bulk", json={"orders": [{"symbol": "ETH", "side": "buy", "size": 1}]})
+
+    [wire] = mock_post.call_args[1]["json"]["action"]["orders"]
+    # 최악 체결가 3001 + 10bps = 3004.001 → 유효숫자 5자리
+    assert wire["p"] == "3004" and wire["t"] == {"limit": {"tif": "Ioc"}}
+
+
+def test_action_signature_matches_sdk():
+    """L1 action 서명이 SDK(sign_l1_action)의 EIP-712 phantom agent 서명과 같음"""
+    from hyperliquid.ccxt import hyperliquid as HyperliquidSdk
+    from app.core.signer import sign_l1_action
+
+    action = {"type": "order", "orders": [{"a": 0, "b": True, "p": "60000", "s": "0.1", "r": False, "t": {"limit": {"tif": "Gtc"}}}], "grouping": "na"}
+    nonce = 1760000000000
+    sdk = HyperliquidSdk({"privateKey": ACCOUNT.key.hex(), "walletAddress": ACCOUNT.address})
+    assert sign_l1_action(ACCOUNT.key.hex(), action, nonce) == sdk.sign_l1_action(action, nonce)
+
+
+def test_single_order_and_cancel_use_pipeline():
+    """단건 주문/취소도 같은 제출 파이프라인(L1 action 서명, 공유 nonce)으로 전송"""
+    from app.core.hyperliquid_client import cancel_order, place_order
+    from app.core.order_pipeline import pipeline
+
+    async def scenario():
+        with patch("httpx.AsyncClient.post", new=AsyncMock(side_effect=[
+            exchange_ok([{"resting": {"oid": 7}}]),
+            mock_response([{"coin": "ETH", "oid": 7}]),
+            exchange_ok(["success"]),
+        ])) as mock_post:
+            placed = await place_order(ACCOUNT.key.hex(), "ETH", "buy", 1, price=3000, order_type="limit")
+            cancelled = await cancel_order(ACCOUNT.key.hex(), "7")
+            return placed, cancelled, mock_post
+
+    submitted = pipeline.submitted
+    placed, cancelled, mock_post = asyncio.run(scenario())
+    assert placed["order_id"] == 7 and placed["status"] == "resting"
+    assert cancelled["status"] == "cancelled"
+    order_request = mock_post.call_args_list[0][1]["json"]
+    cancel_request = mock_post.call_args_list[2][1]["json"]
+    assert order_request["action"]["type"] == "order" and set(order_request["signature"]) == {"r", "s", "v"}
+    assert cancel_request["action"] == {"type": "cancel", "cancels": [{"a": 1, "o": 7}]}
+    assert cancel_request["nonce"] > order_request["nonce"]
+    assert pipeline.submitted == submitted + 2
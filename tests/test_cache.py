@@ -0,0 +1,230 @@
+import asyncio
+import time
+from typing import Dict, List
+from app.core.cache import CacheBackend, StaleWhileRevalidate, TwoLevelCache
+
+
+class FakeBackend(CacheBackend):
+    """Redis 대신 사용하는 테스트용 L2 백엔드"""
+
+    def __init__(self):
+        self.store: Dict[str, tuple] = {}
+        self.get_calls: List[List[str]] = []
+        self.fail = False
+
+    async def get_many(self, keys):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.get_calls.append(list(keys))
+        now = time.time()
+        result = []
+        for key in keys:
+            entry = self.store.get(key)
+            if entry is None or entry[0] < now:
+                result.append((None, None))
+            else:
+                result.append((entry[1], entry[0] - now))
+        return result
+
+    async def set_many(self, items, ttl):
+        if self.fail:
+            raise ConnectionError("redis down")
+        for key, value in items.items():
+            self.store[key] = (time.time() + ttl, value)
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+
+def test_fetch_once_then_l1_hit():
+    cache = TwoLevelCache(FakeBackend())
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return {"universe": [{"name": "BTC"}]}
+
+    async def run():
+        first = await cache.get_or_fetch("meta", 60, fetch)
+        second = await cache.get_or_fetch("meta", 60, fetch)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == {"universe": [{"name": "BTC"}]}
+    assert calls == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["l1_hits"] == 1
+
+
+def test_other_worker_reads_from_l2():
+    """같은 L2를 공유하는 다른 프로세스(워커)는 업스트림 호출 없이 L2에서 조회"""
+    backend = FakeBackend()
+    worker_a = TwoLevelCache(backend)
+    worker_b = TwoLevelCache(backend)
+
+    async def fetch():
+        return {"BTC": "100"}
+
+    async def fail_fetch():
+        raise AssertionError("upstream should not be called")
+
+    async def run():
+        await worker_a.get_or_fetch("allMids", 5, fetch)
+        return await worker_b.get_or_fetch("allMids", 5, fail_fetch)
+
+    assert asyncio.run(run()) == {"BTC": "100"}
+    assert worker_b.stats()["l2_hits"] == 1
+
+
+def test_get_many_uses_single_l2_round_trip():
+    backend = FakeBackend()
+    cache = TwoLevelCache(backend)
+
+    async def run():
+        await cache.set_many({"a": 1, "b": 2}, 5)
+        cache.clear()
+        return await cache.get_many(["a", "b", "c"])
+
+    assert asyncio.run(run()) == {"a": 1, "b": 2}
+    assert backend.get_calls == [["a", "b", "c"]]
+
+
+def test_expired_entry_is_refetched():
+    cache = TwoLevelCache()
+    values = iter([1, 2])
+
+    async def fetch():
+        return next(values)
+
+    async def run():
+        first = await cache.get_or_fetch("k", 0.01, fetch)
+        await asyncio.sleep(0.02)
+        second = await cache.get_or_fetch("k", 0.01, fetch)
+        return first, second
+
+    assert asyncio.run(run()) == (1, 2)
+
+
+def test_l2_failure_degrades_to_l1():
+    """L2 오류가 나도 업스트림 fetch 결과는 반환하고 L1에는 저장"""
+    backend = FakeBackend()
+    backend.fail = True
+    cache = TwoLevelCache(backend)
+
+    async def fetch():
+        return "value"
+
+    async def run():
+        first = await cache.get_or_fetch("k", 60, fetch)
+        second = await cache.get_or_fetch("k", 60, fetch)
+        return first, second
+
+    assert asyncio.run(run()) == ("value", "value")
+    assert cache.stats()["l2_errors"] == 1
+    assert cache.stats()["l1_hits"] == 1
+
+
+def test_swr_fresh_stale_and_expired():
+    """fresh 구간은 캐시 적중, stale 구간은 즉시 반환 + 백그라운드 갱신"""
+    values = iter(["v1", "v2", "v3"])
+
+    async def fetch():
+        return next(values)
+
+    swr = StaleWhileRevalidate("test", fetch, fresh_ttl=0.05, stale_ttl=10)
+
+    async def run():
+        first = await swr.get()          # miss → v1
+        fresh = await swr.get()          # fresh hit → v1
+        await asyncio.sleep(0.06)
+        stale = await swr.get()          # stale → v1 즉시 반환, 백그라운드로 v2 갱신
+        await asyncio.sleep(0.01)
+        refreshed = await swr.get()      # fresh → v2
+        return first, fresh, stale, refreshed
+
+    assert asyncio.run(run()) == ("v1", "v1", "v1", "v2")
+    stats = swr.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    assert stats["stale_hits"] == 1
+    assert stats["refreshes"] == 2
+
+
+def test_swr_expired_blocks_only_first_caller():
+    """만료 후 첫 호출자만 갱신을 기다리고, 동시 호출자는 기존 값 즉시 반환"""
+    fetches = 0
+
+    async def fetch():
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.02)
+        return fetches
+
+    swr = StaleWhileRevalidate("test", fetch, fresh_ttl=0.01, stale_ttl=0.01)
+
+    async def run():
+        await swr.get()
+        await asyncio.sleep(0.02)
+        first = asyncio.ensure_future(swr.get())
+        await asyncio.sleep(0)
+        second = await swr.get()
+        return await first, second
+
+    assert asyncio.run(run()) == (2, 1)
+    assert fetches == 2
+
+
+def test_swr_concurrent_cold_start_fetches_once():
+    fetches = 0
+
+    async def fetch():
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.01)
+        return "snapshot"
+
+    swr = StaleWhileRevalidate("test", fetch, fresh_ttl=1, stale_ttl=10)
+
+    async def run():
+        return await asyncio.gather(*(swr.get() for _ in range(20)))
+
+    assert asyncio.run(run()) == ["snapshot"] * 20
+    assert fetches == 1
+
+
+def test_backend_interface_is_abstract():
+    class Incomplete(CacheBackend):
+        async def get_many(self, keys):
+            return []
+
+    try:
+        Incomplete()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("abstract methods must be implemented")
+
+
+def test_l1_is_bounded_lru_and_sweeps_expired(monkeypatch):
+    """주소별 key처럼 다시 읽히지 않는 항목도 L1에 무한히 쌓이지 않음"""
+    cache = TwoLevelCache(max_entries=3)
+
+    async def run():
+        await cache.set("a", 1, 60)
+        await cache.set("b", 2, 60)
+        await cache.set("c", 3, 60)
+        assert await cache.get("a") == 1  # a를 최근 사용으로 갱신
+        await cache.set("d", 4, 60)
+        assert await cache.get("b") is None  # 가장 오래 쓰지 않은 b 제거
+        assert await cache.get("a") == 1
+        await cache.set("short", 5, 0.01)
+        await asyncio.sleep(0.02)
+        cache._next_sweep = 0.0
+        await cache.set("e", 6, 60)
+
+    asyncio.run(run())
+    assert "short" not in cache._l1
+    assert len(cache._l1) <= 3
+    assert cache.stats()["l1_evictions"] >= 1
+    assert cache.stats()["l1_expired"] == 1
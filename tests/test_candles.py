@@ -0,0 +1,185 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.core.candles import CandleEngine, CandleSeries, CandleStore, candles, parse_intervals
+from app.core.ws_feed import HyperliquidWsFeed
+from app.main import app
+
+client = TestClient(app)
+
+T0 = 1_700_000_040_000  # 분 경계
+
+
+def trade(px, sz, ts, tid, coin="BTC"):
+    return {"coin": coin, "side": "B", "px": str(px), "sz": str(sz), "time": ts, "tid": tid, "hash": "0x0"}
+
+
+def test_series_updates_and_rolls():
+    series = CandleSeries("BTC", "1m", capacity=3)
+    assert series.update(T0 + 1_000, 100.0, 1.0) is None
+    assert series.update(T0 + 2_000, 105.0, 0.5) is None
+    assert series.update(T0 + 3_000, 98.0, 2.0) is None
+    assert series.update(T0 + 4_000, 101.0, 1.0) is None
+    closed = series.update(T0 + 60_000, 102.0, 1.0)
+    assert closed == (T0, 100.0, 105.0, 98.0, 101.0, 4.5, 4)
+    # 늦게 도착한 체결은 반영하지 않음
+    assert series.update(T0 + 5_000, 1.0, 1.0) is None
+    assert series.late == 1
+    # 체결이 없던 구간은 건너뛰고, 용량을 넘으면 가장 오래된 봉부터 덮어씀
+    series.update(T0 + 180_000, 103.0, 1.0)
+    series.update(T0 + 240_000, 104.0, 1.0)
+    assert [bar[0] for bar in series.bars()] == [T0 + 60_000, T0 + 180_000, T0 + 240_000]
+    assert [bar[0] for bar in series.bars(limit=2)] == [T0 + 180_000, T0 + 240_000]
+    assert [bar[0] for bar in series.bars(start=T0 + 100_000, end=T0 + 200_000)] == [T0 + 180_000]
+    assert series.oldest() == T0 + 60_000
+
+
+def test_parse_intervals():
+    assert parse_intervals("1s, 1m,5m") == ("1s", "1m", "5m")
+    with pytest.raises(ValueError):
+        parse_intervals("1m,2m")
+
+
+def test_engine_aggregates_trades_and_persists(tmp_path):
+    ws_feed = HyperliquidWsFeed("ws://test")
+    store = CandleStore(str(tmp_path / "candles.sqlite3"))
+    engine = CandleEngine(ws_feed, store, ("1s", "1m"), capacity=2)
+
+    async def scenario():
+        await engine.track("BTC")
+        assert ws_feed.is_subscribed({"type": "trades", "coin": "BTC"})
+        ws_feed.dispatch({"channel": "trades", "data": [trade(100, 1, T0, 1), trade(101, 1, T0 + 500, 2), trade(1, 1, T0, 1, coin="ETH")]})
+        # 재연결 스냅샷의 중복 체결은 제외
+        ws_feed.dispatch({"channel": "trades", "data": [trade(101, 1, T0 + 500, 2), trade(102, 2, T0 + 1_000, 3)]})
+        ws_feed.dispatch({"channel": "trades", "data": [trade(103, 1, T0 + 2_000, 4), trade(99, 1, T0 + 60_000, 5)]})
+        await engine.flush()
+
+    asyncio.run(scenario())
+    assert store.resume_point("BTC") == (T0 + 60_000, frozenset({5}))
+    assert engine.trades == 5
+    assert engine.duplicates == 1
+    assert engine.closed_bars == 4  # 1s 봉 3개 + 1m 봉 1개
+
+    minute = asyncio.run(engine.candles("BTC", "1m"))
+    assert [(bar["t"], bar["o"], bar["h"], bar["l"], bar["c"], bar["v"], bar["n"]) for bar in minute] == [
+        (T0, 100.0, 103.0, 100.0, 103.0, 5.0, 4),
+        (T0 + 60_000, 99.0, 99.0, 99.0, 99.0, 1.0, 1),
+    ]
+    assert minute[0]["T"] == T0 + 59_999 and minute[0]["s"] == "BTC" and minute[0]["i"] == "1m"
+
+    # 메모리(용량 2)에 없는 앞 구간은 저장소에서 조회
+    seconds = asyncio.run(engine.candles("BTC", "1s"))
+    assert [bar["t"] for bar in seconds] == [T0, T0 + 1_000, T0 + 2_000, T0 + 60_000]
+    assert [bar["t"] for bar in asyncio.run(engine.candles("BTC", "1s", limit=3))] == [T0 + 1_000, T0 + 2_000, T0 + 60_000]
+    with pytest.raises(ValueError):
+        asyncio.run(engine.candles("BTC", "1d"))
+    store.close()
+
+
+def test_candles_endpoint(monkeypatch):
+    async def fake_is_valid_symbol(symbol):
+        return symbol == "BTC"
+
+    monkeypatch.setattr("app.api.price.is_valid_symbol", fake_is_valid_symbol)
+    response = client.get("/price/candles/BTC", params={"interval": "1m"})
+    assert response.status_code == 200
+    assert response.json() == {"symbol": "BTC", "interval": "1m", "count": 0, "candles": []}
+    assert candles.is_tracked("BTC")
+
+    candles.feed.dispatch({"channel": "trades", "data": [trade(100, 1, T0, 1), trade(101, 2, T0 + 1_000, 2)]})
+    data = client.get("/price/candles/BTC", params={"interval": "1m", "start": T0}).json()
+    assert data["count"] == 1
+    assert data["candles"][0]["c"] == 101.0 and data["candles"][0]["v"] == 3.0
+
+    assert client.get("/price/candles/BTC", params={"interval": "7m"}).status_code == 400
+    assert client.get("/price/candles/NOTREAL").status_code == 404
+
+
+def test_restart_merges_open_bar_without_double_counting(tmp_path):
+    """종료 시 저장한 진행 중 봉과 재시작 후 같은 봉을 합치고, 재연결 스냅샷의 이미 집계한 체결은 제외"""
+    store = CandleStore(str(tmp_path / "candles.sqlite3"))
+
+    async def run_process(trades):
+        ws_feed = HyperliquidWsFeed("ws://test")
+        engine = CandleEngine(ws_feed, store, ("1m",), capacity=10)
+        await engine.track("BTC")
+        ws_feed.dispatch({"channel": "trades", "data": trades})
+        await engine.stop()
+        return engine
+
+    asyncio.run(run_process([trade(100, 1, T0, 1), trade(110, 1, T0 + 10_000, 2)]))
+    # 재시작 후 스냅샷(tid 1, 2)은 다시 받지만 집계하지 않음
+    restarted = asyncio.run(run_process([
+        trade(100, 1, T0, 1), trade(110, 1, T0 + 10_000, 2),
+        trade(90, 2, T0 + 20_000, 3), trade(95, 1, T0 + 30_000, 4),
+    ]))
+    assert restarted.duplicates == 2
+    [bar] = store.bars("BTC", "1m", 0, 2 ** 62, 10)
+    assert bar == (T0, 100.0, 110.0, 90.0, 95.0, 5.0, 4)
+    store.close()
+
+
+def test_restart_keeps_same_millisecond_trades_and_serves_stored_partial(tmp_path):
+    """
+    재시작 후 저장된 마지막 체결과 같은 ms의 다른 체결(tid)은 집계하고,
+    새 체결이 오기 전에도 저장된 진행 중 봉을 조회 결과에 포함
+    """
+    store = CandleStore(str(tmp_path / "candles.sqlite3"))
+
+    async def first_process():
+        ws_feed = HyperliquidWsFeed("ws://test")
+        engine = CandleEngine(ws_feed, store, ("1m",), capacity=10)
+        await engine.track("BTC")
+        ws_feed.dispatch({"channel": "trades", "data": [trade(100, 1, T0, 1), trade(110, 1, T0 + 10_000, 2)]})
+        await engine.stop()
+
+    async def second_process():
+        ws_feed = HyperliquidWsFeed("ws://test")
+        engine = CandleEngine(ws_feed, store, ("1m",), capacity=10)
+        await engine.track("BTC")
+        before = await engine.candles("BTC", "1m")
+        # 스냅샷의 tid 2는 이미 집계, 같은 ms의 tid 7은 새 체결
+        ws_feed.dispatch({"channel": "trades", "data": [trade(110, 1, T0 + 10_000, 2), trade(120, 3, T0 + 10_000, 7)]})
+        live = await engine.candles("BTC", "1m")
+        await engine.stop()
+        return engine, before, live
+
+    asyncio.run(first_process())
+    engine, before, live = asyncio.run(second_process())
+    assert engine.duplicates == 1
+    assert [(bar["t"], bar["v"], bar["n"]) for bar in before] == [(T0, 2.0, 2)]
+    assert [(bar["h"], bar["c"], bar["v"], bar["n"]) for bar in live] == [(120.0, 120.0, 5.0, 3)]
+    assert store.bars("BTC", "1m", 0, 2 ** 62, 10) == [(T0, 100.0, 120.0, 100.0, 120.0, 5.0, 3)]
+    assert store.resume_point("BTC") == (T0 + 10_000, frozenset({2, 7}))
+    store.close()
+
+
+def test_idle_coins_are_unsubscribed(tmp_path, monkeypatch):
+    """CANDLE_COINS 외 코인은 조회가 없으면 진행 중인 봉을 저장하고 구독 해제"""
+    ws_feed = HyperliquidWsFeed("ws://test")
+    store = CandleStore(str(tmp_path / "candles.sqlite3"))
+    engine = CandleEngine(ws_feed, store, ("1m",), capacity=10)
+    monkeypatch.setattr("app.config.settings.CANDLE_IDLE_SECONDS", 60.0)
+    now = {"t": 1000.0}
+    monkeypatch.setattr("app.core.candles.time.time", lambda: now["t"])
+
+    async def scenario():
+        await engine.track("BTC", pinned=True)
+        await engine.track("ETH")
+        ws_feed.dispatch({"channel": "trades", "data": [trade(3000, 1, T0, 1, coin="ETH")]})
+        now["t"] += 30
+        await engine.candles("ETH", "1m")
+        now["t"] += 45
+        await engine.evict_idle()
+        assert engine.is_tracked("ETH")
+        now["t"] += 61
+        await engine.evict_idle()
+        await engine.flush()
+
+    asyncio.run(scenario())
+    assert not engine.is_tracked("ETH")
+    assert not ws_feed.is_subscribed({"type": "trades", "coin": "ETH"})
+    assert engine.is_tracked("BTC") and ws_feed.is_subscribed({"type": "trades", "coin": "BTC"})
+    assert engine.stats()["evictions"] == 1
+    assert store.bars("ETH", "1m", 0, 2 ** 62, 10) == [(T0, 3000.0, 3000.0, 3000.0, 3000.0, 1.0, 1)]
+    store.close()
@@ -0,0 +1,167 @@
+import asyncio
+from unittest.mock import AsyncMock
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import hyperliquid_sdk_client
+from app.core.orderbook import OrderBook
+
+API_KEY = "test-trading-key"
+client = TestClient(app, headers={"X-API-Key": API_KEY})
+
+POSITIONS = [
+    {"symbol": "BTC/USDC:USDC", "side": "long", "contracts": 0.4},
+    {"symbol": "ETH/USDC:USDC", "side": "short", "contracts": 2.0},
+    {"symbol": "BTC/USDC:USDC", "side": "short", "contracts": 0.1},
+]
+
+
+WALLET = "0xAbC0000000000000000000000000000000000001"
+
+
+@pytest.fixture(autouse=True)
+def trading_api_key(monkeypatch):
+    monkeypatch.setattr("app.config.settings.TRADING_API_KEY", API_KEY)
+
+
+@pytest.fixture
+def sdk(monkeypatch):
+    """SDK 클라이언트 호출, 오더북(기본은 빈 오더북 → 마크 가격 폴백), 마크 가격 조회를 모킹하고 _create_orders 호출을 기록"""
+    state = {"calls": [], "books": {}, "statuses": {}}
+
+    async def create_orders(orders, params=None):
+        state["calls"].append(orders)
+        return [
+            {"id": f"{order['symbol']}-{order['side']}", "info": state["statuses"].get(order["symbol"], {"filled": {"oid": 1}}), "price": order["price"], "params": order["params"]}
+            for order in orders
+        ]
+
+    async def get_book(symbol):
+        return state["books"].get(symbol, OrderBook(symbol))
+
+    mark_price = AsyncMock(side_effect=lambda symbol: {"BTC": 60000.0, "ETH": 3000.0}[symbol])
+    monkeypatch.setattr("app.config.settings.HYPERLIQUID_API_ADDRESS", WALLET)
+    monkeypatch.setattr(hyperliquid_sdk_client.client, "fetch_positions", AsyncMock(return_value=POSITIONS), raising=False)
+    monkeypatch.setattr(hyperliquid_sdk_client, "_create_orders", create_orders)
+    monkeypatch.setattr(hyperliquid_sdk_client, "get_mark_price", mark_price)
+    monkeypatch.setattr(hyperliquid_sdk_client.orderbooks, "get_book", get_book)
+    state["mark_price"] = mark_price
+    return state
+
+
+def test_close_position_resolves_price_once(sdk):
+    result = asyncio.run(hyperliquid_sdk_client.close_position_real(WALLET.lower(), "BTC"))
+    assert result["success"] is True
+    assert [order["side"] for order in result["orders"]] == ["sell", "buy"]
+    assert result["total_closed_size"] == pytest.approx(0.5)
+    sdk["mark_price"].assert_awaited_once_with("BTC")
+    # 청산 주문 전체가 _create_orders 1회 (order action 1개, nonce 1개)
+    [orders] = sdk["calls"]
+    assert [order["type"] for order in orders] == ["market", "market"]
+    assert all(order["params"] == {"reduceOnly": True} for order in orders)
+    assert all(order["api_response"]["price"] == 60000.0 for order in result["orders"])
+
+
+def test_market_orders_use_orderbook_protective_price(sdk, monkeypatch):
+    """오더북이 있으면 마크 가격 대신 누적 호가 기준 보호 지정가 + SDK 슬리피지 0"""
+    monkeypatch.setattr("app.core.orderbook.settings.MARKET_ORDER_SLIPPAGE_BUFFER_BPS", 0.0)
+    book = OrderBook("BTC")
+    book.apply_snapshot([
+        [{"px": "59990", "sz": "0.2", "n": 1}, {"px": "59980", "sz": "1", "n": 1}],
+        [{"px": "60010", "sz": "0.05", "n": 1}, {"px": "60020", "sz": "1", "n": 1}],
+    ])
+    sdk["books"]["BTC"] = book
+    result = asyncio.run(hyperliquid_sdk_client.close_position_real(WALLET, "BTC"))
+    sell, buy = (order["api_response"] for order in result["orders"])
+    assert (sell["price"], buy["price"]) == (59980.0, 60020.0)
+    assert sell["params"] == {"reduceOnly": True, "slippage": "0"}
+    sdk["mark_price"].assert_not_awaited()
+    resp = asyncio.run(hyperliquid_sdk_client.place_long("BTC", 0.01))
+    assert resp["price"] == 60010.0 and resp["params"] == {"slippage": "0"}
+    assert sdk["calls"][-1][0]["type"] == "market" and sdk["calls"][-1][0]["side"] == "buy"
+
+
+def test_limit_close_uses_requested_price(sdk):
+    result = asyncio.run(hyperliquid_sdk_client.close_position_real(WALLET, "ETH", price=3100.0, order_type="limit"))
+    [orders] = sdk["calls"]
+    assert orders == [{"symbol": "ETH/USDC:USDC", "type": "limit", "side": "buy", "amount": 2.0, "price": 3100.0, "params": {"reduceOnly": True}}]
+    sdk["mark_price"].assert_not_awaited()
+    assert result["success"] is True
+
+
+def test_close_all_endpoint_flattens_every_position(sdk):
+    """전체 청산: 포지션 조회 1회, 마켓별 가격 1회, 주문은 action 1개"""
+    response = client.post("/trading/close_all", json={"address": WALLET, "ratio": 0.5})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "filled"
+    assert len(data["orders"]) == 3
+    assert data["total_closed_size"] == pytest.approx(1.25)
+    assert sdk["mark_price"].await_count == 2
+    assert len(sdk["calls"]) == 1 and len(sdk["calls"][0]) == 3
+    assert data["orders"][1]["api_response"]["price"] == 3000.0
+
+
+def test_close_all_reports_failed_orders(sdk):
+    sdk["statuses"]["ETH/USDC:USDC"] = {"error": "rejected"}
+    data = client.post("/trading/close_all", json={"address": WALLET}).json()
+    assert data["success"] is False
+    assert data["orders"][0]["status"] == "filled"
+    assert data["orders"][1]["status"] == "failed"
+    assert data["orders"][1]["error"] == "rejected"
+
+
+def test_close_all_marks_every_order_failed_when_action_rejected(sdk, monkeypatch):
+    monkeypatch.setattr(hyperliquid_sdk_client, "_create_orders", AsyncMock(side_effect=Exception("Insufficient margin")))
+    data = client.post("/trading/close_all", json={"address": WALLET}).json()
+    assert [order["status"] for order in data["orders"]] == ["failed"] * 3
+
+
+def test_close_rejects_other_addresses(sdk):
+    """SDK 지갑이 아닌 주소의 포지션으로 SDK 지갑 주문을 내지 않음"""
+    other = "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6"
+    assert client.post("/trading/close_all", json={"address": other}).status_code == 403
+    assert client.post("/trading/close_position", json={"address": other, "symbol": "BTC"}).status_code == 403
+    assert sdk["calls"] == []
+    hyperliquid_sdk_client.client.fetch_positions.assert_not_awaited()
+
+
+def test_close_all_without_positions(sdk, monkeypatch):
+    monkeypatch.setattr(hyperliquid_sdk_client.client, "fetch_positions", AsyncMock(return_value=[]), raising=False)
+    data = client.post("/trading/close_all", json={"address": WALLET}).json()
+    assert data["status"] == "no_positions"
+
+
+def test_close_all_validates_ratio():
+    assert client.post("/trading/close_all", json={"address": WALLET, "ratio": 1.5}).status_code == 400
+
+
+def test_sdk_orders_are_signed_with_pipeline_nonces(monkeypatch):
+    """SDK 주문 요청의 nonce는 SDK 자체 ms 시각이 아닌 NonceManager 발급값 (같은 서명 지갑의 직접 제출과 공유)"""
+    from eth_account import Account
+    from app.core.order_pipeline import nonces
+
+    account = Account.create()
+    requests = []
+
+    def create_orders_request(orders, params=None):
+        requests.append({"nonce": hyperliquid_sdk_client.client.milliseconds()})
+        return requests[-1]
+
+    post = AsyncMock(return_value={"status": "ok", "response": {"type": "order", "data": {"statuses": [{"filled": {"oid": 1}}]}}})
+    monkeypatch.setattr(hyperliquid_sdk_client.client, "privateKey", account.key.hex(), raising=False)
+    monkeypatch.setattr(hyperliquid_sdk_client.client, "load_markets", AsyncMock(), raising=False)
+    monkeypatch.setattr(hyperliquid_sdk_client.client, "create_orders_request", create_orders_request, raising=False)
+    monkeypatch.setattr(hyperliquid_sdk_client.client, "privatePostExchange", post, raising=False)
+    monkeypatch.setattr(hyperliquid_sdk_client.client, "parse_orders", lambda statuses, market=None: statuses, raising=False)
+    ahead = nonces.next_local(account.address) + 1_000_000
+    monkeypatch.setitem(nonces._last, account.address.lower(), ahead)
+
+    first = asyncio.run(hyperliquid_sdk_client._create_orders([{"symbol": "BTC/USDC:USDC"}]))
+    asyncio.run(hyperliquid_sdk_client._create_orders([{"symbol": "BTC/USDC:USDC"}]))
+
+    assert first == [{"filled": {"oid": 1}}]
+    assert [request["nonce"] for request in requests] == [ahead + 1, ahead + 2]
+    assert post.await_args_list[0].args[0] is requests[0]
+    # 발급 구간 밖에서는 SDK 원래 시각 함수로 복원
+    assert "milliseconds" not in vars(hyperliquid_sdk_client.client)
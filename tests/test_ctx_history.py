@@ -0,0 +1,89 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.asset_table import AssetTable
+from app.core.ctx_history import CtxHistory, ctx_history
+from app.main import app
+
+client = TestClient(app)
+
+
+def snapshot(btc_funding, eth_funding=None, btc_px="69000"):
+    universe = [{"name": "BTC"}]
+    ctxs = [{"funding": btc_funding, "markPx": btc_px, "openInterest": "100"}]
+    if eth_funding is not None:
+        universe.append({"name": "ETH"})
+        ctxs.append({"funding": eth_funding, "markPx": "3500", "openInterest": "10"})
+    return [{"universe": universe}, ctxs]
+
+
+def test_append_and_range_query(tmp_path):
+    history = CtxHistory(str(tmp_path), capacity=8, max_assets=4)
+    history.open()
+    for i in range(5):
+        history.append(AssetTable(snapshot(str(i / 1000), str(i))), ts=1000.0 + i * 10)
+
+    result = history.query("BTC", ["funding", "markPx"], start=1010, end=1030)
+    assert result["time"] == [1010.0, 1020.0, 1030.0]
+    assert result["series"]["funding"] == [0.001, 0.002, 0.003]
+    assert result["series"]["markPx"] == [69000.0] * 3
+    assert history.query("ETH", ["funding"])["series"]["funding"] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert history.query("DOGE") is None
+    with pytest.raises(ValueError):
+        history.query("BTC", ["volume"])
+    history.close()
+
+
+def test_ring_wraps_and_survives_reopen(tmp_path):
+    history = CtxHistory(str(tmp_path), capacity=4, max_assets=4)
+    history.open()
+    for i in range(6):
+        history.append(AssetTable(snapshot(str(i))), ts=100.0 + i)
+    history.close()
+
+    reopened = CtxHistory(str(tmp_path), capacity=4, max_assets=4)
+    reopened.open()
+    assert reopened.count == 4
+    assert reopened.query("BTC", ["funding"])["series"]["funding"] == [2.0, 3.0, 4.0, 5.0]
+    # 새로 추가된 심볼은 이전 시점에 값이 없음 (0이 아닌 NaN/범위 제외)
+    reopened.append(AssetTable(snapshot("6", "60")), ts=106.0)
+    assert reopened.query("ETH", ["funding"]) == {"time": [106.0], "series": {"funding": [60.0]}}
+    assert reopened.query("BTC", ["funding"])["time"] == [103.0, 104.0, 105.0, 106.0]
+    reopened.close()
+
+    # 레이아웃이 바뀌면 새로 생성
+    resized = CtxHistory(str(tmp_path), capacity=8, max_assets=4)
+    resized.open()
+    assert resized.count == 0 and resized.query("BTC") is None
+    resized.close()
+
+
+def test_downsampling(tmp_path):
+    history = CtxHistory(str(tmp_path), capacity=16, max_assets=2)
+    history.open()
+    for i in range(6):
+        history.append(AssetTable(snapshot(str(i), btc_px=str(100 + i))), ts=60.0 + i * 20)
+    last = history.query("BTC", ["funding"], step=60)
+    assert last["time"] == [60.0, 120.0]
+    assert last["series"]["funding"] == [2.0, 5.0]
+    mean = history.query("BTC", ["markPx"], step=60, agg="mean")
+    assert mean["series"]["markPx"] == [101.0, 104.0]
+    history.close()
+
+
+def test_history_endpoint(tmp_path, monkeypatch):
+    assert client.get("/price/history/BTC").status_code == 503
+
+    history = CtxHistory(str(tmp_path), capacity=8, max_assets=4)
+    history.open()
+    history.append(AssetTable(snapshot("0.0001")), ts=1000.0)
+    history.append(AssetTable(snapshot("0.0002")), ts=1010.0)
+    monkeypatch.setattr("app.api.price.ctx_history", history)
+
+    response = client.get("/price/history/BTC", params={"fields": "funding", "start": 0, "end": 2_000_000})
+    assert response.status_code == 200
+    assert response.json() == {"symbol": "BTC", "count": 2, "time": [1000000, 1010000], "series": {"funding": [0.0001, 0.0002]}}
+    assert client.get("/price/history/ETH", params={"start": 0}).status_code == 404
+    assert client.get("/price/history/BTC", params={"fields": "nope", "start": 0}).status_code == 400
+    assert client.get("/price/history/BTC", params={"agg": "max", "start": 0}).status_code == 400
+    history.close()
+    assert not ctx_history.is_open
@@ -0,0 +1,52 @@
+import httpx
+from app.core import decoding
+from app.core.decoding import decode_response, dumps, loads
+from app.core.universe import Universe, asset_ctxs_view
+
+META = {"universe": [{"name": "BTC"}, {"name": "ETH"}, {"name": "SOL"}]}
+SNAPSHOT = [META, [
+    {"markPx": "69000", "funding": "0.0000125", "impactPxs": ["68999", "69001"]},
+    {"markPx": "3500", "funding": "0.00001"},
+    {"markPx": "150", "funding": "0"},
+]]
+
+
+def test_roundtrip_matches_stdlib():
+    value = {"coin": "BTC", "levels": [[{"px": "69000.5", "sz": "1.2", "n": 3}]], "한글": None}
+    assert loads(dumps(value)) == value
+    assert loads(dumps(value).decode()) == value
+
+
+def test_stdlib_fallback(monkeypatch):
+    monkeypatch.setattr(decoding, "orjson", None)
+    assert dumps({"a": [1, 2]}) == b'{"a":[1,2]}'
+    assert loads(b'{"a":[1,2]}') == {"a": [1, 2]}
+
+
+def test_decode_response_reads_bytes_body():
+    response = httpx.Response(200, content=b'[{"universe":[]},[]]')
+    assert decode_response(response) == [{"universe": []}, []]
+
+
+def test_asset_ctxs_view_formats_only_requested(monkeypatch):
+    """요청한 심볼만 변환하고, 같은 스냅샷이면 뷰/변환 결과를 재사용"""
+    monkeypatch.setattr("app.core.universe._current", Universe.from_meta(META))
+    formatted = []
+    original = decoding.format_asset_ctx
+
+    def counting_format(symbol, ctx):
+        formatted.append(symbol)
+        return original(symbol, ctx)
+
+    monkeypatch.setattr("app.core.universe.format_asset_ctx", counting_format)
+    view = asset_ctxs_view(SNAPSHOT)
+    assert view.asset_ctx("ETH")["markPx"] == 3500.0
+    assert asset_ctxs_view(SNAPSHOT) is view
+    assert view.asset_ctx("ETH") is view.asset_ctx("ETH")
+    assert view.mark_price("SOL") == 150.0
+    assert view.asset_ctx("NOTREAL") is None
+    assert formatted == ["ETH"]
+
+    assert [ctx["symbol"] for ctx in view.all_asset_ctxs()] == ["BTC", "ETH", "SOL"]
+    assert formatted == ["ETH", "BTC", "SOL"]
+    assert asset_ctxs_view([META, SNAPSHOT[1]]) is not view
@@ -0,0 +1,80 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from app.core import wallet_factory
+from app.core.deposit_store import DepositStore, deposit_store
+from app.core.hyperunit_client import VerificationResult
+from app.main import app
+
+client = TestClient(app)
+
+DESTINATION = "0x1234567890ABCDEF1234567890ABCDEF12345678"
+
+
+def deposit_response(url, **kwargs):
+    response = MagicMock()
+    response.json.return_value = {"address": f"0xDeposit{url.split('/')[-2]}", "signatures": {}, "status": "OK"}
+    return response
+
+
+def test_store_roundtrip_and_reverse_lookup(tmp_path):
+    store = DepositStore(str(tmp_path / "nested" / "store.sqlite3"))
+    store.put(DESTINATION, "ethereum", "eth", {"address": "0xABCDEF", "signatures": {"hl-node": "sig"}})
+
+    entry = store.get(DESTINATION.lower(), "ethereum", "eth")
+    assert entry["response"] == {"address": "0xABCDEF", "signatures": {"hl-node": "sig"}}
+    assert entry["verified"] is None
+    assert store.get(DESTINATION, "solana", "sol") is None
+
+    owner = store.lookup_deposit("0xabcdef")
+    assert owner["destination_address"] == DESTINATION.lower()
+    assert owner["asset"] == "eth"
+
+    store.set_verification(DESTINATION, "ethereum", "eth", True, 3)
+    store.close()
+    reopened = DepositStore(store.path)
+    assert reopened.get(DESTINATION, "ethereum", "eth")["verified_count"] == 3
+    assert set(reopened.list_for(DESTINATION)) == {"eth"}
+    reopened.close()
+
+
+def test_generate_deposit_address_uses_store(monkeypatch):
+    """같은 (주소, 자산)은 한 번만 업스트림에 요청"""
+    monkeypatch.setattr("app.config.settings.HYPERUNIT_VERIFY_SIGNATURES", False)
+    with patch("httpx.AsyncClient.get", side_effect=deposit_response) as mock_get:
+        first = asyncio.run(wallet_factory.get_deposit_addresses(DESTINATION))
+        second = asyncio.run(wallet_factory.get_deposit_addresses(DESTINATION))
+    assert mock_get.call_count == 2
+    assert first == second
+    assert deposit_store.lookup_deposit(first["SOL"]["address"])["source_chain"] == "solana"
+
+
+def test_verified_addresses_are_not_reverified(monkeypatch):
+    monkeypatch.setattr("app.config.settings.HYPERUNIT_VERIFY_SIGNATURES", True)
+    calls = []
+
+    async def verify(items, nodes=None):
+        calls.append(len(items))
+        return [VerificationResult(success=True, verified_count=3) for _ in items]
+
+    monkeypatch.setattr(wallet_factory, "verify_deposit_addresses", verify)
+    with patch("httpx.AsyncClient.get", side_effect=deposit_response):
+        asyncio.run(wallet_factory.get_deposit_addresses(DESTINATION))
+        asyncio.run(wallet_factory.get_deposit_addresses(DESTINATION))
+    assert calls == [2, 0]
+    assert deposit_store.get(DESTINATION, "ethereum", "eth")["verified"] is True
+
+
+def test_deposit_endpoints(monkeypatch):
+    monkeypatch.setattr("app.config.settings.HYPERUNIT_VERIFY_SIGNATURES", False)
+    with patch("httpx.AsyncClient.get", side_effect=deposit_response):
+        response = client.get(f"/trading/deposit_addresses/{DESTINATION}")
+    assert response.status_code == 200
+    eth_address = response.json()["deposit_address"]["ETH"]["address"]
+
+    response = client.get(f"/trading/deposit_owner/{eth_address}")
+    assert response.status_code == 200
+    assert response.json()["destination_address"] == DESTINATION.lower()
+    assert response.json()["source_chain"] == "ethereum"
+
+    assert client.get("/trading/deposit_owner/0xunknown").status_code == 404
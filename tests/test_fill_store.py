@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import fill_store as fill_store_module
+from app.core.fill_store import fill_store, fill_sync
+
+client = TestClient(app)
+
+ADDRESS = "0xAbC0000000000000000000000000000000000001"
+
+
+def make_fill(t, tid, coin="BTC", side="B"):
+    return {
+        "coin": coin, "px": "60000.0", "sz": "0.1", "side": side, "time": t,
+        "startPosition": "0.0", "dir": "Open Long", "closedPnl": "0.0",
+        "hash": f"0x{tid:064x}", "oid": 1000 + tid, "crossed": True, "fee": "1.2", "tid": tid, "feeToken": "USDC",
+    }
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """userFillsByTime 모킹: startTime 이후 체결을 시간순으로 최대 3개 반환 (페이지 크기 3으로 축소)"""
+    state = {"fills": [], "calls": [], "page_size": 3}
+
+    async def fake_post_info(payload):
+        state["calls"].append(payload)
+        assert payload["type"] == "userFillsByTime"
+        matched = sorted((f for f in state["fills"] if f["time"] >= payload["startTime"]), key=lambda f: (f["time"], f["tid"]))
+        return matched[:state["page_size"]]
+
+    monkeypatch.setattr(fill_store_module, "post_info", fake_post_info)
+    monkeypatch.setattr(fill_store_module, "USER_FILLS_PAGE_SIZE", 3)
+    return state
+
+
+def test_store_dedupes_and_pages_newest_first():
+    fills = [make_fill(1000 + i, i, coin="ETH" if i % 2 else "BTC") for i in range(5)]
+    assert fill_store.put_many(ADDRESS, fills) == 5
+    assert fill_store.put_many(ADDRESS.lower(), fills[3:]) == 0
+    assert fill_store.last_time(ADDRESS) == 1004
+    page = fill_store.page(ADDRESS, 2)
+    assert [f["tid"] for f in page] == [4, 3]
+    page = fill_store.page(ADDRESS, 2, cursor=(1003, 3, 1003))
+    assert [f["tid"] for f in page] == [2, 1]
+    assert [f["tid"] for f in fill_store.page(ADDRESS, 10, coin="ETH")] == [3, 1]
+    assert [f["tid"] for f in fill_store.page(ADDRESS, 10, start_time=1001, end_time=1002)] == [2, 1]
+    assert fill_store.page("0x" + "0" * 40, 10) == []
+
+
+def test_sync_is_incremental_and_paginates_upstream(upstream):
+    """처음에는 페이지 크기 단위로 끝까지, 이후에는 마지막 체결 시각부터만 조회"""
+    upstream["fills"] = [make_fill(1000 + i, i) for i in range(7)]
+    assert asyncio.run(fill_sync.sync(ADDRESS)) == 7
+    assert [call["startTime"] for call in upstream["calls"]] == [0, 1002, 1004, 1006]
+    assert upstream["calls"][0]["user"] == ADDRESS.lower()
+    # 최소 간격 안에서는 업스트림 호출 생략
+    assert asyncio.run(fill_sync.sync(ADDRESS)) == 0
+    assert len(upstream["calls"]) == 4
+    upstream["fills"].append(make_fill(2000, 7))
+    assert asyncio.run(fill_sync.sync(ADDRESS, force=True)) == 1
+    assert upstream["calls"][-1]["startTime"] == 1006
+    assert fill_store.last_time(ADDRESS) == 2000
+
+
+def test_order_history_endpoint_cursor_pagination(upstream):
+    upstream["fills"] = [make_fill(1000 + i, i, side="A" if i == 4 else "B") for i in range(5)]
+    first = client.get(f"/trading/order_history/{ADDRESS}", params={"limit": 3}).json()
+    assert [o["trade_id"] for o in first["orders"]] == [4, 3, 2]
+    assert first["orders"][0]["side"] == "sell"
+    assert first["orders"][0]["order_id"] == 1004
+    assert first["orders"][0]["timestamp"] == "1970-01-01T00:00:01.004000Z"
+    assert first["next_cursor"] == "1002:2:1002"
+    calls = len(upstream["calls"])
+    second = client.get(f"/trading/order_history/{ADDRESS}", params={"limit": 3, "cursor": first["next_cursor"]}).json()
+    assert [o["trade_id"] for o in second["orders"]] == [1, 0]
+    assert second["next_cursor"] is None
+    assert len(upstream["calls"]) == calls  # 다음 페이지는 저장소만 조회
+    assert client.get(f"/trading/order_history/{ADDRESS}", params={"cursor": "bad"}).status_code == 400
+
+
+def test_trade_history_reads_local_store(upstream):
+    from app.core.hyperliquid_client import get_trade_history
+
+    upstream["fills"] = [make_fill(1000 + i, i) for i in range(4)]
+    fills = asyncio.run(get_trade_history(ADDRESS, limit=2))
+    assert [f["tid"] for f in fills] == [3, 2]
+
+
+def test_order_history_serves_store_when_sync_fails(upstream, monkeypatch):
+    """업스트림 동기화가 실패해도 저장된 체결이 있으면 stale 표시와 함께 저장소로 응답"""
+    upstream["fills"] = [make_fill(1000 + i, i) for i in range(2)]
+    fresh = client.get(f"/trading/order_history/{ADDRESS}").json()
+    assert fresh["stale"] is False and fresh["synced_at"] is not None
+
+    async def failing_post_info(payload):
+        raise Exception("upstream down")
+
+    monkeypatch.setattr(fill_store_module, "post_info", failing_post_info)
+    fill_sync.clear()
+    response = client.get(f"/trading/order_history/{ADDRESS}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stale"] is True
+    assert [o["trade_id"] for o in data["orders"]] == [1, 0]
+    assert fill_sync.stats()["failures"] == 1
+    # 저장된 체결이 없는 주소는 응답할 내용이 없으므로 오류
+    assert client.get("/trading/order_history/0x" + "0" * 40).status_code == 500
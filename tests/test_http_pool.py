@@ -0,0 +1,45 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import http_pool
+from app.config import settings
+
+
+def test_pooled_client_reused_within_loop():
+    """같은 이벤트 루프에서는 동일한 클라이언트를 재사용해야 함"""
+    async def run():
+        first = http_pool.hyperliquid_http()
+        second = http_pool.hyperliquid_http()
+        return first is second, first.base_url
+
+    same, base_url = asyncio.run(run())
+    assert same
+    assert str(base_url).rstrip("/") == settings.HYPERLIQUID_API_URL
+
+
+def test_lifespan_creates_and_closes_clients():
+    """lifespan 시작 시 업스트림별 클라이언트 생성, 종료 시 정리"""
+    with TestClient(app):
+        assert settings.HYPERLIQUID_API_URL in http_pool._clients
+        assert settings.HYPERUNIT_API_URL in http_pool._clients
+        assert settings.HYPEREVM_RPC_URL in http_pool._clients
+        client = http_pool._clients[settings.HYPERLIQUID_API_URL]
+    assert client.is_closed
+    assert not http_pool._clients
+
+
+def test_fallback_client_from_previous_loop_is_closed():
+    """이벤트 루프가 바뀌어 fallback 클라이언트를 교체할 때 이전 클라이언트를 종료"""
+    async def get_client():
+        return http_pool.hyperunit_http()
+
+    async def replace():
+        client = http_pool.hyperunit_http()
+        await asyncio.sleep(0)
+        return client
+
+    old = asyncio.run(get_client())
+    new = asyncio.run(replace())
+    assert new is not old
+    assert old.is_closed
+    assert not new.is_closed
@@ -232,4 +232,70 @@ class TestHyperunitClient:
         )
         
         # 더미 서명이므로 False를 반환해야 함
-        assert result == False 
\ No newline at end of file
+        assert result == False 
+
+def _guardian_fixture():
+    """테스트용 가디언 노드 키 쌍 (node_id → PrivateKey, 공개키 hex)"""
+    from eth_keys import keys
+    private_keys = {
+        node_id: keys.PrivateKey(bytes([i + 1]) * 32)
+        for i, node_id in enumerate(["field-node", "hl-node", "unit-node"])
+    }
+    nodes = {node_id: "04" + key.public_key.to_bytes().hex() for node_id, key in private_keys.items()}
+    return private_keys, nodes
+
+
+def _sign_proposal(private_keys, proposal, payload_fn):
+    import hashlib
+    return {
+        node_id: base64.b64encode(
+            key.sign_msg_hash(hashlib.sha256(payload_fn(node_id, proposal)).digest()).to_bytes()
+        ).decode()
+        for node_id, key in private_keys.items()
+    }
+
+
+SOL_PROPOSAL = Proposal(
+    destination_address="0x1234567890123456789012345678901234567890",
+    destination_chain="hyperliquid",
+    asset="sol",
+    address="So1anaDepositAddress",
+    source_chain="solana"
+)
+
+
+class TestCachedVerification:
+    """공개키 캐시 / 검증 결과 memoization / 비동기 배치 검증 테스트"""
+
+    def test_valid_signatures_verify(self):
+        private_keys, nodes = _guardian_fixture()
+        signatures = _sign_proposal(private_keys, SOL_PROPOSAL, legacy_proposal_to_payload)
+        result = verify_deposit_address_signatures(signatures, SOL_PROPOSAL, nodes)
+        assert result.success
+        assert result.verified_count == 3
+
+    def test_public_keys_parsed_once(self):
+        from app.core.hyperunit_client import get_guardian_public_keys
+        _, nodes = _guardian_fixture()
+        assert get_guardian_public_keys(nodes) is get_guardian_public_keys(dict(reversed(list(nodes.items()))))
+
+    def test_repeated_verification_is_memoized(self):
+        from app.core.hyperunit_client import verify_signature_cached
+        private_keys, nodes = _guardian_fixture()
+        signatures = _sign_proposal(private_keys, SOL_PROPOSAL, new_proposal_to_payload)
+        verify_signature_cached.cache_clear()
+        verify_deposit_address_signatures(signatures, SOL_PROPOSAL, nodes)
+        misses = verify_signature_cached.cache_info().misses
+        verify_deposit_address_signatures(signatures, SOL_PROPOSAL, nodes)
+        assert verify_signature_cached.cache_info().misses == misses
+        assert verify_signature_cached.cache_info().hits >= 3
+
+    def test_async_batch_verification(self):
+        import asyncio
+        from app.core.hyperunit_client import verify_deposit_addresses
+        private_keys, nodes = _guardian_fixture()
+        good = _sign_proposal(private_keys, SOL_PROPOSAL, legacy_proposal_to_payload)
+        partial = {**good, "hl-node": base64.b64encode(b"0" * 64).decode(), "unit-node": good["field-node"]}
+        results = asyncio.run(verify_deposit_addresses([(good, SOL_PROPOSAL), (partial, SOL_PROPOSAL)], nodes))
+        assert [result.success for result in results] == [True, False]
+        assert results[1].verification_details == {"field-node": True, "hl-node": False, "unit-node": False}
@@ -0,0 +1,73 @@
+import asyncio
+import time
+import pytest
+from app.core import hyperevm_client
+from app.core.market_data import MarketMirror
+from app.core.universe import Universe
+from app.core.ws_feed import HyperliquidWsFeed
+
+
+@pytest.fixture
+def mirror():
+    return MarketMirror(HyperliquidWsFeed("ws://unused"))
+
+
+def test_all_mids_push_updates_mirror(mirror):
+    """allMids 푸시가 미러에 반영되는지 확인"""
+    mirror.feed.dispatch({"channel": "allMids", "data": {"mids": {"BTC": "69123.5", "ETH": "3500"}}})
+    assert mirror.get_mid("BTC") == 69123.5
+    assert mirror.get_mid("ETH") == 3500.0
+    assert mirror.get_mid("NOTREAL") is None
+    assert not mirror.is_stale()
+
+
+def test_stale_mirror_returns_none(mirror, monkeypatch):
+    """마지막 푸시 후 stale 기준이 지나면 REST 폴백을 위해 None 반환"""
+    mirror.feed.dispatch({"channel": "allMids", "data": {"mids": {"BTC": "1"}}})
+    mirror.mids_updated_at = time.time() - 3600
+    assert mirror.is_stale()
+    assert mirror.get_mid("BTC") is None
+    assert mirror.stats()["fallbacks"] == 1
+
+
+def test_active_asset_ctx_push(mirror):
+    mirror.feed.dispatch({
+        "channel": "activeAssetCtx",
+        "data": {"coin": "BTC", "ctx": {"markPx": "108889.0", "funding": "0.0000125"}},
+    })
+    assert mirror.get_asset_ctx("BTC")["markPx"] == "108889.0"
+    assert mirror.get_asset_ctx("ETH") is None
+
+
+def test_resync_replaces_snapshot(mirror, monkeypatch):
+    """재연결 시 REST 스냅샷으로 전체 재동기화"""
+    async def fake_post_info(payload):
+        assert payload == {"type": "allMids"}
+        return {"BTC": "100"}
+    monkeypatch.setattr("app.core.market_data.post_info", fake_post_info)
+    mirror.mids = {"OLD": 1.0}
+    asyncio.run(mirror.resync())
+    assert mirror.mids == {"BTC": 100.0}
+    assert mirror.resyncs == 1
+
+
+def test_get_price_reads_from_mirror(mirror, monkeypatch):
+    """미러가 최신이면 업스트림 호출 없이 가격 반환"""
+    async def fail_cached_info(payload, ttl):
+        raise AssertionError("upstream should not be called")
+    mirror.feed.dispatch({"channel": "allMids", "data": {"mids": {"BTC": "69000"}}})
+    monkeypatch.setattr(hyperevm_client, "mirror", mirror)
+    monkeypatch.setattr(hyperevm_client, "cached_info", fail_cached_info)
+    monkeypatch.setattr("app.core.universe._current", Universe.from_meta({"universe": [{"name": "BTC"}]}))
+    result = asyncio.run(hyperevm_client.get_price(0))
+    assert result == {"symbol": "BTC", "price": 69000.0}
+
+
+def test_get_price_falls_back_to_rest(mirror, monkeypatch):
+    async def fake_cached_info(payload, ttl):
+        return {"BTC": "68000"}
+    monkeypatch.setattr(hyperevm_client, "mirror", mirror)
+    monkeypatch.setattr(hyperevm_client, "cached_info", fake_cached_info)
+    monkeypatch.setattr("app.core.universe._current", Universe.from_meta({"universe": [{"name": "BTC"}]}))
+    result = asyncio.run(hyperevm_client.get_price(0))
+    assert result == {"symbol": "BTC", "price": 68000.0}
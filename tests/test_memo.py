@@ -0,0 +1,27 @@
+from app.core.memo import LastValue
+
+
+def test_last_value_rebuilds_only_when_key_changes():
+    memo = LastValue()
+    built = []
+
+    def build(value):
+        built.append(value)
+        return value
+
+    assert memo.get(("a", 1), lambda: build("first")) == "first"
+    assert memo.get(("a", 1), lambda: build("again")) == "first"
+    assert memo.get(("a", 2), lambda: build("second")) == "second"
+    assert built == ["first", "second"]
+    assert (memo.hits, memo.misses) == (1, 2)
+    memo.clear()
+    assert memo.get(("a", 2), lambda: build("third")) == "third"
+
+
+def test_last_value_by_identity_ignores_equal_contents():
+    """스냅샷 list처럼 내용이 같아도 다른 객체면 다시 계산"""
+    memo = LastValue(by_identity=True)
+    snapshot = [{"universe": []}, []]
+    first = memo.get(snapshot, object)
+    assert memo.get(snapshot, object) is first
+    assert memo.get([{"universe": []}, []], object) is not first
@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from eth_account import Account
+from app.core.order_pipeline import NonceManager, RedisNonceManager, SubmissionPipeline
+
+KEY = Account.create().key.hex()
+
+
+def test_nonces_strictly_increase_within_same_millisecond(monkeypatch):
+    monkeypatch.setattr("app.core.order_pipeline.time.time", lambda: 1700000000.0)
+    manager = NonceManager()
+    issued = [asyncio.run(manager.next("0xAbc")) for _ in range(5)]
+    assert issued == [1700000000000 + i for i in range(5)]
+    # 지갑별로 독립적으로 발급 (대소문자 무관)
+    assert asyncio.run(manager.next("0xdef")) == 1700000000000
+    assert asyncio.run(manager.next("0xabc")) == 1700000000005
+
+
+def test_redis_nonces_are_shared_and_fall_back_locally(monkeypatch):
+    """Redis 스크립트가 발급한 nonce를 사용하고, Redis 오류 시 직전 값보다 큰 로컬 nonce로 대체"""
+    monkeypatch.setattr("app.core.order_pipeline.time.time", lambda: 1700000000.0)
+    manager = RedisNonceManager("redis://localhost:6379", 0)
+    manager._script = AsyncMock(side_effect=[1700000000042, ConnectionError("redis down")])
+
+    assert asyncio.run(manager.next("0xAbc")) == 1700000000042
+    manager._script.assert_awaited_once_with(keys=["hub:nonce:0xabc"], args=[1, manager.ttl_ms])
+    assert asyncio.run(manager.next("0xabc")) == 1700000000043
+    assert manager.stats()["fallbacks"] == 1
+
+
+def ok_response():
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"status": "ok"}
+    return response
+
+
+def test_pipeline_keeps_multiple_actions_in_flight():
+    """같은 지갑의 action 여러 건이 고유 nonce로 동시에 전송됨"""
+    pipeline = SubmissionPipeline(NonceManager())
+    sent = []
+    peak = {"inflight": 0}
+
+    async def post(url, json=None, **kwargs):
+        sent.append(json)
+        peak["inflight"] = max(peak["inflight"], pipeline.inflight)
+        await asyncio.sleep(0.01)
+        return ok_response()
+
+    async def scenario():
+        with patch("httpx.AsyncClient.post", side_effect=post):
+            return await asyncio.gather(*(pipeline.submit(KEY, {"type": "cancel", "cancels": [{"a": 0, "o": i}]}) for i in range(5)))
+
+    results = asyncio.run(scenario())
+    assert results == [{"status": "ok"}] * 5
+    assert peak["inflight"] > 1
+    assert len({request["nonce"] for request in sent}) == 5
+    stats = pipeline.stats()
+    assert stats["acked"] == 5 and stats["inflight"] == 0
+    assert stats["latency_ms"]["count"] == 5
+    assert stats["latency_ms"]["p50"] >= 10
+
+
+def test_pipeline_limits_inflight_per_wallet(monkeypatch):
+    monkeypatch.setattr("app.config.settings.ORDER_MAX_INFLIGHT_PER_WALLET", 2)
+    pipeline = SubmissionPipeline(NonceManager())
+    peak = {"inflight": 0}
+
+    async def post(url, json=None, **kwargs):
+        peak["inflight"] = max(peak["inflight"], pipeline.inflight)
+        await asyncio.sleep(0.005)
+        return ok_response()
+
+    async def scenario():
+        with patch("httpx.AsyncClient.post", side_effect=post):
+            await asyncio.gather(*(pipeline.submit(KEY, {"type": "noop", "i": i}) for i in range(6)))
+
+    asyncio.run(scenario())
+    assert peak["inflight"] == 2
+
+
+def test_pipeline_counts_failures():
+    pipeline = SubmissionPipeline(NonceManager())
+    response = MagicMock()
+    response.status_code = 422
+    response.json.return_value = {"error": "bad"}
+
+    async def scenario():
+        with patch("httpx.AsyncClient.post", return_value=response):
+            await pipeline.submit(KEY, {"type": "noop"})
+
+    with pytest.raises(Exception, match="API Error: 422"):
+        asyncio.run(scenario())
+    assert pipeline.stats()["failed"] == 1
+    assert pipeline.stats()["inflight"] == 0
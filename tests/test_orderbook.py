@@ -0,0 +1,133 @@
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.orderbook import OrderBook, OrderBookManager, orderbooks, protective_price
+from app.core.ws_feed import HyperliquidWsFeed
+
+LEVELS = [
+    [{"px": "100", "sz": "1", "n": 1}, {"px": "99", "sz": "2", "n": 3}, {"px": "98", "sz": "4", "n": 2}],
+    [{"px": "101", "sz": "1.5", "n": 1}, {"px": "102", "sz": "2.5", "n": 1}],
+]
+
+
+def test_orderbook_queries():
+    """최우선 호가, 스프레드, 상위 N 레벨, 누적 수량"""
+    book = OrderBook("BTC")
+    book.apply_snapshot(LEVELS, 1700000000000)
+    assert book.best_bid() == (100.0, 1.0)
+    assert book.best_ask() == (101.0, 1.5)
+    assert book.spread() == 1.0
+    assert book.mid() == 100.5
+    assert book.levels("bids", 2) == [[100.0, 1.0], [99.0, 2.0]]
+    assert book.cumulative_levels("bids") == [[100.0, 1.0], [99.0, 3.0], [98.0, 7.0]]
+    assert book.cumulative_levels("asks", 5) == [[101.0, 1.5], [102.0, 4.0]]
+    assert book.to_dict(1) == {"symbol": "BTC", "bids": [[100.0, 1.0]], "asks": [[101.0, 1.5]], "time": 1700000000000}
+
+
+def test_estimate_fill_walks_cumulative_depth():
+    """VWAP/최악 체결가/슬리피지: 누적 수량 이분 탐색 + 누적 금액"""
+    book = OrderBook("BTC")
+    book.apply_snapshot(LEVELS)
+    buy = book.estimate_fill("buy", 2.5)
+    assert buy["fully_filled"] is True
+    assert buy["levels"] == 2
+    assert buy["worst_price"] == 102.0
+    assert buy["vwap"] == pytest.approx((1.5 * 101 + 1.0 * 102) / 2.5)
+    assert buy["slippage_bps"] == pytest.approx((buy["vwap"] - 100.5) / 100.5 * 1e4)
+    sell = book.estimate_fill("sell", 1.0)
+    assert sell["levels"] == 1
+    assert sell["vwap"] == 100.0
+    assert sell["impact_bps"] == pytest.approx(0.5 / 100.5 * 1e4)
+    # 보이는 호가보다 큰 주문은 부분 체결로 추정
+    thin = book.estimate_fill("sell", 10.0)
+    assert thin["fully_filled"] is False
+    assert thin["filled"] == 7.0
+    assert thin["worst_price"] == 98.0
+    assert OrderBook("EMPTY").estimate_fill("buy", 1.0)["vwap"] is None
+
+
+def test_protective_price_is_buffered_and_capped(monkeypatch):
+    monkeypatch.setattr("app.core.orderbook.settings.MARKET_ORDER_SLIPPAGE_BUFFER_BPS", 10.0)
+    monkeypatch.setattr("app.core.orderbook.settings.MARKET_ORDER_MAX_SLIPPAGE_BPS", 200.0)
+    book = OrderBook("BTC")
+    book.apply_snapshot(LEVELS)
+    assert protective_price(book.estimate_fill("buy", 2.5)) == pytest.approx(102.0 * 1.001)
+    assert protective_price(book.estimate_fill("sell", 1.0)) == pytest.approx(100.0 * 0.999)
+    # 최악 체결가가 상한을 넘거나 전량 체결되지 않으면 중간가 기준 상한
+    assert protective_price(book.estimate_fill("sell", 5.0)) == pytest.approx(100.5 * 0.98)
+    assert protective_price(book.estimate_fill("buy", 100.0)) == pytest.approx(100.5 * 1.02)
+    assert protective_price(OrderBook("EMPTY").estimate_fill("buy", 1.0)) is None
+
+
+def test_slippage_endpoint(monkeypatch):
+    async def fake_is_valid_symbol(symbol):
+        return symbol in ("BTC", "EMPTY")
+
+    async def fake_post_info(payload):
+        return {"coin": payload["coin"], "time": 1, "levels": LEVELS if payload["coin"] == "BTC" else [[], []]}
+
+    monkeypatch.setattr("app.api.price.is_valid_symbol", fake_is_valid_symbol)
+    monkeypatch.setattr("app.core.orderbook.post_info", fake_post_info)
+    monkeypatch.setattr(orderbooks, "books", {})
+    client = TestClient(app)
+    data = client.get("/price/slippage/BTC", params={"side": "buy", "size": 2.5}).json()
+    assert data["worst_price"] == 102.0
+    assert data["limit_price"] > 102.0
+    assert client.get("/price/slippage/BTC", params={"side": "hold", "size": 1}).status_code == 400
+    assert client.get("/price/slippage/BTC", params={"side": "buy", "size": 0}).status_code == 422
+    assert client.get("/price/slippage/EMPTY", params={"side": "buy", "size": 1}).status_code == 404
+    assert client.get("/price/slippage/NOPE", params={"side": "buy", "size": 1}).status_code == 404
+
+
+def test_empty_orderbook():
+    book = OrderBook("EMPTY")
+    assert book.is_empty()
+    assert book.best_bid() is None
+    assert book.spread() is None
+    assert book.summary()["best_ask"] is None
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    calls = []
+
+    async def fake_post_info(payload):
+        calls.append(payload)
+        return {"coin": payload["coin"], "time": 1, "levels": LEVELS}
+
+    monkeypatch.setattr("app.core.orderbook.post_info", fake_post_info)
+    m = OrderBookManager(HyperliquidWsFeed("ws://unused"))
+    m.rest_calls = calls
+    return m
+
+
+def test_first_read_seeds_from_rest_and_subscribes(manager):
+    book = asyncio.run(manager.get_book("BTC"))
+    assert book.best_bid() == (100.0, 1.0)
+    assert manager.rest_calls == [{"type": "l2Book", "coin": "BTC"}]
+    assert manager.feed.is_subscribed({"type": "l2Book", "coin": "BTC"})
+
+
+def test_push_served_locally_when_feed_connected(manager):
+    """피드 연결 중이고 최근 푸시가 있으면 REST 호출 없이 로컬 오더북 반환"""
+    asyncio.run(manager.get_book("BTC"))
+    manager.feed.connected = True
+    manager.feed.dispatch({"channel": "l2Book", "data": {
+        "coin": "BTC", "time": 2,
+        "levels": [[{"px": "105", "sz": "1", "n": 1}], [{"px": "106", "sz": "1", "n": 1}]],
+    }})
+    book = asyncio.run(manager.get_book("BTC"))
+    assert book.best_bid() == (105.0, 1.0)
+    assert len(manager.rest_calls) == 1
+    assert manager.stats()["local_reads"] == 1
+
+
+def test_idle_books_are_evicted(manager):
+    asyncio.run(manager.get_book("BTC"))
+    manager.books["BTC"].last_read_at = time.time() - 3600
+    asyncio.run(manager.evict_idle())
+    assert "BTC" not in manager.books
+    assert not manager.feed.is_subscribed({"type": "l2Book", "coin": "BTC"})
+    assert manager.stats()["evictions"] == 1
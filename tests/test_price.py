@@ -75,3 +75,70 @@ def test_price_symbol_not_found(monkeypatch):
     assert response.status_code == 404
     detail = response.json()["detail"]
     assert "Symbol not found" in detail or detail == "Not Found"
+
+
+@pytest.fixture
+def fake_universe_snapshot(monkeypatch):
+    """배치 조회용 유니버스/스냅샷 모킹"""
+    from app.core.universe import Universe
+    meta = {"universe": [{"name": "BTC"}, {"name": "ETH"}, {"name": "NOPX"}]}
+    monkeypatch.setattr("app.core.universe._current", Universe.from_meta(meta))
+    upstream_calls = []
+
+    async def fake_cached_info(payload, ttl):
+        upstream_calls.append(payload)
+        return {"BTC": "69000.5", "ETH": "3500"}
+
+    class FakeSnapshot:
+        async def get(self):
+            upstream_calls.append({"type": "metaAndAssetCtxs"})
+            return [meta, [
+                {"markPx": "69000", "funding": "0.0000125", "impactPxs": ["68999", "69001"]},
+                {"markPx": "3500", "funding": "0.00001"},
+                {"markPx": "1", "funding": "0"},
+            ]]
+
+    monkeypatch.setattr("app.core.hyperevm_client.cached_info", fake_cached_info)
+    monkeypatch.setattr("app.core.hyperevm_client.meta_and_asset_ctxs", FakeSnapshot())
+    return upstream_calls
+
+
+def test_batch_prices(fake_universe_snapshot):
+    response = client.get("/price/batch?ids=0,1,2,99")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 4
+    assert data["errors"] == 2
+    assert data["prices"][0] == {"market_id": 0, "symbol": "BTC", "price": 69000.5}
+    assert data["prices"][1]["price"] == 3500.0
+    assert "Price not found" in data["prices"][2]["error"]
+    assert data["prices"][3] == {"market_id": 99, "error": "Invalid market_id: 99"}
+    # 하나의 allMids 스냅샷으로 처리
+    assert fake_universe_snapshot == [{"type": "allMids"}]
+
+
+def test_batch_prices_invalid_ids():
+    response = client.get("/price/batch?ids=1,abc")
+    assert response.status_code == 400
+    response = client.get("/price/batch?ids=-1")
+    assert response.status_code == 400
+
+
+def test_batch_asset_ctxs(fake_universe_snapshot):
+    response = client.get("/price/asset_ctx?symbols=ETH,NOTREAL")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 2
+    assert data["asset_ctxs"][0]["symbol"] == "ETH"
+    assert data["asset_ctxs"][0]["markPx"] == 3500.0
+    assert data["asset_ctxs"][1] == {"symbol": "NOTREAL", "error": "Symbol not found: NOTREAL"}
+
+
+def test_batch_asset_ctxs_all(fake_universe_snapshot):
+    response = client.get("/price/asset_ctx?symbols=*")
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["symbol"] for item in data["asset_ctxs"]] == ["BTC", "ETH", "NOPX"]
+    assert data["asset_ctxs"][0]["impactPxs"] == [68999.0, 69001.0]
+    assert data["errors"] == 0
+    assert fake_universe_snapshot == [{"type": "metaAndAssetCtxs"}]
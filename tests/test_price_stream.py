@@ -0,0 +1,69 @@
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.market_data import mirror
+from app.core.price_stream import ConflatingQueue, PriceBroadcaster
+from app.core.universe import Universe
+from app.core.ws_feed import HyperliquidWsFeed
+
+client = TestClient(app)
+
+
+def push(feed, mids):
+    feed.dispatch({"channel": "allMids", "data": {"mids": mids}})
+
+
+def test_queue_conflates_to_latest_value():
+    """느린 클라이언트는 심볼별 최신 값만 받음"""
+    queue = ConflatingQueue()
+    queue.offer({"BTC": 1.0, "ETH": 10.0})
+    queue.offer({"BTC": 2.0})
+    queue.offer({"BTC": 3.0})
+    batch = asyncio.run(queue.get())
+    assert batch == {"BTC": 3.0, "ETH": 10.0}
+    assert queue.conflated == 2
+
+
+def test_queue_filters_symbols():
+    queue = ConflatingQueue(frozenset({"ETH"}))
+    queue.offer({"BTC": 1.0, "ETH": 10.0})
+    assert asyncio.run(queue.get()) == {"ETH": 10.0}
+
+
+def test_broadcaster_fans_out_only_changes():
+    feed = HyperliquidWsFeed("ws://unused")
+    broadcaster = PriceBroadcaster(feed)
+    fast = broadcaster.subscribe()
+    slow = broadcaster.subscribe(frozenset({"BTC"}))
+    push(feed, {"BTC": "100", "ETH": "10"})
+    assert asyncio.run(fast.get()) == {"BTC": 100.0, "ETH": 10.0}
+    # 값이 바뀐 심볼만 전달
+    push(feed, {"BTC": "100", "ETH": "11"})
+    assert asyncio.run(fast.get()) == {"ETH": 11.0}
+    # 느린 클라이언트는 여러 푸시가 쌓여도 최신 값 하나만 보유
+    for px in range(101, 200):
+        push(feed, {"BTC": str(px), "ETH": "11"})
+    assert asyncio.run(slow.get()) == {"BTC": 199.0}
+    broadcaster.unsubscribe(fast)
+    broadcaster.unsubscribe(slow)
+    assert broadcaster.client_count == 0
+
+
+def test_broadcaster_client_limit(monkeypatch):
+    monkeypatch.setattr("app.config.settings.STREAM_MAX_CLIENTS", 1)
+    broadcaster = PriceBroadcaster(HyperliquidWsFeed("ws://unused"))
+    broadcaster.subscribe()
+    with pytest.raises(OverflowError):
+        broadcaster.subscribe()
+
+
+def test_websocket_stream_sends_snapshot(monkeypatch):
+    """접속 직후 미러의 최신 스냅샷을 전달"""
+    monkeypatch.setattr("app.core.universe._current", Universe.from_meta({"universe": [{"name": "BTC"}, {"name": "ETH"}]}))
+    monkeypatch.setattr(mirror, "mids", {"BTC": 69000.0, "ETH": 3500.0})
+    monkeypatch.setattr(mirror, "mids_updated_at", time.time())
+    with client.websocket_connect("/price/ws?symbols=BTC") as websocket:
+        message = websocket.receive_json()
+    assert message == {"type": "prices", "data": {"BTC": 69000.0}}
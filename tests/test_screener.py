@@ -0,0 +1,83 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.core.asset_table import AssetTable
+from app.core.ctx_history import CtxHistory
+from app.core.screener import FUNDING_PERIODS_PER_YEAR, build_screen
+from app.main import app
+
+client = TestClient(app)
+
+
+def snapshot(btc_funding="0.0001", eth_funding="-0.0002", sol_funding="0.00001"):
+    return [
+        {"universe": [{"name": "BTC"}, {"name": "ETH"}, {"name": "SOL"}]},
+        [
+            {"funding": btc_funding, "premium": "0.0003", "markPx": "101", "oraclePx": "100", "openInterest": "30", "dayNtlVlm": "1000000"},
+            {"funding": eth_funding, "premium": "-0.0005", "markPx": "99", "oraclePx": "100", "openInterest": "10", "dayNtlVlm": "500000"},
+            {"funding": sol_funding, "premium": "0", "markPx": "100", "oraclePx": "100", "openInterest": "60", "dayNtlVlm": "1000"},
+        ],
+    ]
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    history = CtxHistory(str(tmp_path), capacity=64, max_assets=8)
+    history.open()
+    monkeypatch.setattr("app.config.settings.SCREENER_MIN_SAMPLES", 3)
+    yield history
+    history.close()
+
+
+def test_screen_metrics_without_history(tmp_path):
+    closed = CtxHistory(str(tmp_path), capacity=4, max_assets=4)
+    screen = build_screen(AssetTable(snapshot()), closed, 3600)
+    columns = screen.columns
+    assert columns["fundingAnnualized"][0] == pytest.approx(0.0001 * FUNDING_PERIODS_PER_YEAR)
+    assert columns["basis"].tolist() == pytest.approx([0.01, -0.01, 0.0])
+    # OI(USD): BTC 3030, ETH 990, SOL 6000
+    assert columns["oiWeight"].sum() == pytest.approx(1.0)
+    assert columns["oiWeight"][2] == pytest.approx(6000 / 10020)
+    assert screen.samples == 0
+    assert all(value != value for value in columns["fundingZ"])
+
+
+def test_rolling_z_scores(history):
+    now = time.time()
+    for i, funding in enumerate(["0.0001", "0.0002", "0.0001", "0.0002"]):
+        history.append(AssetTable(snapshot(btc_funding=funding)), ts=now - 100 + i)
+    table = AssetTable(snapshot(btc_funding="0.0006"))
+    screen = build_screen(table, history, 3600)
+    assert screen.samples == 4
+    # BTC 평균 0.00015, 표준편차 0.00005 → z = 9
+    assert screen.columns["fundingZ"][0] == pytest.approx(9.0)
+    # 변동이 없는 지표는 z-score 없음
+    assert screen.columns["premiumZ"][0] != screen.columns["premiumZ"][0]
+    assert build_screen(table, history, 3600) is screen
+    # 윈도우 밖 기록은 제외 → 표본 부족
+    narrow = build_screen(table, history, 98.5)
+    assert narrow.samples == 2
+    assert narrow.columns["fundingZ"][0] != narrow.columns["fundingZ"][0]
+
+
+def test_screener_endpoint(history, monkeypatch):
+    class FakeSnapshot:
+        async def get(self):
+            return SNAPSHOT
+
+    SNAPSHOT = snapshot()
+    monkeypatch.setattr("app.core.hyperevm_client.meta_and_asset_ctxs", FakeSnapshot())
+    monkeypatch.setattr("app.core.hyperevm_client.ctx_history", history)
+
+    response = client.get("/price/screener", params={"sort": "fundingAnnualized", "abs": "true", "fields": "fundingAnnualized,basis"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["symbol"] for item in data["results"]] == ["ETH", "BTC", "SOL"]
+    assert set(data["results"][0]) == {"symbol", "fundingAnnualized", "basis"}
+
+    data = client.get("/price/screener", params={"where": "dayNtlVlm>10000,basis>0", "limit": 5}).json()
+    assert data["matched"] == 1 and data["results"][0]["symbol"] == "BTC"
+    assert data["results"][0]["fundingZ"] is None
+
+    assert client.get("/price/screener", params={"sort": "nope"}).status_code == 400
+    assert client.get("/price/screener", params={"where": "change24h>x"}).status_code == 400
@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+from eth_account import Account
+from app.core.signer import SignerRegistry, load_account, sign_l1_action
+
+ACCOUNT = Account.create()
+KEY = ACCOUNT.key.hex()
+ACTION = {"type": "cancel", "cancels": [{"a": 0, "o": 1}]}
+NONCE = 1760000000000
+
+
+def test_key_is_parsed_once():
+    load_account.cache_clear()
+    sign_l1_action(KEY, ACTION, NONCE)
+    sign_l1_action(KEY, ACTION, NONCE + 1)
+    info = load_account.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_sign_action_recovers_signer():
+    """서명에서 복원한 주소가 서명 키의 주소와 같음 (SDK와 같은 phantom agent 인코딩)"""
+    from eth_utils import keccak
+    from app.core.signer import _L1_DOMAIN, _L1_TYPES, _encoder
+
+    signature = sign_l1_action(KEY, ACTION, NONCE)
+    phantom_agent = _encoder.construct_phantom_agent(_encoder.action_hash(ACTION, None, NONCE), False)
+    digest = keccak(_encoder.eth_encode_structured_data(_L1_DOMAIN, _L1_TYPES, phantom_agent))
+    recovered = Account._recover_hash(digest, vrs=(signature["v"], int(signature["r"], 16), int(signature["s"], 16)))
+    assert recovered == ACCOUNT.address
+
+
+def test_registry_address():
+    assert SignerRegistry("inline", 1).address(KEY) == ACCOUNT.address
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_sign_action_in_each_pool_mode(mode):
+    """풀 방식과 무관하게 L1 action 서명이 같음"""
+    registry = SignerRegistry(mode, 2)
+    try:
+        signature = asyncio.run(registry.sign_action(KEY, ACTION, NONCE))
+    finally:
+        registry.shutdown()
+    assert signature == sign_l1_action(KEY, ACTION, NONCE)
+    assert registry.stats()["signed"] == 1
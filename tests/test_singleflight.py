@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from app.core.singleflight import SingleFlight
+from app.core.info_client import info_key
+
+
+def test_concurrent_calls_are_coalesced():
+    """동일 key 동시 호출은 업스트림 1회 실행 후 결과 공유"""
+    flight = SingleFlight("test")
+    executions = 0
+
+    async def fetch():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return {"BTC": "100"}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("allMids", fetch) for _ in range(50)))
+
+    results = asyncio.run(run())
+    assert executions == 1
+    assert all(r is results[0] for r in results)
+    stats = flight.stats()
+    assert stats["calls"] == 50
+    assert stats["executions"] == 1
+    assert stats["coalesced"] == 49
+    assert stats["inflight"] == 0
+
+
+def test_sequential_calls_are_not_coalesced():
+    """완료된 요청은 재사용하지 않음 (캐시가 아님)"""
+    flight = SingleFlight("test")
+
+    async def fetch():
+        return 1
+
+    async def run():
+        await flight.do("k", fetch)
+        await flight.do("k", fetch)
+
+    asyncio.run(run())
+    assert flight.stats()["executions"] == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_error_is_shared_and_counted():
+    """업스트림 실패는 모든 대기 호출자에게 전파"""
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["errors"] == 1
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    """한 호출자가 취소되어도 나머지 호출자는 결과를 받음"""
+    flight = SingleFlight("test")
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("k", fetch))
+        second = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "ok"
+
+
+def test_info_key_ignores_key_order():
+    assert info_key({"type": "l2Book", "coin": "BTC"}) == info_key({"coin": "BTC", "type": "l2Book"})
@@ -162,37 +162,35 @@ def test_wallet_balance_invalid_address():
 
 
 # gen_wallet 함수 테스트
-@patch('httpx.get')
-def test_gen_wallet_success(mock_get):
-    """지갑 생성 성공 테스트"""
+@patch('httpx.AsyncClient.get')
+def test_gen_wallet_success(mock_get, monkeypatch):
+    """지갑 생성 성공 테스트 (가디언 서명 검증은 별도 테스트)"""
+    monkeypatch.setattr("app.config.settings.HYPERUNIT_VERIFY_SIGNATURES", False)
     # Mock 설정
-    mock_eth_response = type('MockResponse', (), {
-        'raise_for_status': lambda: None,
-        'json': lambda: {
-            "address": "0x3F344...",
-            "signatures": {
-                "field-node": "A/o6b5CTyjyV4MVDtt15+/c4078OHCf8vatkHs8wQm3dX6Gs784br5uUoCnATXYG94RwBiHpaEOLlJiDyMzH2A==",
-                "hl-node": "roOKVA5o4O+MsKfqWB1yHnII6jyysIdEIuSSEHFlV2QYTKHvPC6rQPqhsZ1m1kCm3Zq4lUKykRZzpnU0bx1dsg==",
-                "unit-node": "JO44LIE5Q4DpNzw9nsKmgTKqpm7M8wsMTCqgSUJ3LpTWvd0wQDVh+H7VTJb87Zf0gZiu/JkKCK1Tf4+IabzZgw=="
-            },
-            "status": "OK"
-        }
-    })()
-    
-    mock_sol_response = type('MockResponse', (), {
-        'raise_for_status': lambda: None,
-        'json': lambda: {
-            "address": "0x5A2b3...",
-            "signatures": {
-                "field-node": "B/o6b5CTyjyV4MVDtt15+/c4078OHCf8vatkHs8wQm3dX6Gs784br5uUoCnATXYG94RwBiHpaEOLlJiDyMzH2A==",
-                "hl-node": "soOKVA5o4O+MsKfqWB1yHnII6jyysIdEIuSSEHFlV2QYTKHvPC6rQPqhsZ1m1kCm3Zq4lUKykRZzpnU0bx1dsg==",
-                "unit-node": "KO44LIE5Q4DpNzw9nsKmgTKqpm7M8wsMTCqgSUJ3LpTWvd0wQDVh+H7VTJb87Zf0gZiu/JkKCK1Tf4+IabzZgw=="
-            },
-            "status": "OK"
-        }
-    })()
-    
-    mock_get.side_effect = [mock_eth_response, mock_sol_response]
+    mock_eth_response = MagicMock()
+    mock_eth_response.json.return_value = {
+        "address": "0x3F344...",
+        "signatures": {
+            "field-node": "A/o6b5CTyjyV4MVDtt15+/c4078OHCf8vatkHs8wQm3dX6Gs784br5uUoCnATXYG94RwBiHpaEOLlJiDyMzH2A==",
+            "hl-node": "roOKVA5o4O+MsKfqWB1yHnII6jyysIdEIuSSEHFlV2QYTKHvPC6rQPqhsZ1m1kCm3Zq4lUKykRZzpnU0bx1dsg==",
+            "unit-node": "JO44LIE5Q4DpNzw9nsKmgTKqpm7M8wsMTCqgSUJ3LpTWvd0wQDVh+H7VTJb87Zf0gZiu/JkKCK1Tf4+IabzZgw=="
+        },
+        "status": "OK"
+    }
+    
+    mock_sol_response = MagicMock()
+    mock_sol_response.json.return_value = {
+        "address": "0x5A2b3...",
+        "signatures": {
+            "field-node": "B/o6b5CTyjyV4MVDtt15+/c4078OHCf8vatkHs8wQm3dX6Gs784br5uUoCnATXYG94RwBiHpaEOLlJiDyMzH2A==",
+            "hl-node": "soOKVA5o4O+MsKfqWB1yHnII6jyysIdEIuSSEHFlV2QYTKHvPC6rQPqhsZ1m1kCm3Zq4lUKykRZzpnU0bx1dsg==",
+            "unit-node": "KO44LIE5Q4DpNzw9nsKmgTKqpm7M8wsMTCqgSUJ3LpTWvd0wQDVh+H7VTJb87Zf0gZiu/JkKCK1Tf4+IabzZgw=="
+        },
+        "status": "OK"
+    }
+    
+    # ETH/SOL 입금 주소는 동시에 요청되므로 URL로 응답 구분
+    mock_get.side_effect = lambda url, **kwargs: mock_sol_response if "/solana/" in url else mock_eth_response
     
     # 테스트 실행
     response = client.get("/trading/gen_wallet")
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from app.core import universe as universe_module
+from app.core import hyperevm_client
+from app.core.universe import Universe, find_asset_ctx, get_asset_id, get_universe
+
+META = {
+    "universe": [
+        {"name": "BTC", "szDecimals": 5, "maxLeverage": 40},
+        {"name": "ETH", "szDecimals": 4, "maxLeverage": 25},
+        {"name": "SOL", "szDecimals": 2, "maxLeverage": 20},
+    ]
+}
+
+
+@pytest.fixture
+def fake_meta(monkeypatch):
+    calls = []
+
+    async def fake_cached_info(payload, ttl):
+        calls.append(payload)
+        return META
+
+    monkeypatch.setattr(universe_module, "cached_info", fake_cached_info)
+    monkeypatch.setattr(universe_module, "_current", universe_module.EMPTY_UNIVERSE)
+    return calls
+
+
+def test_universe_lookups():
+    universe = Universe.from_meta(META)
+    assert universe.asset_id("ETH") == 1
+    assert universe.name(2) == "SOL"
+    assert universe.name(3) is None
+    assert "BTC" in universe
+    assert "NOTREAL" not in universe
+    assert universe.info("BTC") == {"symbol": "BTC", "asset_id": 0, "szDecimals": 5, "maxLeverage": 40}
+
+
+def test_get_universe_fetches_once_and_swaps(fake_meta):
+    """비어 있을 때만 fetch하고, 이후 조회는 같은 불변 객체를 lock 없이 반환"""
+    async def run():
+        results = await asyncio.gather(*(get_universe() for _ in range(10)))
+        return results, await get_universe()
+
+    results, again = asyncio.run(run())
+    assert len(fake_meta) == 1
+    assert all(u is again for u in results)
+    assert universe_module.current_universe() is again
+
+
+def test_get_asset_id(fake_meta):
+    assert asyncio.run(get_asset_id("SOL")) == 2
+    with pytest.raises(ValueError):
+        asyncio.run(get_asset_id("NOTREAL"))
+
+
+def test_hyperevm_symbol_helpers_use_universe(fake_meta):
+    assert asyncio.run(hyperevm_client.is_valid_symbol("ETH"))
+    assert not asyncio.run(hyperevm_client.is_valid_symbol("NOTREAL"))
+    assert asyncio.run(hyperevm_client.get_symbols()) == ("BTC", "ETH", "SOL")
+
+
+def test_find_asset_ctx_handles_snapshot_mismatch(monkeypatch):
+    """유니버스와 스냅샷 순서가 어긋나도 올바른 컨텍스트를 찾음"""
+    monkeypatch.setattr(universe_module, "_current", Universe.from_meta(META))
+    snapshot = [
+        {"universe": [{"name": "ETH"}, {"name": "BTC"}]},
+        [{"markPx": "3500"}, {"markPx": "69000"}],
+    ]
+    assert find_asset_ctx(snapshot, "BTC") == {"markPx": "69000"}
+    assert find_asset_ctx(snapshot, "SOL") is None
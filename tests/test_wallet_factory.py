@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+from app.core import wallet_factory
+from app.core.wallet_factory import WalletPool, create_wallet
+
+
+def deposit_response(url, **kwargs):
+    response = MagicMock()
+    response.json.return_value = {"address": url.split("/")[-2], "signatures": {}, "status": "OK"}
+    return response
+
+
+def test_create_wallet_requests_assets_concurrently(monkeypatch):
+    """등록된 자산의 입금 주소를 동시에 요청 (자산 추가는 register_deposit_asset)"""
+    monkeypatch.setattr("app.config.settings.HYPERUNIT_VERIFY_SIGNATURES", False)
+    monkeypatch.setattr(wallet_factory, "DEPOSIT_ASSETS", dict(wallet_factory.DEPOSIT_ASSETS))
+    wallet_factory.register_deposit_asset("BTC", "bitcoin", "btc")
+    state = {"active": 0, "peak": 0}
+
+    async def get(url, **kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return deposit_response(url)
+
+    with patch("httpx.AsyncClient.get", side_effect=get):
+        wallet = asyncio.run(create_wallet())
+
+    assert state["peak"] == 3
+    assert set(wallet["deposit_address"]) == {"ETH", "SOL", "BTC"}
+    assert wallet["deposit_address"]["BTC"]["address"] == "btc"
+    assert wallet["wallet"]["private_key"].startswith("0x")
+
+
+def test_create_wallet_rejects_unverified_signatures(monkeypatch):
+    monkeypatch.setattr("app.config.settings.HYPERUNIT_VERIFY_SIGNATURES", True)
+    with patch("httpx.AsyncClient.get", side_effect=lambda url, **kwargs: deposit_response(url)):
+        try:
+            asyncio.run(create_wallet())
+        except wallet_factory.DepositVerificationError as e:
+            assert "0/2 서명 검증됨" in str(e)
+        else:
+            raise AssertionError("verification should fail")
+
+
+def test_wallet_pool_serves_pregenerated_wallets(monkeypatch):
+    """풀에서 꺼낸 지갑은 업스트림 호출 없이 반환되고, 풀은 백그라운드에서 다시 채워짐"""
+    monkeypatch.setattr("app.config.settings.HYPERUNIT_VERIFY_SIGNATURES", False)
+    pool = WalletPool(2)
+
+    async def scenario():
+        with patch("httpx.AsyncClient.get", side_effect=lambda url, **kwargs: deposit_response(url)) as mock_get:
+            await pool.start()
+            for _ in range(20):
+                if pool.stats()["available"] == 2:
+                    break
+                await asyncio.sleep(0.01)
+            calls_before = mock_get.call_count
+            wallet = pool.take()
+            assert mock_get.call_count == calls_before
+            await asyncio.sleep(0.05)
+            await pool.stop()
+            return wallet
+
+    wallet = asyncio.run(scenario())
+    assert wallet["deposit_address"]["ETH"]["status"] == "OK"
+    stats = pool.stats()
+    assert stats["served"] == 1
+    assert stats["created"] == 3
+    assert stats["available"] == 2
+
+
+def test_empty_pool_returns_none():
+    pool = WalletPool(0)
+    assert pool.take() is None
+    assert pool.stats()["misses"] == 1
+
+
+def test_deposit_address_error_response_is_not_stored(monkeypatch):
+    """status가 OK가 아니거나 주소가 없는 응답은 저장하지 않고 DepositAddressError"""
+    from app.core.deposit_store import deposit_store
+
+    def get(url, **kwargs):
+        response = MagicMock()
+        response.json.return_value = {"status": "error", "error": "rate limited"}
+        return response
+
+    with patch("httpx.AsyncClient.get", side_effect=get):
+        try:
+            asyncio.run(wallet_factory.generate_deposit_address("0xabc", "ethereum", "eth"))
+        except wallet_factory.DepositAddressError as e:
+            assert "rate limited" in str(e)
+        else:
+            raise AssertionError("error response should be rejected")
+    assert deposit_store.get("0xabc", "ethereum", "eth") is None